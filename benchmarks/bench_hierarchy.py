@@ -0,0 +1,58 @@
+"""Mede a hierarquia de especialização em modelos com milhares de classes.
+
+Uso: python -m benchmarks.bench_hierarchy [--sizes 1000 5000 20000]
+
+Para cada tamanho N, gera uma árvore de especialização (cada classe
+especializa a classe de índice i // 4, com gensets por nível), e mede: a
+construção do índice, os ancestrais/descendentes de todas as classes (fechos
+memorizados), a detecção de ciclos e a re-sincronização após mudar uma classe.
+"""
+import argparse
+import time
+
+from src.parsing.grammar import parse_text
+from src.parsing.hierarchy import SpecializationHierarchy
+
+from .generator import identifier
+
+def tree_model(n):
+    names = [f"Class_{identifier(i)}" for i in range(n)]
+    lines = ["package Bench", f"kind {names[0]}"]
+    lines.extend(f"subkind {names[i]} specializes {names[i // 4]}" for i in range(1, n))
+    for g in range(1, n // 4):
+        specifics = ", ".join(names[4 * g + k] for k in range(4) if 4 * g + k < n)
+        if specifics:
+            lines.append(f"disjoint genset Genset_{identifier(g)} where {specifics} specializes {names[g]}")
+    return "\n".join(lines) + "\n", names
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args(argv)
+
+    print(f"{'N':>8} {'Índice (s)':>11} {'Fechos (s)':>11} {'Ciclos (s)':>11} {'Sync 1 classe (s)':>18}")
+    for n in args.sizes:
+        text, names = tree_model(n)
+        _, summary, errors = parse_text(text)
+        assert not errors, errors[:3]
+
+        hierarchy, build = _timed(lambda: SpecializationHierarchy.from_summary(summary))
+        _, closures = _timed(lambda: [(hierarchy.ancestors(c), hierarchy.descendants(c)) for c in names])
+        cycles, cycle_time = _timed(hierarchy.cycles)
+        assert not cycles, cycles[:3]
+
+        # Uma folha passa a especializar outra classe: só os fechos afetados são descartados
+        leaf = dict(summary["classes"][-1], superclasses=[names[1]])
+        changed = dict(summary, classes=summary["classes"][:-1] + [leaf])
+        touched, sync = _timed(lambda: hierarchy.sync(changed))
+        assert touched == 1 and hierarchy.is_a(names[-1], names[1])
+
+        print(f"{n:>8} {build:>11.3f} {closures:>11.3f} {cycle_time:>11.3f} {sync:>18.4f}")
+
+if __name__ == "__main__":
+    main()
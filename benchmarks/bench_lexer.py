@@ -0,0 +1,44 @@
+"""Vazão dos motores léxicos 'fast' (regex única + dicionário) e 'ply'.
+
+Uso: python -m benchmarks.bench_lexer [--scale 2000]
+
+Tokens por segundo de cada motor, com e sem a coleta léxica. A equivalência
+entre os motores é verificada pelos testes (tests/test_fast_lexer.py).
+"""
+import argparse
+import sys
+import time
+
+from src.lexical.lexer import TontoLexer
+
+from .generator import generate_model
+
+def throughput(text, engine, collect, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        lexer = TontoLexer(collect_lex_info=collect, engine=engine)
+        lexer.input(text)
+        count = 0
+        start = time.perf_counter()
+        while lexer.token():
+            count += 1
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vazão dos motores léxicos.")
+    parser.add_argument("--scale", type=int, default=2000, help="classes do modelo sintético de vazão")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    text = generate_model(args.scale)
+    print(f"{'Motor':<6} {'Coleta':<7} {'Tokens':>8} {'Tempo (s)':>10} {'Tokens/s':>12}")
+    for collect in (True, False):
+        for engine in ('ply', 'fast'):
+            count, elapsed = throughput(text, engine, collect, args.repeat)
+            print(f"{engine:<6} {'sim' if collect else 'não':<7} {count:>8} {elapsed:>10.3f} {count / elapsed:>12,.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Mostra que o tempo de parse cresce linearmente com o tamanho das listas da gramática.
+
+Uso: python -m benchmarks.bench_list_building [--sizes 2500 5000 10000 20000]
+
+Para cada tamanho N, gera (a) um pacote com N declarações de classe e (b) um
+enum com N elementos, e mede parse_text. Com construção linear das listas, o
+tempo por item (µs/item) fica aproximadamente constante entre os tamanhos.
+"""
+import argparse
+import time
+
+from src.parsing.grammar import parse_text
+
+from .generator import identifier
+
+def package_with_classes(n):
+    lines = ["package Bench", "kind Root"]
+    lines.extend(f"subkind Class_{identifier(i)} specializes Root" for i in range(n))
+    return "\n".join(lines) + "\n"
+
+def enum_with_elements(n):
+    elements = ", ".join(f"Value{i}" for i in range(n))
+    return f"package Bench\nenum Big {{ {elements} }}\n"
+
+def _time_parse(text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, _, errors = parse_text(text)
+        best = min(best, time.perf_counter() - start)
+    assert not errors, errors[:3]
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2500, 5000, 10000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    parse_text("package Warmup\n")  # constrói as tabelas fora da medição
+
+    print(f"{'Caso':<22} {'N':>8} {'Tempo (s)':>10} {'µs/item':>9}")
+    for label, make in (("declarações", package_with_classes), ("elementos de enum", enum_with_elements)):
+        for n in args.sizes:
+            elapsed = _time_parse(make(n), args.repeat)
+            print(f"{label:<22} {n:>8} {elapsed:>10.3f} {elapsed / n * 1e6:>9.2f}")
+
+if __name__ == "__main__":
+    main()
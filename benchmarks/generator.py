@@ -0,0 +1,53 @@
+"""Gerador de modelos TONTO sintéticos para os benchmarks."""
+
+def identifier(i):
+    """Nome só com letras (A, B, ..., Z, AA, ...): nomes com dígitos viram INSTANCE_NAME."""
+    letters = []
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        letters.append(chr(ord('A') + r))
+    return "".join(reversed(letters))
+
+def generate_model(classes=100, attributes=3, relations=1, gensets=10, imports=5, external_relations=10):
+    """Gera o texto de um pacote TONTO válido.
+
+    - classes: número de classes (a primeira é um kind; as demais, subkinds dela)
+    - attributes: atributos por classe
+    - relations: relações internas por classe (para a classe seguinte)
+    - gensets: generalization sets (cada um com duas classes específicas)
+    - imports: declarações import
+    - external_relations: relações externas entre pares de classes
+    """
+    classes = max(classes, 1)
+    names = [f"Class_{identifier(i)}" for i in range(classes)]
+    lines = [f"import Imported_{identifier(i)}" for i in range(imports)]
+    lines.append("package Synthetic")
+    lines.append("")
+
+    types = ("string", "number", "boolean", "date")
+    for index, name in enumerate(names):
+        header = f"kind {name}" if index == 0 else f"subkind {name} specializes {names[0]}"
+        if not attributes and not relations:
+            lines.append(header)
+            continue
+        lines.append(header + " {")
+        for a in range(attributes):
+            lines.append(f"    attr{identifier(a)}: {types[a % len(types)]} [1] {{const}}")
+        for r in range(relations):
+            target = names[(index + r + 1) % classes]
+            lines.append("    @mediation")
+            lines.append(f"    [1] -- rel{identifier(r)} -- [0..*] {target}")
+        lines.append("}")
+
+    for g in range(gensets):
+        general = names[g % classes]
+        specifics = f"{names[(g + 1) % classes]}, {names[(g + 2) % classes]}"
+        lines.append(f"disjoint complete genset Genset_{identifier(g)} where {specifics} specializes {general}")
+
+    for e in range(external_relations):
+        domain = names[e % classes]
+        range_ = names[(e * 7 + 3) % classes]
+        lines.append(f"@material relation {domain} [1..*] -- ext{identifier(e)} -- [1] {range_}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,156 @@
+"""Suíte de benchmarks do analisador: lexer, parser, ModelBuilder e relatórios.
+
+Uso:
+    python -m benchmarks.run                              # escalas padrão
+    python -m benchmarks.run --scales 100 1000 5000 -o resultados.json
+    python -m benchmarks.run --compare baseline.json      # aponta regressões
+
+Cada escala N gera um modelo sintético com N classes (e atributos, relações,
+gensets e imports proporcionais) e mede separadamente cada fase. Os resultados
+(melhor tempo de --repeat execuções, em segundos) são gravados em JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.lexical.lexer import analyze_text
+from src.lexical.lexer_reports import show_tokens
+from src.parsing.grammar import TokenStream, get_parser, parse_text
+from src.parsing.parse_reports import show_syntax_summary
+from src.parsing.summary import ModelBuilder
+
+from .generator import generate_model
+
+class _NullBuilder(ModelBuilder):
+    """ModelBuilder que ignora os registros: isola o custo do parser puro."""
+    def register_import(self, *args, **kwargs): pass
+    def register_package(self, *args, **kwargs): pass
+    def register_class_header(self, *args, **kwargs): pass
+    def register_class_members(self, *args, **kwargs): pass
+    def register_datatype(self, *args, **kwargs): pass
+    def register_enum(self, *args, **kwargs): pass
+    def register_genset(self, *args, **kwargs): pass
+    def register_internal_relation(self, *args, **kwargs): pass
+    def register_external_relation(self, *args, **kwargs): pass
+
+def _best_of(repeat, func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _render(func, *args):
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        func(*args, out=sink)
+
+def model_params(scale):
+    return {
+        "classes": scale,
+        "attributes": 3,
+        "relations": 1,
+        "gensets": max(1, scale // 10),
+        "imports": max(1, scale // 20),
+        "external_relations": max(1, scale // 10),
+    }
+
+def run_scale(scale, repeat):
+    params = model_params(scale)
+    text = generate_model(**params)
+    parser = get_parser()
+
+    t_lex, (tokens, symbol_table, errors) = _best_of(repeat, analyze_text, text)
+    t_parse_text, (_, summary, syntax_errors) = _best_of(repeat, parse_text, text)
+    t_parse_null, _ = _best_of(repeat, lambda: parser.parse(TokenStream(tokens), _NullBuilder()))
+    t_parse_builder, _ = _best_of(repeat, lambda: parser.parse(TokenStream(tokens), ModelBuilder()))
+    t_summary, _ = _best_of(repeat, _render, show_syntax_summary, summary)
+    t_tokens, _ = _best_of(repeat, _render, show_tokens, tokens, errors)
+
+    if errors or syntax_errors:
+        raise RuntimeError(f"Modelo sintético inválido (escala {scale}): {(errors + syntax_errors)[:3]}")
+
+    return {
+        "scale": scale,
+        "params": params,
+        "lines": text.count("\n"),
+        "tokens": len(tokens),
+        "symbols": len(symbol_table),
+        "phases": {
+            "analyze_text": t_lex,
+            "parse_text": t_parse_text,
+            "parse_tokens": t_parse_null,
+            "model_builder": max(0.0, t_parse_builder - t_parse_null),
+            "show_syntax_summary": t_summary,
+            "show_tokens": t_tokens,
+        },
+    }
+
+def compare(results, baseline, threshold):
+    """Lista as fases que ficaram mais de `threshold` (fração) mais lentas que o baseline."""
+    previous = {r["scale"]: r["phases"] for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get(r["scale"])
+        if not old:
+            continue
+        for phase, seconds in r["phases"].items():
+            before = old.get(phase)
+            if before and seconds > before * (1 + threshold):
+                regressions.append((r["scale"], phase, before, seconds))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do analisador TONTO.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="grava os resultados neste arquivo JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fração de piora tolerada na comparação (padrão: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    parse_text("package Warmup\n")  # constrói as tabelas fora da medição
+
+    results = []
+    phases_header = None
+    for scale in args.scales:
+        r = run_scale(scale, args.repeat)
+        results.append(r)
+        if phases_header is None:
+            phases_header = list(r["phases"])
+            print(f"{'Escala':>7} {'Tokens':>8} " + " ".join(f"{p:>20}" for p in phases_header))
+        print(f"{scale:>7} {r['tokens']:>8} " + " ".join(f"{r['phases'][p] * 1000:>18.2f}ms" for p in phases_header))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\n⚠️  Regressões encontradas:")
+            for scale, phase, before, after in regressions:
+                print(f"  escala {scale}: {phase} {before * 1000:.2f}ms -> {after * 1000:.2f}ms")
+            return 1
+        print("\n✅ Nenhuma regressão acima do limite.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
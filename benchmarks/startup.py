@@ -0,0 +1,113 @@
+"""Tempo de inicialização: do processo novo até o fim de comandos curtos.
+
+Uso:
+    python -m benchmarks.startup                       # mediana de 10 execuções
+    python -m benchmarks.startup --repeat 20 -o startup.json
+    python -m benchmarks.startup --compare startup.json   # aponta regressões
+
+Cada cenário roda em um processo Python novo (como um hook de pre-commit ou um
+editor chamando o analisador). Antes da medição os fontes são compilados
+(.pyc) e as tabelas do parser são geradas num diretório de cache temporário,
+que também recebe o cache de resultados; "parser (tabelas frias)" usa um
+diretório vazio a cada execução e mede a geração das tabelas pelo yacc.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE = os.path.join("examples", "CarExample", "src", "car.tonto")
+
+# (nome, argumentos do Python, diretório de cache novo a cada execução)
+SCENARIOS = (
+    ("python vazio", ["-c", "pass"], False),
+    ("import lexer", ["-c", "import src.lexical.lexer"], False),
+    ("análise léxica", ["-c", "from src.lexical.lexer import analyze_text; analyze_text('package P')"], False),
+    ("parser (tabelas em cache)", ["-c", "from src.parsing.grammar import get_parser; get_parser()"], False),
+    ("parser (tabelas frias)", ["-c", "from src.parsing.grammar import get_parser; get_parser()"], True),
+    ("CLI 1 arquivo (cache)", ["-m", "src.cli.main", EXAMPLE, "--no-tokens"], False),
+    ("CLI 1 arquivo (sem cache)", ["-m", "src.cli.main", EXAMPLE, "--no-tokens", "--no-cache"], False),
+    ("cliente do daemon", ["-m", "src.server.client", "ping", "--socket", os.devnull], False),
+    ("import src.ui.tui", ["-c", "import src.ui.tui"], False),
+)
+
+def _run(args, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def measure(args, repeat, cache_dir, fresh_cache):
+    env = dict(os.environ, TONTO_CACHE_DIR=cache_dir)
+    _run(args, env)  # aquecimento (cache de disco do SO, cache de resultados)
+    times = []
+    for _ in range(repeat):
+        if fresh_cache:
+            with tempfile.TemporaryDirectory() as empty:
+                times.append(_run(args, dict(env, TONTO_CACHE_DIR=empty)))
+        else:
+            times.append(_run(args, env))
+    return {"median": statistics.median(times), "min": min(times), "max": max(times)}
+
+def compare(results, baseline, threshold):
+    """Cenários cuja mediana ficou mais de `threshold` (fração) mais lenta que o baseline."""
+    previous = baseline.get("results", {})
+    return [(name, previous[name]["median"], r["median"]) for name, r in results.items()
+            if name in previous and r["median"] > previous[name]["median"] * (1 + threshold)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de inicialização do analisador TONTO.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("-o", "--output", help="grava os resultados neste arquivo JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fração de piora tolerada na comparação (padrão: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    # Sem .pyc (ex.: PYTHONDONTWRITEBYTECODE) cada processo recompilaria os módulos
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "src"], cwd=ROOT, check=True)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        subprocess.run([sys.executable, "-m", "src.parsing.parse_tables", "--cache-dir", cache_dir],
+                       cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        print(f"{'Cenário':<28} {'Mediana':>10} {'Mín.':>10} {'Máx.':>10}")
+        for name, scenario_args, fresh_cache in SCENARIOS:
+            r = measure(scenario_args, args.repeat, cache_dir, fresh_cache)
+            results[name] = r
+            print(f"{name:<28} " + " ".join(f"{r[k] * 1000:>8.1f}ms" for k in ("median", "min", "max")))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\n⚠️  Regressões encontradas:")
+            for name, before, after in regressions:
+                print(f"  {name}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms")
+            return 1
+        print("\n✅ Nenhuma regressão acima do limite.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+import argparse
+import glob
+import json
+import os
+import sys
+
+from ..lexical.stream import stream_tokens
+from ..lexical.token_record import TokenRecord
+from ..parsing.cache import AnalysisCache, analyze_cached, DEFAULT_MAX_BYTES
+from ..parsing.linker import ProjectLinker
+from ..parsing.parser_stats import ParserStats
+from ..parsing.pipeline import AnalysisResult
+from ..parsing.semantic import NameIndex, validate_names
+from ..profiling import phases
+from ..profiling.phases import PhaseProfiler
+from ..reports.renderers import REPORTS, FORMATS, write_report
+
+# Códigos de saída
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_USAGE = 2
+
+def iter_input_files(patterns):
+    """Expande caminhos, pastas e globs em arquivos .tonto, sem montar a lista inteira."""
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for fname in sorted(files):
+                        if fname.lower().endswith('.tonto'):
+                            full = os.path.join(root, fname)
+                            if full not in seen:
+                                seen.add(full)
+                                yield full
+            elif path not in seen:
+                seen.add(path)
+                yield path
+
+def analyze_file(file_path, include_tokens=True, cache=None, keep_names=False):
+    """Analisa um arquivo (ou lê do cache) e devolve o registro JSON correspondente.
+
+    Com keep_names, o índice de nomes fica em record["names"] para a validação
+    entre arquivos (e precisa ser removido antes de serializar o registro).
+    """
+    try:
+        with phases.phase("read"), open(file_path, "r", encoding="utf-8") as f:
+            data = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": file_path, "ok": False, "error": str(e)}
+
+    record = {"file": file_path}
+    record.update(analyze_cached(data, cache))
+    names = NameIndex.from_tokens(
+        TokenRecord(t["Token"], t["Valor"], t["Linha"], t["Posição"]) for t in record["tokens"]
+    )
+    record["semantic_errors"], record["semantic_warnings"] = validate_names(names)
+    if keep_names:
+        record["names"] = names
+    if not include_tokens:
+        record.pop("tokens", None)
+        record.pop("symbol_table", None)
+    record["ok"] = not record["lexical_errors"] and not record["syntax_errors"] and not record["semantic_errors"]
+    return record
+
+class _FileWorker:
+    # Objeto serializável para o ProcessPoolExecutor (funções locais não são)
+    def __init__(self, include_tokens, cache, keep_names=False, parser_stats=False):
+        self.include_tokens = include_tokens
+        self.cache = cache
+        self.keep_names = keep_names
+        self.parser_stats = parser_stats
+
+    def __call__(self, file_path):
+        if not self.parser_stats:
+            return analyze_file(file_path, self.include_tokens, self.cache, self.keep_names)
+        # Cada processo coleta as suas; o registro leva os contadores para o processo principal
+        with ParserStats() as stats:
+            record = analyze_file(file_path, self.include_tokens, self.cache, self.keep_names)
+        record["parser_stats"] = stats.to_dict()
+        return record
+
+def parallel_map(func, items, jobs):
+    """func(item) de cada item em `jobs` processos, na ordem dos itens.
+
+    Diferente de ProcessPoolExecutor.map, que submete todos os itens de uma vez e
+    acumula os resultados prontos, mantém no máximo 2 * jobs tarefas em andamento:
+    a memória não cresce com o tamanho do lote e a lista de arquivos é consumida
+    à medida que os resultados são emitidos.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor  # só com paralelismo (custo de inicialização)
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Consumidor parou antes do fim (ou erro): descarta o que não começou
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def iter_records(files, include_tokens=True, jobs=1, cache=None, link=False, parser_stats=False):
+    """Registros da análise de cada arquivo. Com parser_stats, cada registro traz
+    também os contadores do parser em record["parser_stats"]."""
+    if link:
+        yield from _linked_records(files, include_tokens, jobs, cache, parser_stats)
+        return
+    worker = _FileWorker(include_tokens, cache, parser_stats=parser_stats)
+    if jobs == 1:
+        for file_path in files:
+            yield worker(file_path)
+        return
+    yield from parallel_map(worker, files, jobs)
+
+def _linked_records(files, include_tokens, jobs, cache, parser_stats):
+    """Como iter_records, mas resolvendo os imports entre os arquivos informados:
+    a validação semântica de cada arquivo enxerga os pacotes que ele importa.
+    Todos os arquivos são analisados antes de o primeiro registro ser emitido."""
+    worker = _FileWorker(include_tokens, cache, keep_names=True, parser_stats=parser_stats)
+    if jobs == 1:
+        records = [worker(f) for f in files]
+    else:
+        records = list(parallel_map(worker, files, jobs))
+
+    readable = [r for r in records if "names" in r]
+    validated = ProjectLinker(readable).validate_files()
+    for r, (_, errors, warnings) in zip(readable, validated):
+        r["semantic_errors"] = errors
+        r["semantic_warnings"] = warnings
+        r["ok"] = not r["lexical_errors"] and not r["syntax_errors"] and not errors
+        del r["names"]
+    return records
+
+def run_batch(patterns, fmt="jsonl", out=sys.stdout, include_tokens=True, jobs=1, cache=None, link=False,
+              parser_stats=None):
+    """Analisa os arquivos e escreve cada resultado assim que fica pronto.
+
+    Com parser_stats (um ParserStats), os contadores do parser de todos os
+    arquivos são somados nele (fora dos registros escritos).
+
+    Retorna o código de saída: 0 sem erros, 1 se algum arquivo tiver erros
+    (léxicos, sintáticos, semânticos ou de leitura) e 2 se nenhum arquivo for encontrado.
+    """
+    found = False
+    has_errors = False
+    if fmt == "json":
+        out.write("[")
+
+    records = iter_records(iter_input_files(patterns), include_tokens, jobs, cache, link, parser_stats is not None)
+    for index, record in enumerate(records):
+        found = True
+        stats = record.pop("parser_stats", None)
+        if stats is not None:
+            parser_stats.merge(stats)
+        has_errors = has_errors or not record["ok"]
+        line = json.dumps(record, ensure_ascii=False)
+        if fmt == "json":
+            out.write(("\n" if index == 0 else ",\n") + line)
+        else:
+            out.write(line + "\n")
+        out.flush()
+
+    if fmt == "json":
+        out.write("\n]\n" if found else "]\n")
+
+    if not found:
+        print("Nenhum arquivo .tonto encontrado.", file=sys.stderr)
+        return EXIT_USAGE
+    return EXIT_ERRORS if has_errors else EXIT_OK
+
+def run_token_stream(patterns, out=sys.stdout):
+    """Modo streaming: escreve um objeto JSON por token (ou erro léxico) sem carregar
+    o arquivo inteiro nem guardar os tokens. Sem análise sintática."""
+    found = False
+    has_errors = False
+    for file_path in iter_input_files(patterns):
+        found = True
+        try:
+            for record in stream_tokens(file_path):
+                has_errors = has_errors or record.type == 'ERRO'
+                out.write(json.dumps({
+                    "file": file_path, "Token": record.type, "Valor": record.value,
+                    "Linha": record.lineno, "Posição": record.lexpos,
+                }, ensure_ascii=False) + "\n")
+        except (OSError, UnicodeDecodeError) as e:
+            has_errors = True
+            out.write(json.dumps({"file": file_path, "ok": False, "error": str(e)}, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if not found:
+        print("Nenhum arquivo .tonto encontrado.", file=sys.stderr)
+        return EXIT_USAGE
+    return EXIT_ERRORS if has_errors else EXIT_OK
+
+class _ReportWorker:
+    # Devolve o dicionário do cache (serializável); o AnalysisResult é montado no processo principal
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __call__(self, file_path):
+        try:
+            with phases.phase("read"), open(file_path, "r", encoding="utf-8") as f:
+                data = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return file_path, str(e)
+        return file_path, analyze_cached(data, self.cache)
+
+def run_reports(patterns, reports, fmt="tree", out=sys.stdout, jobs=1, cache=None):
+    """Escreve os relatórios escolhidos (os mesmos do menu interativo) de cada
+    arquivo, no formato pedido, à medida que as análises terminam."""
+    status = {"found": False, "errors": False}
+
+    def analyzed():
+        worker = _ReportWorker(cache)
+        files = iter_input_files(patterns)
+        records = map(worker, files) if jobs == 1 else parallel_map(worker, files, jobs)
+        for file_path, record in records:
+            status["found"] = True
+            if isinstance(record, str):
+                status["errors"] = True
+                print(f"Erro ao ler {file_path}: {record}", file=sys.stderr)
+                continue
+            status["errors"] = status["errors"] or bool(record["lexical_errors"] or record["syntax_errors"])
+            yield file_path, AnalysisResult.from_dict(record)
+
+    write_report(reports, analyzed(), out, fmt)
+    out.flush()
+    if not status["found"]:
+        print("Nenhum arquivo .tonto encontrado.", file=sys.stderr)
+        return EXIT_USAGE
+    return EXIT_ERRORS if status["errors"] else EXIT_OK
+
+def positive_int(value):
+    """Tipo do argparse: inteiro maior que zero (erro de uso, não traceback)."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: {value!r}")
+    return number
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.main",
+        description="Análise léxica, sintática e semântica não interativa de arquivos TONTO (saída em JSON).",
+    )
+    parser.add_argument("paths", nargs="*", help="arquivos .tonto, pastas ou globs (ex.: 'examples/**/*.tonto')")
+    parser.add_argument("--format", choices=("jsonl", "json"), default="jsonl",
+                        help="JSON Lines (um objeto por arquivo, padrão) ou um único array JSON")
+    parser.add_argument("--no-tokens", action="store_true",
+                        help="omite tokens e tabela de símbolos da saída")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=1,
+                        help="número de processos para analisar arquivos em paralelo")
+    parser.add_argument("-o", "--output", help="arquivo de saída (padrão: stdout)")
+    parser.add_argument("--link", action="store_true",
+                        help="resolve os imports entre os arquivos informados na validação semântica")
+    parser.add_argument("--report", action="append", choices=REPORTS,
+                        help="em vez do JSON da análise, escreve este relatório (pode repetir; ex.: --report summary)")
+    parser.add_argument("--report-format", choices=FORMATS, default="tree",
+                        help="formato dos relatórios: tree (texto do terminal), plain (só ASCII), json ou html")
+    parser.add_argument("--stream-tokens", action="store_true",
+                        help="só análise léxica, em streaming: um objeto JSON por token, memória constante ('-' lê stdin)")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede tempo por fase (leitura, lexer, tabelas do parser, parse, callbacks do ModelBuilder, relatórios) e mostra a tabela no stderr")
+    parser.add_argument("--profile-output", help="grava o perfil por fase neste arquivo (implica --profile)")
+    parser.add_argument("--profile-format", choices=("json", "folded"), default="json",
+                        help="formato de --profile-output: json ou pilhas colapsadas para flame graph (flamegraph.pl, speedscope)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="mede também as alocações por fase com tracemalloc (mais lento; implica --profile)")
+    parser.add_argument("--profile-cprofile", metavar="ARQUIVO",
+                        help="roda o cProfile e grava as estatísticas (pstats) neste arquivo (implica --profile)")
+    parser.add_argument("--parser-stats", action="store_true",
+                        help="conta reduções por produção, shifts, erros e profundidade da pilha do parser, somados "
+                             "em todos os arquivos, e mostra no stderr (ignora o cache, que não guarda essas contagens)")
+    parser.add_argument("--parser-stats-output", metavar="ARQUIVO",
+                        help="grava as estatísticas do parser em JSON neste arquivo (implica --parser-stats)")
+    parser.add_argument("--no-cache", action="store_true", help="não lê nem grava o cache de resultados")
+    parser.add_argument("--cache-dir", help="pasta do cache (padrão: $TONTO_CACHE_DIR ou ~/.cache/tonto_analyzer)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="tamanho máximo do cache em MB (entradas menos usadas são removidas)")
+    parser.add_argument("--clear-cache", action="store_true", help="apaga o cache antes de analisar")
+    return parser
+
+def main(argv=None):
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+
+    cache = None if args.no_cache else AnalysisCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    if args.clear_cache:
+        removed = AnalysisCache(args.cache_dir).clear()
+        print(f"Cache limpo ({removed} entrada(s) removida(s)).", file=sys.stderr)
+        if not args.paths:
+            return EXIT_OK
+    if not args.paths:
+        arg_parser.error("informe ao menos um arquivo, pasta ou glob")
+
+    if args.parser_stats or args.parser_stats_output:
+        if args.report or args.stream_tokens:
+            arg_parser.error("--parser-stats só se aplica à saída JSON da análise")
+        cache = None
+
+    if not (args.profile or args.profile_output or args.profile_memory or args.profile_cprofile):
+        return _run(args, cache)
+
+    if args.jobs != 1:
+        print("Perfil: as fases só são medidas no processo principal; usando -j 1.", file=sys.stderr)
+        args.jobs = 1
+    profiler = PhaseProfiler(memory=args.profile_memory, cprofile=bool(args.profile_cprofile)).start()
+    try:
+        return _run(args, cache)
+    finally:
+        profiler.stop()
+        for line in profiler.report_lines():
+            print(line, file=sys.stderr)
+        if args.profile_output:
+            profiler.write(args.profile_output, args.profile_format)
+        if args.profile_cprofile:
+            profiler.write_pstats(args.profile_cprofile)
+
+def _run(args, cache):
+    if args.stream_tokens:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                return run_token_stream(args.paths, out)
+        return run_token_stream(args.paths)
+
+    if args.report:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                return run_reports(args.paths, args.report, args.report_format, out, args.jobs, cache)
+        return run_reports(args.paths, args.report, args.report_format, sys.stdout, args.jobs, cache)
+
+    parser_stats = ParserStats() if args.parser_stats or args.parser_stats_output else None
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            code = run_batch(args.paths, args.format, out, not args.no_tokens, args.jobs, cache, args.link, parser_stats)
+    else:
+        code = run_batch(args.paths, args.format, sys.stdout, not args.no_tokens, args.jobs, cache, args.link, parser_stats)
+
+    if parser_stats is not None:
+        for line in parser_stats.report_lines():
+            print(line, file=sys.stderr)
+        if args.parser_stats_output:
+            with open(args.parser_stats_output, "w", encoding="utf-8") as f:
+                json.dump(parser_stats.to_dict(), f, ensure_ascii=False, indent=2)
+                f.write("\n")
+    return code
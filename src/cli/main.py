@@ -1,14 +1,21 @@
 import os
-from ..lexical.lexer import analyze_text
+import sys
 from ..lexical.lexer_reports import show_tokens, show_symbol_table, show_token_count
-from ..parsing.grammar import parse_text
-from ..parsing.parse_reports import show_syntax_summary, show_syntax_errors
+from ..parsing.pipeline import analyze_source
+from ..parsing.parse_reports import (show_syntax_summary, show_syntax_errors, show_semantic_errors,
+                                     show_project_report, show_import_report)
+from ..parsing.project import analyze_project
+from ..parsing.linker import ProjectLinker
+from ..parsing.semantic import validate_tokens
+from ..profiling import phases
 
 # Guardar último resultado da análise sintática
 current_file = None
 current_ast = None
 current_summary = None
 current_syntax_errors = None
+# Guardar último resultado da validação semântica: (erros, avisos)
+current_semantic_issues = None
 # Guardar último resultado da análise léxica
 current_lex_data = None 
 
@@ -26,7 +33,8 @@ def choose_input_file():
         print("\n================= SELEÇÃO DO ARQUIVO =================")
         print("1. Digitar o caminho completo do arquivo .tonto")
         print("2. Listar e escolher um arquivo .tonto da pasta examples")
-        choice = input("Escolha uma opção (1/2): ").strip()
+        print("3. Analisar um projeto inteiro (pasta com arquivos .tonto)")
+        choice = input("Escolha uma opção (1/2/3): ").strip()
 
         if choice == '1':
             path = input("\nDigite o caminho do arquivo .tonto: ").strip().strip('"')
@@ -53,11 +61,17 @@ def choose_input_file():
             except ValueError:
                 pass
             print("❌ Opção inválida, tente novamente.")
+        elif choice == '3':
+            path = input("\nDigite o caminho da pasta do projeto: ").strip().strip('"')
+            if not os.path.isdir(path):
+                print("❌ Pasta não encontrada. Verifique o caminho e tente novamente.")
+                continue
+            return path
         else:
             print("❌ Opção inválida. Tente novamente.")
 
 def run_all_analyses(file_path):
-    global current_file, current_ast, current_summary, current_syntax_errors, current_lex_data
+    global current_file, current_ast, current_summary, current_syntax_errors, current_lex_data, current_semantic_issues
 
     if not file_path:
         print("❌ Falha na análise léxica. Verifique o arquivo.")
@@ -65,27 +79,65 @@ def run_all_analyses(file_path):
         
     current_file = file_path
 
+    if os.path.isdir(file_path):
+        return run_project_analyses(file_path)
+
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with phases.phase("read"), open(file_path, "r", encoding="utf-8") as f:
             data = f.read()
     except FileNotFoundError:
         print(f"❌ Arquivo {file_path} não encontrado.")
         return False
         
-    # 1. Análise Léxica (Chama analyze_text)
-    processed_tokens, symbol_table, error_tokens = analyze_text(data)
-    current_lex_data = (processed_tokens, symbol_table, error_tokens)
-        
-    # 2. Análise Sintática (Chama parse_text)
-    ast, summary, errors = parse_text(data)
-    current_ast = ast
-    current_summary = summary
-    current_syntax_errors = errors
+    # Análises léxica e sintática em uma única passada do lexer. O menu não usa o
+    # cache em disco (só o modo não interativo): o registro em cache não guarda a AST.
+    result = analyze_source(data)
+    current_lex_data = result.lex_data
+    current_ast = result.ast
+    current_summary = result.summary
+    current_syntax_errors = result.syntax_errors
+    # Arquivo isolado: nomes que podem vir de pacotes importados viram avisos
+    current_semantic_issues = validate_tokens(result.processed_tokens)
     
     if current_syntax_errors:
         print(f"\n⚠️  Análise sintática concluída com {len(current_syntax_errors)} erro(s)!")
     else:
         print("\n✅ Análise sintática concluída com sucesso!")
+    _print_semantic_status()
+    return True
+
+def _print_semantic_status():
+    errors, warnings = current_semantic_issues
+    if errors:
+        print(f"⚠️  Validação semântica: {len(errors)} erro(s) e {len(warnings)} aviso(s).")
+    elif warnings:
+        print(f"✅ Validação semântica sem erros ({len(warnings)} aviso(s)).")
+    else:
+        print("✅ Validação semântica concluída com sucesso!")
+
+def run_project_analyses(project_dir):
+    global current_ast, current_summary, current_syntax_errors, current_lex_data, current_semantic_issues
+
+    results, summary, errors = analyze_project(project_dir)
+    show_project_report(results, project_dir)
+    if not results:
+        return False
+    linker = ProjectLinker(results)
+    show_import_report(linker, project_dir)
+
+    # No modo projeto os relatórios léxicos são por arquivo (ver tabela acima)
+    current_lex_data = None
+    current_ast = None
+    current_summary = summary
+    current_syntax_errors = errors
+    # No projeto os imports são resolvidos entre os arquivos
+    current_semantic_issues = linker.validate(project_dir)
+
+    if current_syntax_errors:
+        print(f"\n⚠️  Análise do projeto concluída com {len(current_syntax_errors)} erro(s) sintático(s)!")
+    else:
+        print("\n✅ Análise do projeto concluída com sucesso!")
+    _print_semantic_status()
     return True
 
 def menu_loop():
@@ -96,11 +148,14 @@ def menu_loop():
         print("3. Exibir Contagem de Tokens (léxico)")
         print("4. Exibir Resumo Sintático")
         print("5. Exibir Erros Sintáticos")
-        print("6. Analisar outro arquivo (.tonto)")
-        print("7. Sair")
+        print("6. Exibir Erros Semânticos")
+        print("7. Analisar outro arquivo (.tonto)")
+        print("8. Sair")
         choice = input("Escolha uma opção: ").strip()
 
-        if choice == '1':
+        if choice in ('1', '2', '3') and current_lex_data is None:
+            print("❌ Relatórios léxicos não disponíveis no modo projeto; analise um arquivo individual.")
+        elif choice == '1':
             show_tokens(current_lex_data[0], current_lex_data[2])
         elif choice == '2':
             show_symbol_table(current_lex_data[1])
@@ -117,16 +172,26 @@ def menu_loop():
             else: 
                 show_syntax_errors(current_syntax_errors)
         elif choice == '6':
+            if current_semantic_issues is None:
+                print("❌ Nenhuma análise semântica realizada ainda.")
+            else:
+                show_semantic_errors(*current_semantic_issues)
+        elif choice == '7':
             new_path = choose_input_file()
             if run_all_analyses(new_path):
-                print("Novo arquivo analisado. Use as opções 1-5 para visualizar.")
-        elif choice == '7':
+                print("Novo arquivo analisado. Use as opções 1-6 para visualizar.")
+        elif choice == '8':
             print("Saindo...")
             break
         else:
             print("❌ Opção inválida. Tente novamente.")
 
 def main():
+    # Com argumentos, roda em modo não interativo (lote) e sai com o código apropriado
+    if len(sys.argv) > 1:
+        from .batch import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+
     file_path = choose_input_file()
     if run_all_analyses(file_path):
         menu_loop()
@@ -0,0 +1,207 @@
+import re
+
+# ====== Lexer de regex única com classificação por dicionário ======
+# Em vez de uma alternativa de regex por palavra reservada, casa cada palavra uma
+# única vez (\b\w+) e a classifica por busca em dicionário, aplicando as mesmas
+# precedências das regras t_* do lexer PLY. Os tokens passam pelas próprias
+# funções t_* (normalização de valores, tabela de símbolos, contagem de linhas).
+
+_MASTER_PATTERN = r'''
+      (?P<newline>\r?\n+)
+    | (?P<WORD>\b\w+)
+    | (?P<CARDINALITY>\[\s*(?:\*|\d+)\s*(?:\.\.\s*(?:\*|\d+))?\s*\])
+    | (?P<SYMBOL><>--|--<>|<o>--|--<o>|--|\.\.|[\[\]{}()@,:*])
+'''
+
+_SYMBOLS = {
+    '<>--': 'AGGREGATION', '--<>': 'AGGREGATION_REV', '<o>--': 'COMPOSITION', '--<o>': 'COMPOSITION_REV',
+    '--': 'ASSOCIATION', '[': 'LBRACKET', ']': 'RBRACKET', '{': 'LBRACE', '}': 'RBRACE', '(': 'LPAREN',
+    ')': 'RPAREN', '@': 'AT', '..': 'DOTDOT', ',': 'COMMA', ':': 'COLON', '*': 'ASTERISK',
+}
+
+# Palavras reservadas com token próprio (t_IMPORT ... t_RELATION)
+_RESERVED_WORDS = {
+    'import': 'IMPORT', 'package': 'PACKAGE', 'specializes': 'SPECIALIZES', 'datatype': 'DATATYPE',
+    'enum': 'ENUM', 'genset': 'GENSET', 'disjoint': 'DISJOINT', 'complete': 'COMPLETE',
+    'general': 'GENERAL', 'categorizer': 'CATEGORIZER', 'specifics': 'SPECIFICS', 'where': 'WHERE',
+    'relation': 'RELATION',
+}
+_NATIVE_DATATYPES = ('number', 'string', 'boolean', 'date', 'time', 'datetime')
+_META_ATTRIBUTES = ('ordered', 'const', 'derived', 'subsets', 'redefines')
+
+_ATTRIBUTE_RE = re.compile(r'[a-z][a-zA-Z_]*')
+_NEW_DATATYPE_RE = re.compile(r'[A-Za-z]+DataType')
+# Nomes, na ordem de precedência das regras (a primeira alternativa que cobre a palavra vence)
+_NAME_RE = re.compile(r'''
+      (?P<INSTANCE_NAME>[A-Za-z][A-Za-z_]*\d+)
+    | (?P<RELATION_NAME>[a-z][a-zA-Z]*(?:_[a-zA-Z]+)*)
+    | (?P<CLASS_NAME>[A-Z][a-zA-Z]*(?:_[a-zA-Z][a-zA-Z]*)*)
+''', re.VERBOSE)
+
+class LexToken:
+    """Token entregue às funções t_* e ao parser, com os mesmos atributos do
+    LexToken do PLY (type, value, lineno, lexpos, lexer). Definido aqui para que
+    o motor padrão não precise importar ply.lex."""
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+def build_word_types(keywords, class_stereotypes, relation_stereotypes):
+    """Tabela palavra -> tipo de token, respeitando a ordem das regras do PLY
+    (a primeira regra que aceita a palavra vence)."""
+    word_types = {}
+    groups = (
+        (_RESERVED_WORDS, None),
+        ((k for k in keywords if '-' not in k), 'KEYWORD'),
+        (_NATIVE_DATATYPES, 'NATIVE_DATATYPE'),
+        (_META_ATTRIBUTES, 'META_ATTRIBUTE'),
+        (class_stereotypes, 'CLASS_STEREOTYPE'),
+        (relation_stereotypes, 'RELATION_STEREOTYPE'),
+    )
+    for words, token_type in groups:
+        for word in words:
+            word_types.setdefault(word, token_type or words[word])
+    return word_types
+
+class FastLexer:
+    """Motor léxico alternativo com a mesma interface usada do lexer PLY
+    (input, token, skip, clone, lineno, lexpos, lexdata)."""
+
+    def __init__(self, rules, record, transform_types, keywords, class_stereotypes, relation_stereotypes, ignore=' \t'):
+        self.rules = rules  # nome do token -> função t_* do lexer
+        self.error_rule = rules['error']
+        # Tipos cujas regras fazem algo além de registrar o token (ex.: ATTRIBUTE remove o ':')
+        self.transform_types = frozenset(transform_types)
+        self.record = record
+        # Caracteres ignorados são consumidos pela própria regex, antes do token
+        self.master_re = re.compile(f"[{re.escape(ignore)}]*(?:{_MASTER_PATTERN})", re.VERBOSE)
+        self.word_types = build_word_types(keywords, class_stereotypes, relation_stereotypes)
+        # Palavras-chave com hífen (ex.: functional-complexes), indexadas pela primeira parte
+        self.hyphen_keywords = {}
+        for k in keywords:
+            if '-' in k:
+                self.hyphen_keywords.setdefault(k.split('-', 1)[0], []).append(re.compile(re.escape(k) + r'\b'))
+        # Memória palavra -> tipo (None = erro) para classificações que não dependem do contexto
+        self.word_cache = {}
+        self.lexignore = ignore
+        self.lexdata = None
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        self.owner = None
+
+    def clone(self):
+        c = object.__new__(FastLexer)
+        c.__dict__.update(self.__dict__)
+        c.word_cache = {}
+        return c
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.lexlen = len(data)
+
+    def skip(self, n):
+        self.lexpos += n
+
+    def _classify_word(self, word, start, end):
+        """Retorna (tipo, fim do lexema) para uma palavra, ou (None, None) se for erro léxico."""
+        data = self.lexdata
+        if end < self.lexlen and data[end] == ':' and _ATTRIBUTE_RE.fullmatch(word):
+            return 'ATTRIBUTE', end + 1
+
+        # Prefixos de palavras-chave com hífen (functional, intrinsic, extrinsic) dependem
+        # do texto seguinte, então não entram na memória
+        patterns = self.hyphen_keywords.get(word)
+        if patterns is not None:
+            for pattern in patterns:
+                m = pattern.match(data, start)
+                if m:
+                    return 'KEYWORD', m.end()
+            m = _NAME_RE.fullmatch(word)
+            return (m.lastgroup, end) if m else (None, None)
+
+        word_cache = self.word_cache
+        if word in word_cache:
+            token_type = word_cache[word]
+        else:
+            if _NEW_DATATYPE_RE.fullmatch(word):
+                token_type = 'NEW_DATATYPE'
+            else:
+                token_type = self.word_types.get(word)
+                if token_type is None:
+                    m = _NAME_RE.fullmatch(word)
+                    token_type = m.lastgroup if m else None
+            word_cache[word] = token_type
+        return token_type, (end if token_type else None)
+
+    def token(self):
+        lexdata = self.lexdata
+        lexpos = self.lexpos
+        lexlen = self.lexlen
+        master_match = self.master_re.match
+        rules = self.rules
+        record = self.record
+        classify_word = self._classify_word
+
+        while lexpos < lexlen:
+            m = master_match(lexdata, lexpos)
+            if m is None:
+                # Só espaços até o fim, ou caractere sem regra: mesma recuperação do PLY (t_error + skip)
+                while lexpos < lexlen and lexdata[lexpos] in self.lexignore:
+                    lexpos += 1
+                if lexpos >= lexlen:
+                    break
+                tok = LexToken()
+                tok.type = 'error'
+                tok.value = lexdata[lexpos:lexpos + 1]  # t_error examina lexdata/lexpos, não o valor
+                tok.lineno = self.lineno
+                tok.lexpos = lexpos
+                tok.lexer = self
+                self.lexpos = lexpos
+                self.error_rule(tok)
+                lexpos = self.lexpos
+                continue
+
+            kind = m.lastgroup
+            start = m.start(kind)
+            end = m.end()
+            if kind == 'WORD':
+                token_type, end = classify_word(m.group(kind), start, end)
+                if token_type is None:
+                    lexpos = start
+                    tok = LexToken()
+                    tok.type = 'error'
+                    tok.value = lexdata[lexpos:lexpos + 1]
+                    tok.lineno = self.lineno
+                    tok.lexpos = lexpos
+                    tok.lexer = self
+                    self.lexpos = lexpos
+                    self.error_rule(tok)
+                    lexpos = self.lexpos
+                    continue
+            elif kind == 'SYMBOL':
+                token_type = _SYMBOLS[m.group(kind)]
+            else:
+                token_type = kind
+
+            tok = LexToken()
+            tok.type = token_type
+            tok.value = lexdata[start:end]
+            tok.lineno = self.lineno
+            tok.lexpos = start
+            tok.lexer = self
+            self.lexpos = lexpos = end
+
+            if token_type in self.transform_types:
+                tok = rules[token_type](tok)
+                if not tok:
+                    lexpos = self.lexpos
+                    continue
+            else:
+                # Regras t_* que apenas registram o token: chama o registro diretamente
+                record(tok)
+            return tok
+
+        self.lexpos = lexpos + 1
+        return None
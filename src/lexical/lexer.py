@@ -1,4 +1,10 @@
-import ply.lex as lex
+import sys
+import threading
+
+from ..profiling import phases
+from .fast_lexer import FastLexer
+from .symbol_table import SymbolTable
+from .token_record import TokenRecord
 
 tokens = [
     'CLASS_STEREOTYPE', 'RELATION_STEREOTYPE', 'KEYWORD', 'CLASS_NAME', 'RELATION_NAME',
@@ -29,31 +35,21 @@ relation_stereotypes = {
     'composition', 'aggregation', 'inherence', 'value', 'formal', 'constitution'
 }
 
-#  ====== Variáveis de Estado Léxico Globais ======
-symbol_table = []
-token_count = {token: 0 for token in tokens}
-processed_tokens = [] 
-error_tokens = []
-# Flag para controlar se vai registrar tokens (modo léxico) ou não
-collect_lex_info = True
-
 # ====== Funções Auxiliares =======
+# O estado léxico pertence ao TontoLexer dono da instância PLY (t.lexer.owner);
+# o lexer mestre do módulo não tem dono e, portanto, não registra nada.
 def add_to_symbol_table(token):
-    global collect_lex_info
-
-    if not collect_lex_info:
+    owner = token.lexer.owner
+    if owner is None or not owner.collect_lex_info:
         return # está no modo "sintático", não registrar nada
 
-    if any(entry['Valor'] == token.value for entry in symbol_table):
-        token_count[token.type] += 1
-        processed_tokens.append(token)
-        return  # Não adiciona duplicatas
-    symbol_table.append({
-        'Token': token.type,
-        'Valor': token.value
-    })
-    token_count[token.type] += 1
-    processed_tokens.append(token)
+    # Duplicatas só acrescentam a posição à entrada já existente
+    entry = owner.symbol_table.add(token.type, token.value, token.lineno, token.lexpos)
+    owner.token_count[token.type] += 1
+    # Guarda um registro compacto, sem o LexToken (e sua referência ao lexer),
+    # compartilhando a string do lexema com a tabela de símbolos
+    value = entry.value if entry is not None else token.value
+    owner.processed_tokens.append(TokenRecord(token.type, value, token.lineno, token.lexpos))
 
 def add_to_error_list(token):
     data = token.lexer.lexdata
@@ -67,8 +63,9 @@ def add_to_error_list(token):
 
     invalid_lexeme = data[start:i] if i > start else data[start:start+1]
 
-    if collect_lex_info:
-        error_tokens.append({
+    owner = token.lexer.owner
+    if owner is not None and owner.collect_lex_info:
+        owner.error_tokens.append({
             'Token': 'ERRO',
             'Valor': invalid_lexeme,
             'Linha': token.lineno,
@@ -324,23 +321,68 @@ def t_error(t):
     t.lexer.skip(consumed)
 
 # ====== Construção do Lexer ====== 
-lexer = lex.lex()
+# Lexer mestre do PLY: as regras são compiladas uma vez e cada TontoLexer usa um
+# clone. lex.lex() reflete sobre todas as regras t_* e compila cada regex, então
+# só é feito no primeiro uso do motor 'ply' (o padrão é o 'fast').
+_ply_master = None
+_ply_master_lock = threading.Lock()
+
+def ply_lexer():
+    global _ply_master
+    if _ply_master is None:
+        with _ply_master_lock:
+            if _ply_master is None:
+                import ply.lex as lex
+                master = lex.lex(module=sys.modules[__name__])
+                master.owner = None
+                _ply_master = master
+    return _ply_master
+
+# Motor padrão: regex única + classificação das palavras por dicionário,
+# reaproveitando as mesmas funções t_* (ver fast_lexer.py)
+fast_lexer = FastLexer(
+    {name[2:]: func for name, func in list(globals().items()) if name.startswith('t_') and callable(func)},
+    add_to_symbol_table, ('ATTRIBUTE', 'CARDINALITY', 'newline'),
+    keywords, class_stereotypes, relation_stereotypes, ignore=t_ignore,
+)
+
+LEXER_ENGINES = ('fast', 'ply')
+
+# ====== Lexer com estado próprio (re-entrante) ======
+class TontoLexer:
+    """Envolve um clone do lexer mestre e guarda o estado léxico de uma análise.
+
+    Cada instância é independente, então várias análises podem rodar em paralelo
+    (ex.: em threads). Também serve diretamente como lexer para o parser (input/token).
+    """
+
+    def __init__(self, collect_lex_info=True, engine='fast'):
+        # Flag para controlar se vai registrar tokens (modo léxico) ou não
+        self.collect_lex_info = collect_lex_info
+        self.symbol_table = SymbolTable()
+        self.token_count = {token: 0 for token in tokens}
+        self.processed_tokens = []
+        self.error_tokens = []
+        if engine not in LEXER_ENGINES:
+            raise ValueError(f"Motor léxico desconhecido: {engine!r} (use um de {LEXER_ENGINES})")
+        self.lexer = (fast_lexer if engine == 'fast' else ply_lexer()).clone()
+        self.lexer.owner = self
+
+    def input(self, data):
+        self.lexer.lineno = 1
+        self.lexer.input(data)
+
+    def token(self):
+        return self.lexer.token()
+
+    def tokenize(self, data):
+        with phases.phase("lexer.tokenize"):
+            self.input(data)
+            while self.lexer.token():
+                pass
+        return self.processed_tokens, self.symbol_table, self.error_tokens
 
 # ====== Função para analisar o texto  ====== 
-def analyze_text(data):
-    global symbol_table, token_count, processed_tokens, error_tokens, collect_lex_info
-    
-    # Limpa completamente o contexto anterior
-    symbol_table = []
-    token_count = {token: 0 for token in tokens}
-    processed_tokens = []
-    error_tokens = []
-    collect_lex_info = True
-    
-    lexer.lineno = 1
-    lexer.input(data)
-    while lexer.token():
-        pass 
-        
+def analyze_text(data, engine='fast'):
     # Retorna as listas de estado para o cli/main.py
-    return processed_tokens, symbol_table, error_tokens
\ No newline at end of file
+    return TontoLexer(engine=engine).tokenize(data)
@@ -1,45 +1,82 @@
-# ====== Exibir os tokens processados ====== 
-def show_tokens(processed_tokens, error_tokens):
-    print("\n===================== TOKENS PROCESSADOS =======================")
-    header = f"{'Token':<20} {'Valor':<28} {'Linha':<6} {'Posição':<5}"
-    print("-" * len(header))
-    print(header)
-    print("-" * len(header))
+from ..profiling import phases
+
+# ====== Formatação das linhas dos relatórios (também usada pelas tabelas da TUI) ======
+TOKEN_HEADER = f"{'Token':<20} {'Valor':<28} {'Linha':<6} {'Posição':<5}"
+SYMBOL_HEADER = f"{'Token':<20} {'Valor':<30}"
+
+def format_token_row(token):
+    return f"{token.type:<20} {str(token.value):<30} {token.lineno:<6} {token.lexpos:<6}"
+
+def format_error_row(error):
+    return f"{error['Token']:<20} {error['Valor']:<30} {error['Linha']:<6} {error['Posição']:<5}"
+
+def format_symbol_row(entry):
+    return f"{entry['Token']:<20} {entry['Valor']:<30}"
+
+# ====== Linhas dos tokens processados ======
+# Os relatórios são geradores de linhas (sem "\n"): quem chama decide o destino
+# (terminal, arquivo, socket, TUI) e nenhuma string intermediária é montada.
+def token_lines(processed_tokens, error_tokens):
+    header = TOKEN_HEADER
+    yield ""
+    yield "===================== TOKENS PROCESSADOS ======================="
+    yield "-" * len(header)
+    yield header
+    yield "-" * len(header)
 
     for token in processed_tokens:
-        print(f"{token.type:<20} {str(token.value):<30} {token.lineno:<6} {token.lexpos:<6}")
+        yield format_token_row(token)
 
     if error_tokens:
-        header = f"{'Token':<20} {'Valor':<28} {'Linha':<6} {'Posição':<5}"
-        print("\n======================= ERROS LÉXICOS ==========================")
-        print("-" * len(header))
-        print(header)
-        print("-" * len(header))
+        yield ""
+        yield "======================= ERROS LÉXICOS =========================="
+        yield "-" * len(header)
+        yield header
+        yield "-" * len(header)
         for error in error_tokens:
-            print(f"{error['Token']:<20} {error['Valor']:<30} {error['Linha']:<6} {error['Posição']:<5}")
-
-# ====== Exibir a tabela de símbolos ====== 
-def show_symbol_table(symbol_table):
-    print("\n================== TABELA DE SÍMBOLOS ==================")
-    print("-" * 55)
-    print(f"{'Token':<20} {'Valor':<30}")
-    print("-" * 55)
+            yield format_error_row(error)
+
+# ====== Linhas da tabela de símbolos ======
+def symbol_table_lines(symbol_table):
+    yield ""
+    yield "================== TABELA DE SÍMBOLOS =================="
+    yield "-" * 55
+    yield SYMBOL_HEADER
+    yield "-" * 55
     for entry in symbol_table:
-        print(f"{entry['Token']:<20} {entry['Valor']:<30}")
+        yield format_symbol_row(entry)
 
-# ====== Exibir a contagem de tokens ====== 
-def show_token_count(processed_tokens):
+# ====== Contagem de tokens ======
+def token_counts(processed_tokens):
+    """Pares (tipo, quantidade), do tipo mais frequente para o menos frequente."""
     counts = {}
     for token in processed_tokens:
         counts[token.type] = counts.get(token.type, 0) + 1
-    
-    print("\n======== CONTAGEM DE TOKENS =======")
-    print("-" * 35)
-    print(f"{'Token':<20} {'Quantidade':<10}")
-    print("-" * 35)
-
-    sorted_counts = sorted(counts.items(), key=lambda item: item[1], reverse=True)
-    
-    for token, count in sorted_counts:
+    return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+def token_count_lines(processed_tokens):
+    yield ""
+    yield "======== CONTAGEM DE TOKENS ======="
+    yield "-" * 35
+    yield f"{'Token':<20} {'Quantidade':<10}"
+    yield "-" * 35
+
+    for token, count in token_counts(processed_tokens):
         if count > 0:
-            print(f"{token:<20} {count:<10}")
\ No newline at end of file
+            yield f"{token:<20} {count:<10}"
+
+# ====== Exibir os relatórios (out: qualquer stream de texto, padrão stdout) ======
+def show_tokens(processed_tokens, error_tokens, out=None):
+    with phases.phase("report.tokens"):
+        for line in token_lines(processed_tokens, error_tokens):
+            print(line, file=out)
+
+def show_symbol_table(symbol_table, out=None):
+    with phases.phase("report.symbol_table"):
+        for line in symbol_table_lines(symbol_table):
+            print(line, file=out)
+
+def show_token_count(processed_tokens, out=None):
+    with phases.phase("report.token_count"):
+        for line in token_count_lines(processed_tokens):
+            print(line, file=out)
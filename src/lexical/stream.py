@@ -0,0 +1,151 @@
+import sys
+
+from . import lexer as lexer_module
+from .symbol_table import SymbolTable
+from .token_record import TokenRecord
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # caracteres por leitura
+
+# Caracteres que podem continuar uma cardinalidade aberta ("[ 1 .. *" + quebra de linha + "]")
+_CARDINALITY_CHARS = set(' \t\r\n0123456789.*')
+
+# ====== Estado léxico limitado para o modo streaming ======
+class _OffsetSymbolTable:
+    """Repassa registros à tabela de símbolos somando o deslocamento do bloco atual."""
+    def __init__(self, table, state):
+        self.table = table
+        self.state = state
+
+    def add(self, token_type, value, line, pos):
+        return self.table.add(token_type, value, line, pos + self.state.base)
+
+class _NoSymbolTable:
+    def add(self, token_type, value, line, pos):
+        return None
+
+class _StreamState:
+    """Dono do lexer durante o streaming: os tokens e erros de cada chamada a
+    token() são repassados e descartados, então a memória não cresce com o arquivo."""
+
+    def __init__(self, symbol_table, count_tokens):
+        self.collect_lex_info = True
+        self.base = 0
+        self.symbol_table = _OffsetSymbolTable(symbol_table, self) if symbol_table is not None else _NoSymbolTable()
+        self.token_count = {token: 0 for token in lexer_module.tokens} if count_tokens else _NullCounter()
+        self.processed_tokens = []
+        self.error_tokens = []
+
+class _NullCounter(dict):
+    def __missing__(self, key):
+        return 0
+
+    def __setitem__(self, key, value):
+        pass
+
+# ====== Leitura em blocos ======
+def _safe_cut(buffer):
+    """Posição (logo após uma quebra de linha) até onde o bloco pode ser tokenizado
+    sem cortar um token; 0 se ainda não houver um ponto seguro."""
+    cut = buffer.rfind('\n') + 1
+    while cut > 0:
+        open_bracket = buffer.rfind('[', 0, cut)
+        if open_bracket < 0 or buffer.rfind(']', 0, cut) > open_bracket:
+            return cut
+        if not all(c in _CARDINALITY_CHARS for c in buffer[open_bracket + 1:cut]):
+            return cut
+        # Cardinalidade possivelmente aberta atravessando a quebra: corta antes da sua linha
+        cut = buffer.rfind('\n', 0, open_bracket) + 1
+    return 0
+
+def _read_chunks(source, chunk_size):
+    if isinstance(source, str):
+        if source == '-':
+            yield from _read_chunks(sys.stdin, chunk_size)
+            return
+        with open(source, "r", encoding="utf-8") as f:
+            yield from _read_chunks(f, chunk_size)
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+# ====== API de streaming ======
+def stream_tokens(source, chunk_size=DEFAULT_CHUNK_SIZE, symbol_table=None, token_count=None, engine='fast'):
+    """Gera os tokens (TokenRecord) e erros léxicos de um arquivo à medida que são produzidos.
+
+    `source` é um caminho ('-' para stdin) ou um arquivo de texto aberto; o
+    conteúdo é lido em blocos de `chunk_size` caracteres e apenas o bloco atual
+    fica em memória. Erros léxicos são gerados como TokenRecord de tipo 'ERRO'.
+    Passe uma SymbolTable em `symbol_table` e/ou um dict em `token_count` para
+    acumulá-los durante a leitura (ambos são opcionais).
+    """
+    state = _StreamState(symbol_table, token_count is not None)
+    lexer = lexer_module.TontoLexer(engine=engine).lexer
+    lexer.owner = state
+    lexer.lineno = 1
+
+    carry = ''
+    chunks = _read_chunks(source, chunk_size)
+    exhausted = False
+    while not exhausted:
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer, carry = carry, ''
+        else:
+            buffer = carry + chunk
+            cut = _safe_cut(buffer)
+            if cut == 0:
+                carry = buffer
+                continue
+            buffer, carry = buffer[:cut], buffer[cut:]
+        if not buffer:
+            continue
+
+        lexer.input(buffer)
+        processed, errors = state.processed_tokens, state.error_tokens
+        base = state.base
+        while True:
+            tok = lexer.token()
+            if len(processed) == 1 and not errors:
+                # Caso comum: um único token, sem erros antes dele
+                record = processed.pop()
+                record.lexpos += base
+                yield record
+            elif processed or errors:
+                yield from _drain(state)
+            if tok is None:
+                break
+        state.base += len(buffer)
+
+    if token_count is not None:
+        for token_type, count in state.token_count.items():
+            if count:
+                token_count[token_type] = token_count.get(token_type, 0) + count
+
+def _drain(state):
+    base = state.base
+    # Erros e tokens de uma mesma chamada a token() vêm em ordem de posição
+    pending = []
+    for record in state.processed_tokens:
+        record.lexpos += base
+        pending.append(record)
+    for error in state.error_tokens:
+        pending.append(TokenRecord('ERRO', error['Valor'], error['Linha'], error['Posição'] + base))
+    state.processed_tokens.clear()
+    state.error_tokens.clear()
+    if len(pending) > 1:
+        pending.sort(key=lambda r: r.lexpos)
+    return pending
+
+def stream_lex_summary(source, chunk_size=DEFAULT_CHUNK_SIZE, engine='fast'):
+    """Percorre o arquivo em streaming e retorna (tabela de símbolos, contagem, erros léxicos)."""
+    symbol_table = SymbolTable()
+    counts = {}
+    errors = []
+    for record in stream_tokens(source, chunk_size, symbol_table, counts, engine):
+        if record.type == 'ERRO':
+            errors.append({'Token': 'ERRO', 'Valor': record.value, 'Linha': record.lineno, 'Posição': record.lexpos})
+    return symbol_table, counts, errors
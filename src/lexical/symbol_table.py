@@ -0,0 +1,81 @@
+from array import array
+
+# ====== Tabela de Símbolos Indexada ======
+class SymbolEntry:
+    """Entrada da tabela de símbolos: um lexema, seu token e as posições onde ocorre."""
+    __slots__ = ("token", "value", "first_line", "first_pos", "_positions")
+
+    def __init__(self, token, value, line, pos):
+        self.token = token
+        self.value = value
+        self.first_line = line
+        self.first_pos = pos
+        # Pares (linha, posição) achatados em um array compacto
+        self._positions = array('q', (line, pos))
+
+    def add_occurrence(self, line, pos):
+        self._positions.append(line)
+        self._positions.append(pos)
+
+    @property
+    def occurrences(self):
+        positions = self._positions
+        return list(zip(positions[0::2], positions[1::2]))
+
+    def as_dict(self):
+        return {'Token': self.token, 'Valor': self.value}
+
+
+class SymbolTable:
+    """Tabela de símbolos com busca O(1) por lexema (e, opcionalmente, por tipo de token).
+
+    A iteração produz a visão ordenada [{'Token', 'Valor'}] consumida pelos
+    relatórios, na ordem da primeira ocorrência de cada lexema.
+    """
+
+    def __init__(self):
+        self._by_value = {}
+        self._by_type = {}
+        self._entries = []
+
+    def add(self, token_type, value, line, pos):
+        """Registra uma ocorrência e retorna a entrada do lexema (nova ou existente)."""
+        entry = self._by_value.get(value)
+        if entry is not None:
+            entry.add_occurrence(line, pos)
+            return entry
+
+        entry = SymbolEntry(token_type, value, line, pos)
+        self._by_value[value] = entry
+        self._by_type.setdefault(token_type, {})[value] = entry
+        self._entries.append(entry.as_dict())
+        return entry
+
+    def lookup(self, value, token_type=None):
+        """Retorna a SymbolEntry do lexema (ou None). Com token_type, restringe ao tipo."""
+        if token_type is None:
+            return self._by_value.get(value)
+        return self._by_type.get(token_type, {}).get(value)
+
+    def of_type(self, token_type):
+        """Lista as entradas de um tipo de token, na ordem da primeira ocorrência."""
+        return list(self._by_type.get(token_type, {}).values())
+
+    def occurrences(self, value):
+        entry = self._by_value.get(value)
+        return entry.occurrences if entry else []
+
+    def entries(self):
+        return list(self._entries)
+
+    def __contains__(self, value):
+        return value in self._by_value
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
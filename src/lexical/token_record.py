@@ -0,0 +1,18 @@
+# ====== Registro compacto de token ======
+class TokenRecord:
+    """Token guardado após a análise léxica: só tipo, valor, linha e posição.
+
+    Ao contrário do LexToken do PLY, não tem __dict__ nem referência ao lexer,
+    então a lista de tokens processados ocupa bem menos memória. O slot
+    'lexer' existe apenas para o parser PLY, que o preenche em tokens com erro.
+    """
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"TokenRecord({self.type},{self.value!r},{self.lineno},{self.lexpos})"
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+
+from ..profiling import phases
+from .pipeline import analyze_source
+
+# Arquivos cujo conteúdo define a versão do analisador (mudou a gramática/lexer, muda a chave)
+_VERSION_SOURCES = (
+    os.path.join(os.path.dirname(__file__), '..', 'lexical', 'lexer.py'),
+    os.path.join(os.path.dirname(__file__), '..', 'lexical', 'fast_lexer.py'),
+    os.path.join(os.path.dirname(__file__), '..', 'lexical', 'symbol_table.py'),
+    os.path.join(os.path.dirname(__file__), 'grammar.py'),
+    os.path.join(os.path.dirname(__file__), 'summary.py'),
+    os.path.join(os.path.dirname(__file__), 'model.py'),
+    os.path.join(os.path.dirname(__file__), 'pipeline.py'),
+)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Ao passar do limite, remove entradas até esta fração dele: os próximos put()
+# não precisam varrer o diretório de novo
+EVICT_LOW_WATER = 0.9
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.environ.get('TONTO_CACHE_DIR') or os.path.join(base, 'tonto_analyzer')
+
+_analyzer_version = None
+
+def analyzer_version():
+    """Hash dos fontes do lexer/gramática; invalida o cache quando o analisador muda."""
+    global _analyzer_version
+    if _analyzer_version is None:
+        h = hashlib.sha256()
+        for path in _VERSION_SOURCES:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        _analyzer_version = h.hexdigest()[:16]
+    return _analyzer_version
+
+# ====== Cache em disco dos resultados de análise ======
+class AnalysisCache:
+    """Cache persistente de resultados (AnalysisResult.to_dict) indexado pelo hash do conteúdo.
+
+    Cada entrada é um arquivo JSON; o mtime marca o último acesso e, ao passar de
+    max_bytes, as entradas menos usadas recentemente são removidas (LRU) até
+    EVICT_LOW_WATER * max_bytes. Pode ser usado por várias threads.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._total_bytes = None
+        self._lock = threading.Lock()  # protege _total_bytes e a remoção
+
+    # Vai para os processos do -j (ProcessPoolExecutor): o lock não é serializável
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def key(self, data):
+        h = hashlib.sha256(analyzer_version().encode())
+        h.update(data.encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, data):
+        path = self._path(self.key(data))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # marca o acesso para a política LRU
+        except OSError:
+            pass
+        return record
+
+    def put(self, data, record):
+        path = self._path(self.key(data))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Temporário único por processo e thread (o daemon grava de um pool de threads)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+            new_size = os.path.getsize(tmp_path)
+            with self._lock:
+                try:
+                    old_size = os.path.getsize(path)  # sobrescrita: só a diferença conta
+                except OSError:
+                    old_size = 0
+                os.replace(tmp_path, path)
+                if self._total_bytes is not None:
+                    self._total_bytes += new_size - old_size
+                self._evict()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, files in os.walk(self.cache_dir):
+            for fname in files:
+                if fname.endswith('.json'):
+                    path = os.path.join(root, fname)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_LOW_WATER
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove todas as entradas. Retorna quantas foram apagadas."""
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+        return removed
+
+# ====== Análise com cache ======
+def analyze_cached(data, cache):
+    """Retorna o resultado serializável da análise, reaproveitando o cache se possível."""
+    if cache is not None:
+        with phases.phase("cache.get"):
+            record = cache.get(data)
+        if record is not None:
+            return record
+    record = analyze_source(data).to_dict()
+    if cache is not None:
+        try:
+            with phases.phase("cache.put"):
+                cache.put(data, record)
+        except OSError:
+            pass  # cache indisponível (ex.: disco somente leitura) não impede a análise
+    return record
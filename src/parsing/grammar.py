@@ -1,29 +1,75 @@
-import ply.yacc as yacc
+import copy
+import threading
 
 from ..lexical import lexer as lexer_module
+from ..profiling import phases
+from . import parse_tables, parser_stats
 from .summary import ModelBuilder 
 
-class TontoParser:
+# ====== Estado de uma análise (separado da gramática) ======
+class ParseContext:
     def __init__(self, model_builder):
         self.model_builder = model_builder
         self.syntax_errors = []
-        self.tokens = lexer_module.tokens 
-        
-        # Constrói o parser
-        self.parser = yacc.yacc(module=self, start="model", debug=False)
-        
+
     def register_error(self, token, msg):
         if token:
             self.syntax_errors.append(f"Erro de sintaxe na linha {token.lineno}: {msg} (token: '{token.value}')")
         else:
             self.syntax_errors.append(msg)
 
-    def p_error(self, p):
+# Arquivos que definem a gramática (regras p_* e precedências): mudou, muda a versão das tabelas
+_GRAMMAR_SOURCES = (__file__,)
+
+def grammar_tables_path(cache_dir=None):
+    """Arquivo das tabelas LALR pré-compiladas da versão atual da gramática."""
+    version = parse_tables.tables_version(_GRAMMAR_SOURCES, lexer_module.tokens, "model")
+    return parse_tables.tables_path(version, cache_dir)
+
+class TontoParser:
+    """Gramática TONTO. As tabelas LALR são carregadas (ou geradas) uma única vez;
+    cada chamada a parse() usa uma cópia leve do parser PLY ligada ao seu próprio ParseContext."""
+
+    def __init__(self, cache_dir=None):
+        self.tokens = lexer_module.tokens 
+        
+        # Monta o parser a partir das tabelas pré-compiladas (ver parse_tables.py)
+        self.parser = parse_tables.load_parser(self, "model", _GRAMMAR_SOURCES, self.tokens, cache_dir)
+        self.parser.context = None
+
+    def parse(self, lexer, model_builder):
+        with phases.phase("parser.parse"):
+            # Com o perfil ativo, os callbacks do builder são medidos um a um
+            context = ParseContext(phases.instrument(model_builder, "ModelBuilder"))
+            parser = copy.copy(self.parser)  # compartilha as tabelas, não o estado da pilha
+            parser.context = context
+            parser.errorfunc = lambda p: self._handle_error(parser, p)
+            # Com estatísticas ativas, a cópia conta reduções, tokens e erros
+            stats = parser_stats.active()
+            if stats is not None:
+                lexer = stats.instrument(parser, lexer)
+            ast = parser.parse(lexer=lexer)
+            if stats is not None:
+                stats.add(parser.counter)
+        return ast, context
+
+    def _handle_error(self, parser, p):
+        counter = getattr(parser, "counter", None)
+        if counter is not None:
+            counter.syntax_errors += 1
         if not p:
-            self.register_error(None, "Erro de sintaxe próximo ao fim do arquivo.")
+            if counter is not None:
+                counter.eof_errors += 1
+            parser.context.register_error(None, "Erro de sintaxe próximo ao fim do arquivo.")
             return
-        self.register_error(p, "Token inesperado")
-        self.parser.errok() # não para a validação se achar erro 
+        parser.context.register_error(p, "Token inesperado")
+        parser.errok() # não para a validação se achar erro 
+        if counter is not None:
+            counter.recoveries += 1
+
+    def p_error(self, p):
+        # Exigido pelo yacc; em parse() cada cópia do parser usa _handle_error com seu contexto
+        self._handle_error(self.parser, p)
 
     # ======  DEFINIÇÃO DA GRAMÁTICA =======
     # Símbolo inicial
@@ -40,17 +86,21 @@ class TontoParser:
     def p_imports(self, p):
         """imports : import_stmt
                    | imports import_stmt"""
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[2]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[2])  # acumula no lugar (evita copiar a lista a cada redução)
+            p[0] = p[1]
 
     def p_import_stmt(self, p):
         """import_stmt : IMPORT CLASS_NAME"""
-        self.model_builder.register_import(p[2])
+        p.parser.context.model_builder.register_import(p[2])
         p[0] = ("import", p[2])
 
     # Package
     def p_package_decl(self, p):
         """package_decl : PACKAGE CLASS_NAME"""
-        self.model_builder.register_package(p[2])
+        p.parser.context.model_builder.register_package(p[2])
         p[0] = p[2]
 
     # Declarações
@@ -65,10 +115,9 @@ class TontoParser:
         if len(p) == 2:
             p[0] = [] if p[1] is None else [p[1]]
         else:
-            if p[2] is None:
-                p[0] = p[1]
-            else:
-                p[0] = p[1] + [p[2]]
+            if p[2] is not None:
+                p[1].append(p[2])
+            p[0] = p[1]
 
     def p_declaration(self, p):
         """declaration : class_decl
@@ -85,14 +134,14 @@ class TontoParser:
         name = p[2]
         stereotype = p[1]
         superclasses = p[3]
-        self.model_builder.register_class_header(name, stereotype, superclasses)
+        p.parser.context.model_builder.register_class_header(name, stereotype, superclasses)
         p[0] = name
 
     def p_class_decl(self, p):
         """class_decl : class_header opt_class_body"""
         class_name = p[1]
         members = p[2]
-        self.model_builder.register_class_members(class_name, members)
+        p.parser.context.model_builder.register_class_members(class_name, members)
         p[0] = ("class", class_name)
 
     # Specializes (opcional)
@@ -104,7 +153,11 @@ class TontoParser:
     def p_class_list(self, p):
         """class_list : CLASS_NAME
                       | class_list COMMA CLASS_NAME"""
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_opt_class_body(self, p):
         """opt_class_body :
@@ -114,7 +167,11 @@ class TontoParser:
     def p_class_members(self, p):
         """class_members : 
                          | class_members class_member"""
-        p[0] = [] if len(p) == 1 else p[1] + [p[2]]
+        if len(p) == 1:
+            p[0] = []
+        else:
+            p[1].append(p[2])
+            p[0] = p[1]
 
     def p_class_member(self, p):
         """class_member : attribute_decl
@@ -150,12 +207,16 @@ class TontoParser:
     def p_meta_attr_list(self, p):
         """meta_attr_list : META_ATTRIBUTE
                           | meta_attr_list COMMA META_ATTRIBUTE"""
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # Datatypes
     def p_datatype_decl(self, p):
         """datatype_decl : DATATYPE NEW_DATATYPE opt_dt_specializes opt_datatype_body"""
-        self.model_builder.register_datatype(p[2], p[3], p[4])
+        p.parser.context.model_builder.register_datatype(p[2], p[3], p[4])
         p[0] = ("datatype", p[2])
 
     def p_opt_dt_specializes(self, p):
@@ -166,7 +227,11 @@ class TontoParser:
     def p_dt_super_list(self, p):
         """dt_super_list : type
                          | dt_super_list COMMA type"""
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_opt_datatype_body(self, p):
         """opt_datatype_body :
@@ -176,12 +241,16 @@ class TontoParser:
     def p_opt_datatype_fields(self, p):
         """opt_datatype_fields :
                                | opt_datatype_fields attribute_decl"""
-        p[0] = [] if len(p) == 1 else p[1] + [p[2]]
+        if len(p) == 1:
+            p[0] = []
+        else:
+            p[1].append(p[2])
+            p[0] = p[1]
 
     # Enums
     def p_enum_decl(self, p):
         """enum_decl : ENUM CLASS_NAME LBRACE opt_enum_elements RBRACE"""
-        self.model_builder.register_enum(p[2], p[4])
+        p.parser.context.model_builder.register_enum(p[2], p[4])
         p[0] = ("enum", p[2])
 
     def p_opt_enum_elements(self, p):
@@ -192,7 +261,11 @@ class TontoParser:
     def p_enum_elements(self, p):
         """enum_elements : enum_element
                          | enum_elements COMMA enum_element"""
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_enum_element(self, p):
         """enum_element : INSTANCE_NAME"""
@@ -207,7 +280,7 @@ class TontoParser:
         general = p[7]     
         categorizer = None 
 
-        self.model_builder.register_genset(name, constraints, general, specifics, categorizer, data=None)
+        p.parser.context.model_builder.register_genset(name, constraints, general, specifics, categorizer, data=None)
         p[0] = ("genset_inline", specifics, general)
 
     def p_genset_long(self, p):
@@ -216,7 +289,7 @@ class TontoParser:
         name = p[3]        
         data = p[5]       
 
-        self.model_builder.register_genset(name, constraints, None, None, None, data=data)
+        p.parser.context.model_builder.register_genset(name, constraints, None, None, None, data=data)
         p[0] = ("genset_long", data)
 
     def p_genset_body(self, p):
@@ -260,7 +333,7 @@ class TontoParser:
         card_from = p[2]
         connector = p[3]
         name = p[4]
-        self.model_builder.register_internal_relation(stereo, card_from, connector, name, p[5], p[6])
+        p.parser.context.model_builder.register_internal_relation(stereo, card_from, connector, name, p[5], p[6])
         p[0] = ("internal_relation", name)
 
     def p_opt_stereo(self, p):
@@ -290,19 +363,48 @@ class TontoParser:
         card_to   = p[7]
         range_    = p[8]
 
-        self.model_builder.register_external_relation(stereo, domain, card_from, connector, name, card_to, range_)
+        p.parser.context.model_builder.register_external_relation(stereo, domain, card_from, connector, name, card_to, range_)
         p[0] = ("external_relation", domain, range_)
 
+# Fornece ao parser tokens já produzidos pelo lexer (sem re-tokenizar o texto)
+class TokenStream:
+    def __init__(self, tokens):
+        self._tokens = iter(tokens)
+
+    def input(self, data):
+        pass
+
+    def token(self):
+        return next(self._tokens, None)
+
+# ====== Parser compartilhado (tabelas construídas uma vez por processo) ======
+_shared_parser = None
+_shared_parser_lock = threading.Lock()
+
+def get_parser():
+    global _shared_parser
+    if _shared_parser is None:
+        with _shared_parser_lock:
+            if _shared_parser is None:
+                with phases.phase("parser.tables"):
+                    _shared_parser = TontoParser()
+    return _shared_parser
+
+# Parse a partir de um fluxo de tokens já registrado (ex.: processed_tokens de analyze_text)
+def parse_tokens(tokens):
+    model_builder_instance = ModelBuilder()
+    ast, context = get_parser().parse(TokenStream(tokens), model_builder_instance)
+
+    return ast, model_builder_instance.get_summary(), context.syntax_errors
+
 # Função principal de parse que encapsula a lógica
 def parse_text(data):
     model_builder_instance = ModelBuilder()
-    parser_instance = TontoParser(model_builder_instance)
 
-    lexer_module.collect_lex_info = False # desliga a coleta léxica durante o parse (para evitar duplicatas)
-    lexer_module.lexer.lineno = 1
-    lexer_module.lexer.input(data)
-    ast = parser_instance.parser.parse(lexer=lexer_module.lexer)
-    lexer_module.collect_lex_info = True # reativa, se precisar de outra análise léxica no futuro
+    # Lexer próprio sem coleta léxica (modo sintático)
+    lexer = lexer_module.TontoLexer(collect_lex_info=False)
+    lexer.input(data)
+    ast, context = get_parser().parse(lexer, model_builder_instance)
 
     # Retorna a AST, o summary preenchido pelo builder e os erros sintáticos
-    return ast, model_builder_instance.get_summary(), parser_instance.syntax_errors
\ No newline at end of file
+    return ast, model_builder_instance.get_summary(), context.syntax_errors
@@ -0,0 +1,61 @@
+# ====== Algoritmos de grafo compartilhados (imports entre pacotes, hierarquia de classes) ======
+
+def strongly_connected_components(graph):
+    """Componentes fortemente conexos (Tarjan iterativo, tempo linear).
+
+    `graph` mapeia cada nó para um iterável de vizinhos; vizinhos que não são
+    chaves do grafo são tratados como nós sem arestas de saída.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+def find_cycles(graph):
+    """Ciclos do grafo: componentes com mais de um nó ou nós com aresta para si mesmos."""
+    cycles = []
+    for component in strongly_connected_components(graph):
+        if len(component) > 1 or component[0] in graph.get(component[0], ()):
+            cycles.append(sorted(component))
+    return sorted(cycles)
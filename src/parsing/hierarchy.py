@@ -0,0 +1,141 @@
+from .graph import find_cycles
+
+# ====== Hierarquia de especialização ======
+# Junta as cláusulas `specializes` das classes e as declarações de genset
+# (cada specific especializa o general) num índice de adjacência. Os fechos
+# transitivos (ancestrais/descendentes) são memorizados por classe e só são
+# descartados para as classes afetadas quando uma declaração muda.
+
+def _declared_edges(summary):
+    """Declaração -> arestas (filha, mãe) que ela introduz.
+
+    A chave inclui a ocorrência do nome, para que declarações repetidas não se
+    sobreponham.
+    """
+    sources = {}
+    seen = {}
+    for c in summary.get("classes", []):
+        occurrence = seen[("class", c["name"])] = seen.get(("class", c["name"]), -1) + 1
+        sources[("class", c["name"], occurrence)] = frozenset((c["name"], s) for s in c.get("superclasses") or [])
+    for g in summary.get("gensets", []):
+        occurrence = seen[("genset", g["name"])] = seen.get(("genset", g["name"]), -1) + 1
+        general = g.get("general")
+        edges = frozenset((s, general) for s in g.get("specifics") or []) if general else frozenset()
+        sources[("genset", g["name"], occurrence)] = edges
+    return sources
+
+class SpecializationHierarchy:
+    def __init__(self):
+        self.parents = {}      # classe -> superclasses diretas
+        self.children = {}     # classe -> especializações diretas
+        self.stereotypes = {}  # classe -> estereótipo (primeira declaração)
+        self._sources = {}     # declaração -> arestas
+        self._edge_refs = {}   # aresta -> quantas declarações a introduzem
+        self._ancestors = {}
+        self._descendants = {}
+        self._cycles = None
+
+    @classmethod
+    def from_summary(cls, summary):
+        hierarchy = cls()
+        hierarchy.sync(summary)
+        return hierarchy
+
+    # ---- atualização ----
+    def sync(self, summary):
+        """Atualiza o índice para um novo resumo, reaplicando só as declarações
+        que mudaram. Retorna o número de declarações alteradas."""
+        stereotypes = {}
+        for c in summary.get("classes", []):
+            stereotypes.setdefault(c["name"], c["stereotype"])
+        self.stereotypes = stereotypes
+
+        sources = _declared_edges(summary)
+        changed = [key for key in self._sources.keys() | sources.keys()
+                   if self._sources.get(key) != sources.get(key)]
+        for key in changed:
+            for edge in self._sources.get(key, ()):
+                self._remove_edge(*edge)
+        for key in changed:
+            for edge in sources.get(key, ()):
+                self._add_edge(*edge)
+        self._sources = sources
+        return len(changed)
+
+    def _add_edge(self, child, parent):
+        edge = (child, parent)
+        refs = self._edge_refs.get(edge, 0)
+        self._edge_refs[edge] = refs + 1
+        if refs == 0:
+            self._invalidate(child, parent)
+            self.parents.setdefault(child, set()).add(parent)
+            self.children.setdefault(parent, set()).add(child)
+
+    def _remove_edge(self, child, parent):
+        edge = (child, parent)
+        refs = self._edge_refs[edge] - 1
+        if refs:
+            self._edge_refs[edge] = refs
+            return
+        del self._edge_refs[edge]
+        self._invalidate(child, parent)
+        self.parents[child].discard(parent)
+        self.children[parent].discard(child)
+
+    def _invalidate(self, child, parent):
+        # Uma aresta filha -> mãe altera os ancestrais da filha e de tudo abaixo
+        # dela, e os descendentes da mãe e de tudo acima dela; os demais fechos
+        # memorizados continuam válidos. Os fechos usados aqui são do grafo antes da
+        # mudança e não são memorizados: com um ciclo, ficariam errados logo depois.
+        if self._ancestors:
+            below = self._closure(child, self.children, self._descendants, store=False) | {child}
+            for name in below:
+                self._ancestors.pop(name, None)
+        if self._descendants:
+            above = self._closure(parent, self.parents, self._ancestors, store=False) | {parent}
+            for name in above:
+                self._descendants.pop(name, None)
+        self._cycles = None
+
+    # ---- consultas ----
+    def ancestors(self, name):
+        """Todas as superclasses de `name`, diretas e indiretas."""
+        return self._closure(name, self.parents, self._ancestors)
+
+    def descendants(self, name, stereotype=None):
+        """Todas as especializações de `name`; opcionalmente só as de um estereótipo."""
+        result = self._closure(name, self.children, self._descendants)
+        if stereotype is None:
+            return result
+        return frozenset(n for n in result if self.stereotypes.get(n) == stereotype)
+
+    def is_a(self, name, ancestor):
+        return ancestor in self.ancestors(name)
+
+    def _closure(self, name, adjacency, memo, store=True):
+        cached = memo.get(name)
+        if cached is not None:
+            return cached
+        result = set()
+        stack = list(adjacency.get(name, ()))
+        while stack:
+            current = stack.pop()
+            if current in result:
+                continue
+            result.add(current)
+            known = memo.get(current)
+            if known is not None:
+                # Fecho já calculado: não é preciso percorrer abaixo dele
+                result |= known
+            else:
+                stack.extend(adjacency.get(current, ()))
+        result = frozenset(result)
+        if store:
+            memo[name] = result
+        return result
+
+    def cycles(self):
+        """Ciclos de especialização (classes que acabam especializando a si mesmas)."""
+        if self._cycles is None:
+            self._cycles = find_cycles(self.parents)
+        return self._cycles
@@ -0,0 +1,341 @@
+from bisect import bisect_right
+
+from ..lexical.lexer import TontoLexer
+from ..lexical.token_record import TokenRecord
+from ..profiling import phases
+from .grammar import parse_tokens
+from .pipeline import AnalysisResult
+from .model import Model, model_of
+from .hierarchy import SpecializationHierarchy
+
+# Tokens que iniciam uma declaração de nível superior (fora de chaves)
+_DECLARATION_STARTS = {'CLASS_STEREOTYPE', 'DATATYPE', 'ENUM', 'GENSET', 'DISJOINT', 'COMPLETE', 'RELATION', 'AT'}
+# Tokens que continuam a declaração iniciada pelo token anterior (ex.: "disjoint complete genset")
+_CONTINUES_AFTER = {
+    'AT': {'RELATION'},
+    'DISJOINT': {'COMPLETE', 'GENSET'},
+    'COMPLETE': {'DISJOINT', 'GENSET'},
+}
+# ... ou pelos dois anteriores: "@material relation" é AT RELATION_STEREOTYPE RELATION
+_CONTINUES_AFTER_PAIR = {
+    ('AT', 'RELATION_STEREOTYPE'): {'RELATION'},
+}
+
+# Prefixo sintético para parsear uma declaração isolada (a gramática exige um package)
+_SEGMENT_PREFIX = (TokenRecord('PACKAGE', 'package', 0, 0), TokenRecord('CLASS_NAME', 'Segment', 0, 0))
+
+def split_declarations(tokens):
+    """Divide os tokens em (cabeçalho, [tokens de cada declaração de nível superior])."""
+    header = []
+    segments = []
+    depth = 0
+    before_previous = previous = None
+    for tok in tokens:
+        starts = (
+            depth == 0
+            and tok.type in _DECLARATION_STARTS
+            and not (previous is not None and tok.type in _CONTINUES_AFTER.get(previous.type, ()))
+            and not (before_previous is not None
+                     and tok.type in _CONTINUES_AFTER_PAIR.get((before_previous.type, previous.type), ()))
+        )
+        if starts:
+            segments.append([tok])
+        elif segments:
+            segments[-1].append(tok)
+        else:
+            header.append(tok)
+
+        if tok.type == 'LBRACE':
+            depth += 1
+        elif tok.type == 'RBRACE' and depth > 0:
+            depth -= 1
+        before_previous, previous = previous, tok
+    return header, segments
+
+def _common_prefix(a, b):
+    """Tamanho do prefixo comum; busca binária comparando fatias (em C), sem
+    percorrer o texto caractere a caractere em Python."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _common_suffix(a, b, limit):
+    """Tamanho do sufixo comum, limitado a `limit` caracteres."""
+    low, high = 0, limit
+    len_a, len_b = len(a), len(b)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len_a - middle:len_a - low] == b[len_b - middle:len_b - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _merged_summary(segments):
+    model = Model()
+    for segment in segments:
+        model.merge(model_of(segment.summary))
+    return model.summary
+
+def _first_occurrences(tokens):
+    """(lexema, tipo) de cada lexema distinto, na ordem da primeira ocorrência
+    (o que a tabela de símbolos lista)."""
+    first = {}
+    for tok in tokens:
+        if tok.value not in first:
+            first[tok.value] = tok.type
+    return list(first.items())
+
+def _type_counts(tokens):
+    counts = {}
+    for tok in tokens:
+        counts[tok.type] = counts.get(tok.type, 0) + 1
+    return counts
+
+def _token_key(tok):
+    return tok.type, tok.value, tok.lineno, tok.lexpos
+
+class _Segment:
+    __slots__ = ("start", "tokens", "summary", "declarations")
+
+    def __init__(self, tokens, summary, declarations):
+        self.start = tokens[0].lexpos
+        self.tokens = tokens
+        self.summary = summary
+        self.declarations = declarations
+
+    def shifted(self, delta, line_delta):
+        """Cópia com posições e linhas deslocadas. Os tokens do resultado anterior
+        não são alterados: quem ainda o lê (TUI, daemon) continua vendo posições
+        coerentes com o texto daquela versão."""
+        tokens = [TokenRecord(tok.type, tok.value, tok.lineno + line_delta, tok.lexpos + delta)
+                  for tok in self.tokens]
+        return _Segment(tokens, self.summary, self.declarations)
+
+# ====== Análise incremental de um documento ======
+class IncrementalAnalyzer:
+    """Mantém a análise de um documento e, a cada nova versão do texto, re-tokeniza
+    apenas a região alterada e re-parseia só as declarações afetadas.
+
+    Quando não é possível garantir o mesmo resultado da análise completa (erros
+    léxicos/sintáticos, edição no cabeçalho, fronteiras ambíguas), faz a análise completa.
+    Após cada análise, `changed` indica quais dados mudaram em relação à anterior
+    ("tokens", "symbol_table", "token_count", "summary", "syntax_errors").
+    `hierarchy` acompanha o resumo, re-sincronizando só as declarações alteradas
+    (na primeira consulta após cada análise, para não pesar em quem não a usa).
+    """
+
+    def __init__(self):
+        self.text = None
+        self.result = None
+        self.last_mode = None
+        self.changed = set()
+        self._header = []
+        self._header_summary = None
+        self._segments = []
+        self._incremental_ok = False
+        self._hierarchy = SpecializationHierarchy()
+        self._hierarchy_summary = None
+
+    @property
+    def hierarchy(self):
+        summary = self.result.summary if self.result is not None else None
+        if summary is not None and summary is not self._hierarchy_summary:
+            self._hierarchy.sync(summary)
+            self._hierarchy_summary = summary
+        return self._hierarchy
+
+    # ---- análise completa ----
+    def analyze(self, text):
+        with phases.phase("incremental.analyze"):
+            return self._analyze(text)
+
+    def _analyze(self, text):
+        previous = self.result
+        self.text = text
+        self.last_mode = "full"
+        lexer = TontoLexer()
+        processed_tokens, symbol_table, error_tokens = lexer.tokenize(text)
+
+        header, segment_tokens = split_declarations(processed_tokens)
+        self._incremental_ok = not error_tokens and self._parse_parts(header, segment_tokens)
+        if self._incremental_ok:
+            self.result = self._assemble(symbol_table, error_tokens)
+        else:
+            ast, summary, syntax_errors = parse_tokens(processed_tokens)
+            self.result = AnalysisResult(processed_tokens, symbol_table, error_tokens, ast, summary, syntax_errors)
+
+        tokens_changed = (
+            previous is None
+            or previous.error_tokens != error_tokens
+            or list(map(_token_key, previous.processed_tokens)) != list(map(_token_key, processed_tokens))
+        )
+        self._record_changes(previous, tokens_changed)
+        return self.result
+
+    def _parse_parts(self, header, segment_tokens):
+        """Parseia cabeçalho e declarações separadamente; False se algum tiver erro."""
+        _, header_summary, errors = parse_tokens(header)
+        if errors:
+            return False
+        segments = []
+        for tokens in segment_tokens:
+            segment = self._parse_segment(tokens)
+            if segment is None:
+                return False
+            segments.append(segment)
+        self._header = header
+        self._header_summary = header_summary
+        self._segments = segments
+        return True
+
+    def _parse_segment(self, tokens):
+        ast, summary, errors = parse_tokens(_SEGMENT_PREFIX + tuple(tokens))
+        if errors:
+            return None
+        return _Segment(tokens, summary, ast["declarations"])
+
+    # ---- análise incremental ----
+    def update(self, text):
+        """Analisa a nova versão do texto, reaproveitando o que não mudou."""
+        with phases.phase("incremental.update"):
+            return self._update(text)
+
+    def _update(self, text):
+        if self.text is None or not self._incremental_ok or not self._segments:
+            return self.analyze(text)
+        if text == self.text:
+            self.last_mode = "unchanged"
+            self.changed = set()
+            return self.result
+
+        old = self.text
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        old_change_end = len(old) - suffix
+
+        starts = [seg.start for seg in self._segments]
+        if prefix < starts[0]:
+            return self.analyze(text)  # alteração no cabeçalho (imports/package)
+
+        # Declarações afetadas: as que tocam o intervalo alterado
+        first = bisect_right(starts, prefix) - 1
+        if first > 0 and prefix == starts[first]:
+            first -= 1  # a alteração pode ter colado na declaração anterior
+        last = bisect_right(starts, old_change_end) - 1
+        if last + 1 < len(starts) and old_change_end == starts[last + 1]:
+            last += 1
+
+        delta = len(text) - len(old)
+        region_start = starts[first]
+        old_region_end = starts[last + 1] if last + 1 < len(starts) else len(old)
+        new_region_end = old_region_end + delta
+
+        # Fronteiras precisam estar em espaço em branco para que a região seja tokenizada isoladamente
+        if region_start > 0 and not text[region_start - 1].isspace():
+            return self.analyze(text)
+        if new_region_end < len(text) and not text[new_region_end - 1].isspace():
+            return self.analyze(text)
+
+        # Linhas seguem a contagem do lexer (que ignora quebras dentro de tokens, ex.: "[\n1]")
+        line_offset = self._segments[first].tokens[0].lineno - 1
+        region = self._lex_region(text, region_start, new_region_end, line_offset)
+        if region is None:
+            return self.analyze(text)
+        region_tokens, region_end_line = region
+        header, new_segment_tokens = split_declarations(region_tokens)
+        if header:
+            return self.analyze(text)
+
+        new_segments = []
+        for tokens in new_segment_tokens:
+            segment = self._parse_segment(tokens)
+            if segment is None:
+                return self.analyze(text)
+            new_segments.append(segment)
+
+        old_segments = self._segments[first:last + 1]
+        old_region_keys = [_token_key(tok) for seg in old_segments for tok in seg.tokens]
+        tokens_changed = old_region_keys != list(map(_token_key, region_tokens))
+        # A contagem de tokens só muda se mudar a contagem dentro da região re-tokenizada
+        counts_changed = tokens_changed and (
+            _type_counts(tok for seg in old_segments for tok in seg.tokens) != _type_counts(region_tokens))
+        # O resumo só muda se mudar a parte que vem das declarações re-parseadas
+        summary_changed = _merged_summary(old_segments) != _merged_summary(new_segments)
+
+        # Desloca posições e linhas das declarações seguintes (em cópias)
+        following = self._segments[last + 1:]
+        line_delta = region_end_line - following[0].tokens[0].lineno if following else 0
+        if following and (delta or line_delta):
+            tokens_changed = True
+            following = [segment.shifted(delta, line_delta) for segment in following]
+
+        self._segments = self._segments[:first] + new_segments + following
+        self.text = text
+        self.last_mode = "incremental"
+        previous = self.result
+        self.result = self._assemble(None, [])
+        self._record_changes(previous, tokens_changed, summary_changed, counts_changed)
+        return self.result
+
+    def _record_changes(self, previous, tokens_changed, summary_changed=None, counts_changed=None):
+        current = self.result
+        if previous is None:
+            self.changed = {"tokens", "symbol_table", "token_count", "summary", "syntax_errors"}
+            return
+        changed = set()
+        if tokens_changed:
+            changed.add("tokens")
+            # Sem montar as tabelas: as entradas são os lexemas na ordem da primeira ocorrência
+            if _first_occurrences(previous.processed_tokens) != _first_occurrences(current.processed_tokens):
+                changed.add("symbol_table")
+            if counts_changed is None:
+                counts_changed = previous.token_count() != current.token_count()
+            if counts_changed:
+                changed.add("token_count")
+        if summary_changed is None:
+            summary_changed = previous.summary != current.summary
+        if summary_changed:
+            changed.add("summary")
+        if previous.syntax_errors != current.syntax_errors:
+            changed.add("syntax_errors")
+        self.changed = changed
+
+    def _lex_region(self, text, start, end, line_offset):
+        lexer = TontoLexer()
+        tokens, _, error_tokens = lexer.tokenize(text[start:end])
+        if error_tokens:
+            return None
+        for tok in tokens:
+            tok.lexpos += start
+            tok.lineno += line_offset
+        return tokens, lexer.lexer.lineno + line_offset
+
+    # ---- montagem do resultado ----
+    def _assemble(self, symbol_table, error_tokens):
+        processed_tokens = list(self._header)
+        for segment in self._segments:
+            processed_tokens.extend(segment.tokens)
+
+        model = Model()
+        model.set_package(self._header_summary["package"])
+        for name in self._header_summary["imports"]:
+            model.add_import(name)
+        for segment in self._segments:
+            model.merge(model_of(segment.summary))
+
+        declarations = []
+        for segment in self._segments:
+            declarations.extend(segment.declarations)
+        ast = {
+            "imports": [("import", name) for name in model.imports],
+            "package": model.package,
+            "declarations": declarations,
+        }
+        # O resumo (dicionários de todo o arquivo) só é montado se for consultado
+        return AnalysisResult(processed_tokens, symbol_table, error_tokens, ast, model, [])
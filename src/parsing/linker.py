@@ -0,0 +1,192 @@
+import os
+
+from .graph import find_cycles
+from .hierarchy import SpecializationHierarchy
+from .project import analyze_project, merge_summaries
+from .semantic import validate_names
+
+# Tipos de declaração com nome, indexados pelo linker
+_DECLARATION_KINDS = (("classes", "class"), ("datatypes", "datatype"), ("enums", "enum"), ("gensets", "genset"))
+
+# ====== Pacote de um projeto ligado ======
+class LinkedPackage:
+    __slots__ = ("name", "file", "summary", "names", "imports", "dependents")
+
+    def __init__(self, name, file, summary, names):
+        self.name = name
+        self.file = file
+        self.summary = summary
+        self.names = names
+        self.imports = list(dict.fromkeys(summary.get("imports", [])))
+        self.dependents = []
+
+# ====== Linker de projeto ======
+class ProjectLinker:
+    """Resolve os imports entre os arquivos de um projeto.
+
+    Recebe os resultados por arquivo de analyze_project (cada arquivo é
+    analisado uma única vez, não importa quantos o importem), mapeia nomes de
+    pacote para arquivos, monta o grafo de dependências e indexa as
+    declarações de todos os pacotes para consultas cruzadas.
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.packages = {}
+        self.duplicate_packages = {}
+        self.files_without_package = []
+        self.unresolved_imports = []
+        self.declarations = {}
+        self._link()
+
+    @classmethod
+    def from_directory(cls, project_dir, max_workers=None):
+        results, _, _ = analyze_project(project_dir, max_workers)
+        return cls(results)
+
+    def _link(self):
+        for r in self.results:
+            name = r["summary"].get("package")
+            if not name:
+                self.files_without_package.append(r["file"])
+                continue
+            if name in self.packages:
+                self.duplicate_packages.setdefault(name, [self.packages[name].file]).append(r["file"])
+                continue
+            self.packages[name] = LinkedPackage(name, r["file"], r["summary"], r["names"])
+
+        for package in self.packages.values():
+            for imported in package.imports:
+                target = self.packages.get(imported)
+                if target is None:
+                    self.unresolved_imports.append((package.name, imported))
+                elif target is not package:
+                    target.dependents.append(package.name)
+
+            for key, kind in _DECLARATION_KINDS:
+                for data in package.summary.get(key, []):
+                    self.declarations.setdefault(data["name"], []).append((kind, package.name, data))
+
+    # ---- grafo de imports ----
+    def import_graph(self):
+        """Pacote -> pacotes importados que existem no projeto (sem auto-import)."""
+        return {
+            name: [i for i in package.imports if i in self.packages and i != name]
+            for name, package in self.packages.items()
+        }
+
+    def dependencies(self, name):
+        """Todos os pacotes dos quais `name` depende, direta ou indiretamente."""
+        graph = self.import_graph()
+        seen = set()
+        stack = list(graph.get(name, []))
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(graph.get(current, []))
+        seen.discard(name)
+        return seen
+
+    def cycles(self):
+        """Grupos de pacotes com imports circulares (auto-imports não contam)."""
+        return find_cycles(self.import_graph())
+
+    def load_order(self):
+        """Pacotes com as dependências antes dos dependentes (ciclos ficam juntos)."""
+        graph = self.import_graph()
+        order = []
+        visited = set()
+        for root in sorted(graph):
+            if root in visited:
+                continue
+            visited.add(root)
+            work = [(root, iter(sorted(graph[root])))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in visited:
+                        visited.add(child)
+                        work.append((child, iter(sorted(graph[child]))))
+                        break
+                else:
+                    work.pop()
+                    order.append(node)
+        return order
+
+    # ---- resolução de nomes ----
+    def resolve(self, name, package):
+        """Declaração visível em `package` com esse nome: primeiro a do próprio
+        pacote, depois a dos pacotes importados. Retorna (tipo, pacote, dados) ou None."""
+        candidates = self.declarations.get(name)
+        if not candidates:
+            return None
+        visible = [package]
+        if package in self.packages:
+            visible.extend(self.packages[package].imports)
+        for scope in visible:
+            for candidate in candidates:
+                if candidate[1] == scope:
+                    return candidate
+        return None
+
+    def merged_model(self):
+        """Modelo combinado do projeto, na ordem de dependências, com índices cruzados."""
+        ordered = [self.packages[name] for name in self.load_order()]
+        return {
+            "summary": merge_summaries(p.summary for p in ordered),
+            "packages": {
+                p.name: {"file": p.file, "imports": p.imports, "dependents": sorted(set(p.dependents))}
+                for p in ordered
+            },
+            "declarations": {
+                name: [{"kind": kind, "package": package} for kind, package, _ in entries]
+                for name, entries in self.declarations.items()
+            },
+            "unresolved_imports": list(self.unresolved_imports),
+            "cycles": self.cycles(),
+        }
+
+    def hierarchy(self):
+        """Hierarquia de especialização do projeto inteiro (atravessa os imports)."""
+        ordered = [self.packages[name] for name in self.load_order()]
+        return SpecializationHierarchy.from_summary(merge_summaries(p.summary for p in ordered))
+
+    def validate_files(self):
+        """Validação semântica de cada arquivo, que enxerga as declarações do próprio
+        pacote e dos pacotes que importa. Retorna [(arquivo, erros, avisos)] na
+        ordem dos resultados."""
+        # Nomes declarados por pacote (um pacote repetido em vários arquivos soma todos)
+        types_by_package = {}
+        for r in self.results:
+            package = r["names"].package
+            if package:
+                types_by_package.setdefault(package, set()).update(r["names"].types)
+
+        validated = []
+        for r in self.results:
+            names = r["names"]
+            imported_types = set()
+            missing = set()
+            for imported, _ in names.imports:
+                if imported not in types_by_package:
+                    missing.add(imported)
+                elif imported != names.package:
+                    imported_types.update(types_by_package[imported])
+            errors, warnings = validate_names(names, imported_types, missing)
+            validated.append((r["file"], errors, warnings))
+        return validated
+
+    def validate(self, base_dir):
+        """(erros, avisos) semânticos do projeto, prefixados com o arquivo relativo a base_dir."""
+        errors = []
+        warnings = []
+        for file, file_errors, file_warnings in self.validate_files():
+            prefix = f"[{os.path.relpath(file, base_dir)}] "
+            errors.extend(prefix + e for e in file_errors)
+            warnings.extend(prefix + w for w in file_warnings)
+        return errors, warnings
+
+    def relative_file(self, package_name, base_dir):
+        return os.path.relpath(self.packages[package_name].file, base_dir)
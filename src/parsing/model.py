@@ -0,0 +1,309 @@
+# ====== Modelo tipado e indexado do resumo sintático ======
+# Cada construto é um registro com __slots__; o Model mantém índices por nome
+# (classes por nome, relações por dono/domínio/imagem, gensets por general)
+# preenchidos durante o parse. O dicionário `summary` usado pelos relatórios,
+# pela CLI em lote e pelo cache é uma visão de compatibilidade gerada a partir
+# dos registros.
+
+class _Record:
+    """Base dos registros: acesso por chave igual ao dos dicionários antigos."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Attribute(_Record):
+    __slots__ = ("name", "type", "cardinality", "flags")
+
+    def __init__(self, name, type, cardinality, flags):
+        self.name = name
+        self.type = type
+        self.cardinality = cardinality
+        self.flags = flags
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["type"], data["cardinality"], data["flags"])
+
+class ClassDecl(_Record):
+    __slots__ = ("name", "stereotype", "superclasses", "attributes")
+
+    def __init__(self, name, stereotype, superclasses, attributes=None):
+        self.name = name
+        self.stereotype = stereotype
+        self.superclasses = superclasses
+        self.attributes = attributes if attributes is not None else []
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "stereotype": self.stereotype,
+            "superclasses": self.superclasses,
+            "attributes": [a.to_dict() for a in self.attributes],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["stereotype"], data["superclasses"],
+                   [Attribute.from_dict(a) for a in data["attributes"]])
+
+class Datatype(_Record):
+    __slots__ = ("name", "superclasses", "attributes")
+
+    def __init__(self, name, superclasses, attributes):
+        self.name = name
+        self.superclasses = superclasses
+        self.attributes = attributes
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "superclasses": self.superclasses,
+            "attributes": [a.to_dict() for a in self.attributes],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["superclasses"], [Attribute.from_dict(a) for a in data["attributes"]])
+
+class Enum(_Record):
+    __slots__ = ("name", "elements")
+
+    def __init__(self, name, elements):
+        self.name = name
+        self.elements = elements
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["elements"])
+
+class Genset(_Record):
+    __slots__ = ("name", "general", "specifics", "categorizer", "constraints")
+
+    def __init__(self, name, general, specifics, categorizer, constraints):
+        self.name = name
+        self.general = general
+        self.specifics = specifics
+        self.categorizer = categorizer
+        self.constraints = constraints
+
+    def to_dict(self):
+        # Mesma ordem de chaves do resumo original
+        return {
+            "name": self.name,
+            "specifics": self.specifics,
+            "general": self.general,
+            "categorizer": self.categorizer,
+            "constraints": self.constraints,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["general"], data["specifics"], data["categorizer"], data["constraints"])
+
+class InternalRelation(_Record):
+    __slots__ = ("owner", "stereotype", "card_from", "connector", "name", "card_to", "target")
+
+    def __init__(self, owner, stereotype, card_from, connector, name, card_to, target):
+        self.owner = owner
+        self.stereotype = stereotype
+        self.card_from = card_from
+        self.connector = connector
+        self.name = name
+        self.card_to = card_to
+        self.target = target
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["owner"], data["stereotype"], data["card_from"], data["connector"],
+                   data["name"], data["card_to"], data["target"])
+
+class ExternalRelation(_Record):
+    __slots__ = ("stereotype", "domain", "card_from", "connector", "name", "card_to", "range")
+
+    def __init__(self, stereotype, domain, card_from, connector, name, card_to, range_):
+        self.stereotype = stereotype
+        self.domain = domain
+        self.card_from = card_from
+        self.connector = connector
+        self.name = name
+        self.card_to = card_to
+        self.range = range_
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["stereotype"], data["domain"], data["card_from"], data["connector"],
+                   data["name"], data["card_to"], data["range"])
+
+# Tipo da declaração ordenada -> lista do resumo que a contém
+_ORDERED_KINDS = {"DATATYPE": "datatypes", "ENUM": "enums", "GENSET": "gensets", "EXTERNAL_RELATION": "external_relations"}
+_RECORD_TYPES = {"datatypes": Datatype, "enums": Enum, "gensets": Genset, "external_relations": ExternalRelation}
+
+# ====== Visão de compatibilidade ======
+class SummaryView(dict):
+    """O dicionário `summary` de sempre, com uma referência ao Model de origem."""
+    __slots__ = ("model",)
+
+def model_of(summary):
+    """Model associado a um resumo (reconstruído se o resumo veio de JSON/cache)."""
+    model = getattr(summary, "model", None)
+    return model if model is not None else Model.from_summary(summary)
+
+# ====== Modelo ======
+class Model:
+    def __init__(self):
+        self.package = None
+        self.imports = []
+        self.classes = []
+        self.datatypes = []
+        self.enums = []
+        self.gensets = []
+        self.internal_relations = []
+        self.external_relations = []
+        self.ordered = []  # (tipo, registro) na ordem do arquivo
+
+        # Índices por nome (a primeira declaração de um nome é a canônica)
+        self.classes_by_name = {}
+        self.relations_by_owner = {}
+        self.relations_by_domain = {}
+        self.relations_by_range = {}
+        self.gensets_by_general = {}
+
+        self._summary = None
+
+    # ---- inserção ----
+    def set_package(self, name):
+        self.package = name
+        self._summary = None
+
+    def add_import(self, name):
+        self.imports.append(name)
+        self._summary = None
+
+    def add_class(self, class_decl):
+        self.classes.append(class_decl)
+        self.classes_by_name.setdefault(class_decl.name, class_decl)
+        self.ordered.append((class_decl.stereotype, class_decl))
+        self._summary = None
+
+    def add_attributes(self, class_decl, attributes):
+        class_decl.attributes.extend(attributes)
+        self._summary = None
+
+    def add_datatype(self, datatype):
+        self.datatypes.append(datatype)
+        self.ordered.append(("DATATYPE", datatype))
+        self._summary = None
+
+    def add_enum(self, enum):
+        self.enums.append(enum)
+        self.ordered.append(("ENUM", enum))
+        self._summary = None
+
+    def add_genset(self, genset):
+        self.gensets.append(genset)
+        self.gensets_by_general.setdefault(genset.general, []).append(genset)
+        self.ordered.append(("GENSET", genset))
+        self._summary = None
+
+    def add_internal_relation(self, relation):
+        # Numa relação interna a classe dona é o domínio e o alvo é a imagem
+        self.internal_relations.append(relation)
+        self.relations_by_owner.setdefault(relation.owner, []).append(relation)
+        self.relations_by_domain.setdefault(relation.owner, []).append(relation)
+        self.relations_by_range.setdefault(relation.target, []).append(relation)
+        self._summary = None
+
+    def add_external_relation(self, relation):
+        self.external_relations.append(relation)
+        self.relations_by_domain.setdefault(relation.domain, []).append(relation)
+        self.relations_by_range.setdefault(relation.range, []).append(relation)
+        self.ordered.append(("EXTERNAL_RELATION", relation))
+        self._summary = None
+
+    def merge(self, other):
+        """Acrescenta as declarações de outro modelo (ex.: de um trecho do arquivo)."""
+        for kind, record in other.ordered:
+            key = _ORDERED_KINDS.get(kind)
+            if key is None:
+                self.add_class(record)
+            else:
+                getattr(self, "add_" + key[:-1])(record)
+        for relation in other.internal_relations:
+            self.add_internal_relation(relation)
+
+    # ---- consultas ----
+    def class_named(self, name):
+        return self.classes_by_name.get(name)
+
+    def relations_of(self, owner):
+        """Relações internas declaradas no corpo da classe `owner`."""
+        return self.relations_by_owner.get(owner, [])
+
+    def relations_from(self, domain):
+        return self.relations_by_domain.get(domain, [])
+
+    def relations_to(self, range_):
+        return self.relations_by_range.get(range_, [])
+
+    def gensets_of(self, general):
+        return self.gensets_by_general.get(general, [])
+
+    # ---- visão de compatibilidade ----
+    @property
+    def summary(self):
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return self._summary
+
+    def _build_summary(self):
+        as_dict = {}  # id(registro) -> dicionário (o mesmo objeto nas duas listas)
+        for _, record in self.ordered:
+            as_dict[id(record)] = record.to_dict()
+
+        summary = SummaryView(
+            package=self.package,
+            imports=list(self.imports),
+            classes=[as_dict[id(c)] for c in self.classes],
+            datatypes=[as_dict[id(d)] for d in self.datatypes],
+            enums=[as_dict[id(e)] for e in self.enums],
+            gensets=[as_dict[id(g)] for g in self.gensets],
+            internal_relations=[r.to_dict() for r in self.internal_relations],
+            external_relations=[as_dict[id(r)] for r in self.external_relations],
+            ordered_declarations=[{"type": kind, "data": as_dict[id(record)]} for kind, record in self.ordered],
+        )
+        summary.model = self
+        return summary
+
+    @classmethod
+    def from_summary(cls, summary):
+        """Reconstrói o modelo a partir de um resumo em dicionário (ex.: vindo do cache)."""
+        model = cls()
+        model.set_package(summary.get("package"))
+        for name in summary.get("imports", []):
+            model.add_import(name)
+        for entry in summary.get("ordered_declarations", []):
+            kind, data = entry["type"], entry["data"]
+            key = _ORDERED_KINDS.get(kind)
+            if key is None:
+                model.add_class(ClassDecl.from_dict(data))
+            else:
+                getattr(model, "add_" + key[:-1])(_RECORD_TYPES[key].from_dict(data))
+        for data in summary.get("internal_relations", []):
+            model.add_internal_relation(InternalRelation.from_dict(data))
+        return model
@@ -1,4 +1,11 @@
-# ====== Funções auxiliares para formatação e impressão ======
+import os
+
+from ..profiling import phases
+from .model import model_of
+
+# ====== Funções auxiliares para formatação ======
+# Os relatórios são geradores de linhas (sem "\n"); as funções show_* no fim
+# do arquivo escrevem essas linhas em qualquer stream de texto (padrão stdout).
 
 # Função que formata a string de uma relação interna ou externa
 def _format_relation(r, is_external=False):
@@ -49,41 +56,31 @@ def _format_attribute(attr):
 def _get_branch_prefix(index, total):
     return "└── " if index == total - 1 else "├── "
 
-# Agrupa as relações internas para serem exibidas aninhadas em suas classes
-def _group_internal_relations_by_class(internal_relations):
-    grouped = {}
-    for r in internal_relations:
-        owner = r["owner"]
-        if owner not in grouped:
-            grouped[owner] = []
-        grouped[owner].append(r)
-    return grouped
-
-# ====== Funções de Impressão de Construtos (Item Único) ======
-def _print_imports(imports, parent_indent):
+# ====== Linhas de Construtos (Item Único) ======
+def _import_lines(imports, parent_indent):
     if imports:
         for i, imp_name in enumerate(imports):
             prefix = parent_indent + _get_branch_prefix(i, len(imports))
-            print(f"{prefix}{imp_name}")
+            yield f"{prefix}{imp_name}"
     else:
-        print(f"{parent_indent}└── (Nenhum pacote importado)")
+        yield f"{parent_indent}└── (Nenhum pacote importado)"
 
 # DATATYPE ou ENUM
-def _print_simple_declaration(comp_data, comp_type, decl_indent, item_index, total_items):
+def _simple_declaration_lines(comp_data, comp_type, decl_indent, item_index, total_items):
     item_prefix = decl_indent + _get_branch_prefix(item_index, total_items)
     
     if comp_type == 'ENUM':
         enum_members = comp_data.get('elements', [])
         member_names = f" [Elementos: {', '.join(enum_members)}]" if enum_members else ""
         # Format: ENUM: Nome [Elementos: ...]
-        print(f"{item_prefix}🔢 ENUM: {comp_data['name']}{member_names}")
+        yield f"{item_prefix}🔢 ENUM: {comp_data['name']}{member_names}"
     else: 
         # Specializes
         superclasses = comp_data.get('superclasses', [])
         specializes_str = f" [specializes: {', '.join(superclasses)}]" if superclasses else ""
 
         # Format: DATATYPE: Nome [specializes: Superclasse]
-        print(f"{item_prefix}📊 DATATYPE: {comp_data['name']}{specializes_str}")        
+        yield f"{item_prefix}📊 DATATYPE: {comp_data['name']}{specializes_str}"
 
         attributes = comp_data.get("attributes", [])
 
@@ -93,19 +90,19 @@ def _print_simple_declaration(comp_data, comp_type, decl_indent, item_index, tot
             fields_indent = decl_indent + ("    " if is_last_item else "│   ")
             
             # Cabeçalho dos campos
-            print(f"{fields_indent}└── 📌 ATRIBUTOS:")
+            yield f"{fields_indent}└── 📌 ATRIBUTOS:"
             
             attr_indent = fields_indent + "    "
             for i, field in enumerate(attributes):
                 attr_prefix = _get_branch_prefix(i, len(attributes))
-                print(f"{attr_indent}{attr_prefix}{_format_attribute(field)}")
+                yield f"{attr_indent}{attr_prefix}{_format_attribute(field)}"
 
-def _print_external_relation_declaration(r, decl_indent, item_index, total_items):
+def _external_relation_lines(r, decl_indent, item_index, total_items):
     item_prefix = decl_indent + _get_branch_prefix(item_index, total_items)
     relation_str = _format_relation(r, is_external=True)
-    print(f"{item_prefix}🌐 RELAÇÃO EXTERNA: {relation_str}")
+    yield f"{item_prefix}🌐 RELAÇÃO EXTERNA: {relation_str}"
 
-def _print_genset_declaration(g, decl_indent, item_index, total_items):
+def _genset_lines(g, decl_indent, item_index, total_items):
     is_last_item = item_index == total_items - 1
     item_prefix = decl_indent + _get_branch_prefix(item_index, total_items)
     genset_indent = decl_indent + ("    " if is_last_item else "│   ")
@@ -115,7 +112,7 @@ def _print_genset_declaration(g, decl_indent, item_index, total_items):
     specifics = g.get('specifics', [])
     categorizer = g.get('categorizer')
 
-    print(f"{item_prefix}➕ GENSET: {g['name']}")
+    yield f"{item_prefix}➕ GENSET: {g['name']}"
     
     # Componentes para iteração (Restrições, General, Categorizer, Specifics)
     components = []
@@ -141,19 +138,19 @@ def _print_genset_declaration(g, decl_indent, item_index, total_items):
         
         # Tipos simples (Restrições, General, Categorizer)
         if comp['type'] in ['Restrições', 'General', 'Categorizer']:
-            print(f"{comp_prefix}{comp['type']}: {comp['content'][0]}")
+            yield f"{comp_prefix}{comp['type']}: {comp['content'][0]}"
 
         # Specifics (hierarquia aninhada)
         elif comp['type'] == 'Specifics':
-            print(f"{comp_prefix}Specifics:")
+            yield f"{comp_prefix}Specifics:"
             
             specifics_indent = genset_indent + ("    " if is_last_comp else "│   ")
             
             for spec_index, specific in enumerate(comp['content']):
                 spec_prefix = specifics_indent + _get_branch_prefix(spec_index, len(comp['content']))
-                print(f"{spec_prefix}{specific}")
+                yield f"{spec_prefix}{specific}"
 
-def _print_class_declaration(c, rels_by_class, decl_indent, item_index, total_items):
+def _class_lines(c, model, decl_indent, item_index, total_items):
     is_last_item = item_index == total_items - 1
     item_prefix = decl_indent + _get_branch_prefix(item_index, total_items)
     
@@ -164,7 +161,7 @@ def _print_class_declaration(c, rels_by_class, decl_indent, item_index, total_it
     specializes_str = f" | specializes: {', '.join(superclasses_list)}" if superclasses_list else ""
     
     # Título principal
-    print(f"{item_prefix}🧱 CLASSE: {c['name']} [{stereotype_str}{specializes_str}]")
+    yield f"{item_prefix}🧱 CLASSE: {c['name']} [{stereotype_str}{specializes_str}]"
 
     # Componentes internos (atributos e relações internas)
     members = []
@@ -172,7 +169,8 @@ def _print_class_declaration(c, rels_by_class, decl_indent, item_index, total_it
     if c.get('attributes'):
         members.append({'type': 'ATRIBUTOS', 'content': c['attributes']})
     
-    internal_relations = rels_by_class.get(c['name'], [])
+    # Relações internas aninhadas na classe, pelo índice por dono do modelo
+    internal_relations = model.relations_of(c['name'])
 
     if internal_relations:
         members.append({'type': 'RELAÇÕES INTERNAS', 'content': internal_relations})
@@ -196,7 +194,7 @@ def _print_class_declaration(c, rels_by_class, decl_indent, item_index, total_it
         elif member_type == 'RELAÇÕES INTERNAS':
             header = f"🔗 {header}"
         
-        print(f"{member_prefix}{header}")
+        yield f"{member_prefix}{header}"
 
         content_list = member['content']
         content_indent = members_indent + ("    " if is_last_member else "│   ")
@@ -207,13 +205,13 @@ def _print_class_declaration(c, rels_by_class, decl_indent, item_index, total_it
             # Formatação do conteúdo
             if member_type == 'ATRIBUTOS':
                 content_str = _format_attribute(content_data)
-                print(f"{content_prefix}{content_str}")
+                yield f"{content_prefix}{content_str}"
             elif member_type == 'RELAÇÕES INTERNAS':
                 content_str = _format_relation(content_data, is_external=False)
-                print(f"{content_prefix}{content_str}")
+                yield f"{content_prefix}{content_str}"
 
 # ====== Lógica de Iteração Ordenada) ======
-def _print_package_contents(declarations, parent_indent, rels_by_class):
+def _package_contents_lines(declarations, parent_indent, model):
     
     if not declarations:
         return
@@ -225,22 +223,22 @@ def _print_package_contents(declarations, parent_indent, rels_by_class):
         
         # Construtos de Classe (incluindo todos os estereótipos)
         if comp_type in ['kind', 'phase', 'role', 'subkind', 'relator', 'category', 'mixin', 'roleMixin', 'phaseMixin', 'historicalRole', 'historicalRoleMixin', 'collective', 'quantity', 'quality', 'mode', 'intrisicMode', 'extrinsicMode', 'event', 'situation', 'process', 'class']: 
-             _print_class_declaration(comp_data, rels_by_class, parent_indent, comp_index, total_comps)
+             yield from _class_lines(comp_data, model, parent_indent, comp_index, total_comps)
              
         # Tipos Simples (Ex: DATATYPE, ENUM)
         elif comp_type in ['DATATYPE', 'ENUM']:
-             _print_simple_declaration(comp_data, comp_type, parent_indent, comp_index, total_comps)
+             yield from _simple_declaration_lines(comp_data, comp_type, parent_indent, comp_index, total_comps)
              
         # GenSet
         elif comp_type == 'GENSET':
-             _print_genset_declaration(comp_data, parent_indent, comp_index, total_comps)
+             yield from _genset_lines(comp_data, parent_indent, comp_index, total_comps)
              
         # Relação Externa
         elif comp_type == 'EXTERNAL_RELATION':
-             _print_external_relation_declaration(comp_data, parent_indent, comp_index, total_comps)
+             yield from _external_relation_lines(comp_data, parent_indent, comp_index, total_comps)
 
 # ====== Resumo Quantitativo ======
-def _print_quantitative_summary(imports, package, classes, datatypes, enums, gensets, internal, external):
+def _quantitative_summary_lines(imports, package, classes, datatypes, enums, gensets, internal, external):
     rows = [
         ("Imports", len(imports)),
         ("Packages", 1 if package else 0),
@@ -255,22 +253,24 @@ def _print_quantitative_summary(imports, package, classes, datatypes, enums, gen
     label_width = max(max(len(r[0]) for r in rows), len('Item'))
     count_width = max(max(len(str(r[1])) for r in rows), len('Qtd'))
 
-    print("\n\n📊 RESUMO QUANTITATIVO")
+    yield ""
+    yield ""
+    yield "📊 RESUMO QUANTITATIVO"
     top = "┌" + "─" * (label_width + 2) + "┬" + "─" * (count_width + 2) + "┐"
     header = f"│ {'Construto'.ljust(label_width)} │ {'Qtd'.center(count_width)} │"
     sep = "├" + "─" * (label_width + 2) + "┼" + "─" * (count_width + 2) + "┤"
 
-    print(top)
-    print(header)
-    print(sep)
+    yield top
+    yield header
+    yield sep
 
     for label, count in rows:
-        print(f"│ {label.ljust(label_width)} │ {str(count).rjust(count_width)} │")
+        yield f"│ {label.ljust(label_width)} │ {str(count).rjust(count_width)} │"
     bottom = "└" + "─" * (label_width + 2) + "┴" + "─" * (count_width + 2) + "┘"
-    print(bottom)
+    yield bottom
 
-# ====== Exibir Resumo Sintático ====== 
-def show_syntax_summary(summary):
+# ====== Linhas do Resumo Sintático ======
+def syntax_summary_lines(summary):
     classes = summary.get('classes', [])
     datatypes = summary.get('datatypes', [])
     enums = summary.get('enums', [])
@@ -284,8 +284,10 @@ def show_syntax_summary(summary):
     imports = summary.get('imports', [])
     package_name = summary.get('package')
 
-    print("\n=========================== RESUMO SINTÁTICO ===========================\n")
-    print("🌳 ONTOLOGIA")
+    yield ""
+    yield "=========================== RESUMO SINTÁTICO ==========================="
+    yield ""
+    yield "🌳 ONTOLOGIA"
     
     #  Componentes de Nível Superior (ONTOLOGIA)
     major_components = [{'type': 'IMPORTS', 'content': imports}]
@@ -306,26 +308,118 @@ def show_syntax_summary(summary):
         comp_content = major_comp.get('content')
         
         if comp_type == 'IMPORTS':
-            print(f"{major_prefix}📥 IMPORTS:")
-            _print_imports(comp_content, major_indent)
+            yield f"{major_prefix}📥 IMPORTS:"
+            yield from _import_lines(comp_content, major_indent)
 
         elif comp_type == 'PACOTE':
-            print(f"{major_prefix}📦 PACOTE: {comp_content}")
+            yield f"{major_prefix}📦 PACOTE: {comp_content}"
             
-            # Chama a função que imprime o conteúdo na ordem
-            rels_by_class = _group_internal_relations_by_class(internal)
-            _print_package_contents(major_comp['declarations'], major_indent, rels_by_class)
+            # Conteúdo do pacote na ordem de declaração
+            yield from _package_contents_lines(major_comp['declarations'], major_indent, model_of(summary))
     
-    _print_quantitative_summary(imports, package_name, classes, datatypes, enums, gensets, internal, external)
-    print("\n=================================== ## ===================================")
-
-# ====== Exibir Erros Sintáticos ====== 
-def show_syntax_errors(errors):
-    print("\n====================== ERROS SINTÁTICOS =====================\n")
+    yield from _quantitative_summary_lines(imports, package_name, classes, datatypes, enums, gensets, internal, external)
+    yield ""
+    yield "=================================== ## ==================================="
+
+# ====== Linhas dos Erros Sintáticos ======
+def syntax_errors_lines(errors):
+    yield ""
+    yield "====================== ERROS SINTÁTICOS ====================="
+    yield ""
     if not errors:
-        print("✅ Nenhum erro sintático encontrado.")
-        print("\n=========================== ## ==============================")
+        yield "✅ Nenhum erro sintático encontrado."
+        yield ""
+        yield "=========================== ## =============================="
+        return
+    for e in errors:
+        yield f"❌ {e}"
+    yield ""
+    yield "=========================== ## =============================="
+
+# ====== Linhas dos Erros Semânticos ======
+def semantic_errors_lines(errors, warnings):
+    yield ""
+    yield "====================== ERROS SEMÂNTICOS ====================="
+    yield ""
+    if not errors and not warnings:
+        yield "✅ Nenhuma referência indefinida ou nome duplicado."
+        yield ""
+        yield "=========================== ## =============================="
         return
     for e in errors:
-        print("❌", e)
-    print("\n=========================== ## ==============================")
\ No newline at end of file
+        yield f"❌ {e}"
+    for w in warnings:
+        yield f"⚠️  {w}"
+    yield ""
+    yield "=========================== ## =============================="
+
+# ====== Linhas do Relatório do Projeto (por arquivo) ======
+def project_report_lines(results, project_dir):
+    yield ""
+    yield "=========================== ANÁLISE DO PROJETO ==========================="
+    yield ""
+    if not results:
+        yield "❌ Nenhum arquivo .tonto encontrado no projeto."
+        return
+
+    header = f"{'Arquivo':<40} {'Tokens':>8} {'Símbolos':>9} {'Erros léx.':>11} {'Erros sint.':>12}"
+    yield "-" * len(header)
+    yield header
+    yield "-" * len(header)
+
+    totals = [0, 0, 0, 0]
+    for r in results:
+        row = [r['token_total'], r['symbol_total'], len(r['lexical_errors']), len(r['syntax_errors'])]
+        totals = [t + v for t, v in zip(totals, row)]
+        name = os.path.relpath(r['file'], project_dir)
+        status = "✅" if not row[2] and not row[3] else "❌"
+        yield f"{status} {name:<37} {row[0]:>8} {row[1]:>9} {row[2]:>11} {row[3]:>12}"
+
+    yield "-" * len(header)
+    yield f"{'TOTAL (' + str(len(results)) + ' arquivos)':<40} {totals[0]:>8} {totals[1]:>9} {totals[2]:>11} {totals[3]:>12}"
+
+def import_report_lines(linker, project_dir):
+    yield ""
+    yield "=========================== IMPORTS DO PROJETO ==========================="
+    yield ""
+    if not linker.packages:
+        yield "Nenhum pacote declarado no projeto."
+        return
+
+    for name in linker.load_order():
+        package = linker.packages[name]
+        imports = ", ".join(package.imports) if package.imports else "-"
+        yield f"📦 {name} ({linker.relative_file(name, project_dir)})"
+        yield f"   importa: {imports}"
+
+    for name, files in linker.duplicate_packages.items():
+        paths = ", ".join(os.path.relpath(f, project_dir) for f in files)
+        yield ""
+        yield f"⚠️  Pacote '{name}' declarado em mais de um arquivo: {paths}"
+    for package, imported in linker.unresolved_imports:
+        yield ""
+        yield f"❌ Import não resolvido em '{package}': pacote '{imported}' não encontrado no projeto"
+    for cycle in linker.cycles():
+        yield ""
+        yield f"🔁 Imports circulares entre: {' <-> '.join(cycle)}"
+
+# ====== Exibir os relatórios (out: qualquer stream de texto, padrão stdout) ======
+def _write_lines(name, lines, out):
+    with phases.phase(f"report.{name}"):
+        for line in lines:
+            print(line, file=out)
+
+def show_syntax_summary(summary, out=None):
+    _write_lines("summary", syntax_summary_lines(summary), out)
+
+def show_syntax_errors(errors, out=None):
+    _write_lines("syntax_errors", syntax_errors_lines(errors), out)
+
+def show_semantic_errors(errors, warnings, out=None):
+    _write_lines("semantic_errors", semantic_errors_lines(errors, warnings), out)
+
+def show_project_report(results, project_dir, out=None):
+    _write_lines("project", project_report_lines(results, project_dir), out)
+
+def show_import_report(linker, project_dir, out=None):
+    _write_lines("imports", import_report_lines(linker, project_dir), out)
@@ -0,0 +1,107 @@
+import marshal
+import os
+import sys
+import zlib
+
+import ply.yacc as yacc
+
+# ====== Tabelas LALR pré-compiladas e versionadas ======
+# yacc.yacc() reflete sobre o módulo da gramática a cada execução: coleta as
+# funções p_*, lê as docstrings, monta e valida a gramática e, mesmo com um
+# parsetab.py válido, só então carrega as tabelas. Aqui as tabelas geradas são
+# gravadas (em marshal, leitura rápida) no diretório de cache, num arquivo cujo
+# nome é a versão da gramática: CRC dos fontes da gramática e da lista de
+# tokens, mais as versões do PLY e do Python. Se o arquivo da versão atual
+# existe, o parser é montado direto das tabelas, ligando cada produção à sua
+# função p_* pelo nome (sem reflexão); senão o yacc gera as tabelas uma vez.
+# Nada é escrito na árvore de fontes (o parsetab.py do PLY não é mais usado).
+
+_FORMAT = 1
+
+def tables_version(sources, tokens, start):
+    """Versão das tabelas: muda quando a gramática, os tokens ou o PLY/Python mudam."""
+    crc = 0
+    for path in sources:
+        with open(path, 'rb') as f:
+            crc = zlib.crc32(f.read(), crc)
+    extra = f"{' '.join(tokens)}|{start}|{yacc.__version__}|{yacc.__tabversion__}|{sys.implementation.cache_tag}|{_FORMAT}"
+    return f"{zlib.crc32(extra.encode('utf-8'), crc):08x}"
+
+def tables_path(version, cache_dir=None):
+    if cache_dir is None:
+        from .cache import default_cache_dir  # import tardio: cache depende da gramática
+        cache_dir = default_cache_dir()
+    return os.path.join(cache_dir, 'tables', f"parser-{version}.marshal")
+
+def _read_tables(path, version):
+    try:
+        with open(path, 'rb') as f:
+            data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+def _write_tables(path, data):
+    """Grava de forma atômica; sem permissão de escrita, as tabelas ficam só em memória."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def _generate_tables(module, start, version):
+    # debug=False: sem parser.out; write_tables=False: sem parsetab.py nos fontes;
+    # NullLogger: os avisos do yacc (ex.: tokens não usados) não poluem o stderr
+    # do modo em lote, do daemon e do servidor LSP
+    parser = yacc.yacc(module=module, start=start, debug=False, write_tables=False, errorlog=yacc.NullLogger())
+    productions = []
+    for p in parser.productions:
+        if p.func:
+            productions.append((p.str, p.name, p.len, p.func, os.path.basename(p.file), p.line))
+        else:
+            productions.append((p.str, p.name, p.len, None, None, None))
+    return {"version": version, "action": parser.action, "goto": parser.goto, "productions": productions}
+
+def load_parser(module, start, sources, tokens, cache_dir=None):
+    """LRParser da gramática definida pelos métodos p_* de `module`.
+
+    `sources` são os arquivos que definem a gramática (entram na versão).
+    """
+    version = tables_version(sources, tokens, start)
+    path = tables_path(version, cache_dir)
+    data = _read_tables(path, version)
+    if data is None:
+        data = _generate_tables(module, start, version)
+        _write_tables(path, data)
+
+    tables = yacc.LRTable()
+    tables.lr_method = 'LALR'
+    tables.lr_action = data["action"]
+    tables.lr_goto = data["goto"]
+    tables.lr_productions = [yacc.MiniProduction(*p) for p in data["productions"]]
+    tables.bind_callables({p.func: getattr(module, p.func) for p in tables.lr_productions if p.func})
+    return yacc.LRParser(tables, module.p_error)
+
+def main(argv=None):
+    """Gera as tabelas da versão atual (ex.: ao construir uma imagem/ambiente de CI)."""
+    import argparse
+    from .grammar import TontoParser, grammar_tables_path
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.parsing.parse_tables",
+        description="Pré-compila as tabelas LALR do parser no diretório de cache.",
+    )
+    parser.add_argument("--cache-dir", help="diretório de cache (padrão: $TONTO_CACHE_DIR ou ~/.cache/tonto_analyzer)")
+    args = parser.parse_args(argv)
+    TontoParser(cache_dir=args.cache_dir)
+    path = grammar_tables_path(args.cache_dir)
+    print(path if os.path.exists(path) else f"Não foi possível gravar as tabelas em {path}")
+    return 0 if os.path.exists(path) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
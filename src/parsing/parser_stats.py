@@ -0,0 +1,208 @@
+import copy
+import threading
+
+# ====== Estatísticas do parser (reduções por produção, shifts, erros) ======
+# Com um ParserStats ativo (ParserStats().start()), cada parse usa uma cópia das
+# produções do PLY cujas funções p_* são envolvidas por um contador, e um lexer
+# que conta os tokens lidos. Sem coletor ativo, TontoParser.parse só consulta
+# uma global: as tabelas e funções originais são usadas sem nenhuma mudança.
+# Os contadores de cada parse ficam num ParseCounter próprio e são somados ao
+# ParserStats no fim, então várias threads podem parsear ao mesmo tempo; entre
+# processos (análise em lote), to_dict()/merge() juntam os resultados.
+
+_active = None
+
+def active():
+    """O coletor ativo, ou None."""
+    return _active
+
+class ParseCounter:
+    """Contadores de um único parse."""
+    __slots__ = ("reductions", "tokens", "syntax_errors", "eof_errors", "recoveries", "max_stack_depth")
+
+    def __init__(self, production_count):
+        self.reductions = [0] * production_count
+        self.tokens = 0
+        self.syntax_errors = 0
+        self.eof_errors = 0
+        self.recoveries = 0
+        self.max_stack_depth = 0
+
+class _CountingLexer:
+    # Fornece os tokens ao parser contando quantos foram lidos
+    def __init__(self, lexer, counter):
+        self._lexer = lexer
+        self._counter = counter
+
+    def input(self, data):
+        self._lexer.input(data)
+
+    def token(self):
+        tok = self._lexer.token()
+        if tok is not None:
+            self._counter.tokens += 1
+        return tok
+
+def _counted(func, index):
+    def counted(p):
+        counter = p.parser.counter
+        counter.reductions[index] += 1
+        # Na chamada, o PLY já removeu o lado direito da pilha de símbolos
+        depth = len(p.stack) + len(p.slice) - 1
+        if depth > counter.max_stack_depth:
+            counter.max_stack_depth = depth
+        return func(p)
+    return counted
+
+_counting_productions = {}
+_counting_lock = threading.Lock()
+
+def _counting_productions_for(productions):
+    """Cópia das produções com as funções envolvidas por contadores (uma por tabela)."""
+    key = id(productions)
+    cached = _counting_productions.get(key)
+    if cached is None:
+        with _counting_lock:
+            cached = _counting_productions.get(key)
+            if cached is None:
+                cached = []
+                for index, production in enumerate(productions):
+                    production = copy.copy(production)
+                    if production.callable is not None:
+                        production.callable = _counted(production.callable, index)
+                    cached.append(production)
+                _counting_productions[key] = cached
+    return cached
+
+class ParserStats:
+    """Agrega as estatísticas de todos os parses feitos enquanto está ativo."""
+
+    def __init__(self):
+        self.productions = []  # texto de cada produção ("lhs -> rhs"), na ordem das tabelas
+        self.functions = {}    # produção -> nome da função p_* que a reduz
+        self.reductions = {}   # produção -> quantidade de reduções
+        self.parses = 0
+        self.tokens = 0
+        self.syntax_errors = 0
+        self.eof_errors = 0
+        self.recoveries = 0
+        self.max_stack_depth = 0
+        self._lock = threading.Lock()
+
+    # ---- sessão ----
+    def start(self):
+        global _active
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- coleta (chamado por TontoParser.parse) ----
+    def instrument(self, parser, lexer):
+        """Prepara a cópia do parser PLY para contar; devolve o lexer a usar."""
+        productions = parser.productions
+        if not self.productions:
+            with self._lock:
+                if not self.productions:
+                    self._register_productions(productions)
+        parser.productions = _counting_productions_for(productions)
+        parser.counter = ParseCounter(len(productions))
+        return _CountingLexer(lexer, parser.counter)
+
+    def _register_productions(self, productions):
+        for production in productions:
+            self.productions.append(production.str)
+            self.reductions.setdefault(production.str, 0)
+            if production.callable is not None:
+                self.functions[production.str] = production.callable.__name__
+
+    def add(self, counter):
+        with self._lock:
+            self.parses += 1
+            for production, count in zip(self.productions, counter.reductions):
+                if count:
+                    self.reductions[production] += count
+            self.tokens += counter.tokens
+            self.syntax_errors += counter.syntax_errors
+            self.eof_errors += counter.eof_errors
+            self.recoveries += counter.recoveries
+            self.max_stack_depth = max(self.max_stack_depth, counter.max_stack_depth)
+
+    # ---- agregação entre processos ----
+    def to_dict(self):
+        return {
+            "parses": self.parses,
+            "tokens": self.tokens,
+            "shifts": self.shifts,
+            "reductions": sum(self.reductions.values()),
+            "syntax_errors": self.syntax_errors,
+            "eof_errors": self.eof_errors,
+            "recoveries": self.recoveries,
+            "max_stack_depth": self.max_stack_depth,
+            "productions": [
+                {"production": production, "function": self.functions.get(production),
+                 "reductions": self.reductions.get(production, 0)}
+                for production in self.productions
+            ],
+        }
+
+    def merge(self, data):
+        """Soma os contadores de to_dict() (ex.: de um processo do pool)."""
+        with self._lock:
+            self.parses += data["parses"]
+            self.tokens += data["tokens"]
+            self.syntax_errors += data["syntax_errors"]
+            self.eof_errors += data["eof_errors"]
+            self.recoveries += data["recoveries"]
+            self.max_stack_depth = max(self.max_stack_depth, data["max_stack_depth"])
+            for entry in data["productions"]:
+                production = entry["production"]
+                if production not in self.reductions:
+                    self.productions.append(production)
+                    self.reductions[production] = 0
+                if entry["function"]:
+                    self.functions[production] = entry["function"]
+                self.reductions[production] += entry["reductions"]
+
+    # ---- resultados ----
+    @property
+    def shifts(self):
+        # Todo token lido é empilhado, exceto o token com erro, que _handle_error descarta (errok)
+        return self.tokens - (self.syntax_errors - self.eof_errors)
+
+    def report_lines(self):
+        total = sum(self.reductions.values())
+        yield ""
+        yield "==================== ESTATÍSTICAS DO PARSER ===================="
+        yield f"Parses: {self.parses}   Tokens lidos: {self.tokens}   Shifts: {self.shifts}   Reduções: {total}"
+        yield (f"Erros sintáticos: {self.syntax_errors} (fim de arquivo: {self.eof_errors})   "
+               f"Recuperações (errok): {self.recoveries}")
+        yield f"Profundidade máxima da pilha: {self.max_stack_depth}"
+
+        header = f"{'Produção':<64} {'Função':<28} {'Reduções':>9} {'%':>6}"
+        yield "-" * len(header)
+        yield header
+        yield "-" * len(header)
+        ranked = sorted((p for p in self.productions if p in self.functions),
+                        key=lambda p: self.reductions[p], reverse=True)
+        for production in ranked:
+            count = self.reductions[production]
+            share = count * 100 / total if total else 0.0
+            yield f"{production:<64} {self.functions[production]:<28} {count:>9} {share:>5.1f}%"
+        yield "-" * len(header)
+
+        unused = [p for p in ranked if not self.reductions[p]]
+        if unused and self.parses:
+            yield f"Produções nunca reduzidas ({len(unused)}):"
+            for production in unused:
+                yield f"  {production}"
@@ -0,0 +1,78 @@
+from ..lexical.lexer import analyze_text
+from ..lexical.symbol_table import SymbolTable
+from ..lexical.token_record import TokenRecord
+from ..profiling import phases
+from .grammar import parse_tokens
+from .model import Model, model_of
+
+# ====== Resultado combinado das análises léxica e sintática ======
+class AnalysisResult:
+    __slots__ = ("processed_tokens", "_symbol_table", "error_tokens", "ast", "_summary", "syntax_errors")
+
+    def __init__(self, processed_tokens, symbol_table, error_tokens, ast, summary, syntax_errors):
+        self.processed_tokens = processed_tokens
+        self._symbol_table = symbol_table
+        self.error_tokens = error_tokens
+        self.ast = ast
+        self._summary = summary
+        self.syntax_errors = syntax_errors
+
+    @property
+    def summary(self):
+        """Resumo sintático; se foi passado um Model, o resumo é gerado no primeiro acesso."""
+        summary = self._summary
+        if isinstance(summary, Model):
+            summary = self._summary = summary.summary
+        return summary
+
+    @property
+    def symbol_table(self):
+        """Tabela de símbolos; com symbol_table=None (ex.: resultado montado pela
+        análise incremental), é construída a partir dos tokens no primeiro acesso."""
+        if self._symbol_table is None:
+            symbol_table = SymbolTable()
+            for tok in self.processed_tokens:
+                symbol_table.add(tok.type, tok.value, tok.lineno, tok.lexpos)
+            self._symbol_table = symbol_table
+        return self._symbol_table
+
+    @property
+    def lex_data(self):
+        """Tupla (processed_tokens, symbol_table, error_tokens) usada pelos relatórios léxicos."""
+        return self.processed_tokens, self.symbol_table, self.error_tokens
+
+    def token_count(self):
+        counts = {}
+        for token in self.processed_tokens:
+            counts[token.type] = counts.get(token.type, 0) + 1
+        return counts
+
+    def to_dict(self, include_tokens=True):
+        """Representação serializável (JSON) do resultado, sem objetos do PLY."""
+        data = {}
+        if include_tokens:
+            data["tokens"] = [
+                {"Token": t.type, "Valor": t.value, "Linha": t.lineno, "Posição": t.lexpos}
+                for t in self.processed_tokens
+            ]
+            data["symbol_table"] = [dict(entry) for entry in self.symbol_table]
+        data["token_count"] = self.token_count()
+        data["summary"] = self.summary
+        data["lexical_errors"] = self.error_tokens
+        data["syntax_errors"] = self.syntax_errors
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstrói um resultado a partir de to_dict() (ex.: lido do cache); a AST não é guardada."""
+        tokens = [TokenRecord(t["Token"], t["Valor"], t["Linha"], t["Posição"]) for t in data["tokens"]]
+        return cls(tokens, data["symbol_table"], data["lexical_errors"], None,
+                   model_of(data["summary"]).summary, data["syntax_errors"])
+
+# ====== Análise em passada única ======
+def analyze_source(data):
+    """Tokeniza o texto uma única vez e alimenta o parser com o fluxo de tokens registrado."""
+    with phases.phase("analyze_source"):
+        processed_tokens, symbol_table, error_tokens = analyze_text(data)
+        ast, summary, syntax_errors = parse_tokens(processed_tokens)
+    return AnalysisResult(processed_tokens, symbol_table, error_tokens, ast, summary, syntax_errors)
@@ -0,0 +1,89 @@
+import os
+
+from ..profiling import phases
+from .pipeline import analyze_source
+from .semantic import NameIndex
+
+# ====== Descoberta dos arquivos do projeto ======
+def find_project_files(project_dir):
+    """Lista os arquivos .tonto do projeto (dentro de 'src', se existir)."""
+    src_dir = os.path.join(project_dir, 'src')
+    base_dir = src_dir if os.path.isdir(src_dir) else project_dir
+    found = []
+    for root, _, files in os.walk(base_dir):
+        for fname in files:
+            if fname.lower().endswith('.tonto'):
+                found.append(os.path.join(root, fname))
+    return sorted(found)
+
+# ====== Análise de um arquivo (executada nos processos do pool) ======
+def analyze_project_file(file_path):
+    """Analisa um arquivo e devolve apenas dados serializáveis (sem objetos do PLY)."""
+    with phases.phase("read"), open(file_path, "r", encoding="utf-8") as f:
+        data = f.read()
+    return project_record(file_path, analyze_source(data))
+
+def project_record(file_path, result):
+    """Registro de um arquivo do projeto a partir de um AnalysisResult (entrada do ProjectLinker)."""
+    return {
+        "file": file_path,
+        "token_total": len(result.processed_tokens),
+        "symbol_total": len(result.symbol_table),
+        "lexical_errors": result.error_tokens,
+        "syntax_errors": result.syntax_errors,
+        "summary": result.summary,
+        "names": NameIndex.from_tokens(result.processed_tokens),
+    }
+
+# ====== Combinação dos resumos ======
+def merge_summaries(summaries):
+    """Une os resumos do ModelBuilder de vários arquivos em um resumo de projeto."""
+    merged = {
+        "package": None,
+        "packages": [],
+        "imports": [],
+        "classes": [],
+        "datatypes": [],
+        "enums": [],
+        "gensets": [],
+        "internal_relations": [],
+        "external_relations": [],
+        "ordered_declarations": []
+    }
+    seen_imports = set()
+    for summary in summaries:
+        if summary.get("package"):
+            merged["packages"].append(summary["package"])
+        for name in summary.get("imports", []):
+            if name not in seen_imports:
+                seen_imports.add(name)
+                merged["imports"].append(name)
+        for key in ("classes", "datatypes", "enums", "gensets", "internal_relations",
+                    "external_relations", "ordered_declarations"):
+            merged[key].extend(summary.get(key, []))
+
+    if merged["packages"]:
+        merged["package"] = ", ".join(merged["packages"])
+    return merged
+
+# ====== Análise do projeto inteiro ======
+def analyze_project(project_dir, max_workers=None):
+    """Analisa todos os .tonto do projeto em paralelo (um processo por núcleo).
+
+    Retorna (resultados por arquivo, resumo combinado, erros combinados), com os
+    resultados na mesma ordem de find_project_files.
+    """
+    files = find_project_files(project_dir)
+    if len(files) > 1 and max_workers != 1:
+        from concurrent.futures import ProcessPoolExecutor  # só com paralelismo (custo de inicialização)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(analyze_project_file, files))
+    else:
+        results = [analyze_project_file(f) for f in files]
+
+    summary = merge_summaries(r["summary"] for r in results)
+    errors = []
+    for r in results:
+        name = os.path.relpath(r["file"], project_dir)
+        errors.extend(f"[{name}] {e}" for e in r["syntax_errors"])
+    return results, summary, errors
@@ -0,0 +1,123 @@
+# ====== Validação semântica de referências ======
+# Depois do parse, confere se todo nome de classe/tipo usado (specializes,
+# gensets, alvos de relações, domínio/imagem de relações externas, tipos de
+# atributos) foi declarado no pacote ou em um pacote importado, e se nenhum
+# nome foi declarado duas vezes. Uma única passada pelos tokens monta um índice
+# com dicionários (declarações e referências com suas linhas); a verificação é
+# linear no tamanho do modelo.
+
+from ..profiling import phases
+
+# Token anterior -> tipo da declaração do nome que vem a seguir
+_DECLARING_TOKENS = {'CLASS_STEREOTYPE': 'class', 'DATATYPE': 'datatype', 'ENUM': 'enum', 'GENSET': 'genset'}
+# Palavras-chave que também declaram um nome (ex.: "type PersonTypeByAge", tipo de ordem superior)
+_DECLARING_KEYWORDS = {'type': 'class'}
+_NAME_TOKENS = frozenset(('CLASS_NAME', 'NEW_DATATYPE'))
+
+class NameIndex:
+    """Declarações e referências de nomes de um arquivo, com as linhas."""
+    __slots__ = ("package", "imports", "types", "gensets", "references")
+
+    def __init__(self):
+        self.package = None
+        self.imports = []      # (pacote, linha)
+        self.types = {}        # classe/datatype/enum -> [(tipo, linha), ...]
+        self.gensets = {}      # genset -> [linha, ...]
+        self.references = []   # (nome, linha)
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        with phases.phase("semantic.index"):
+            return cls._from_tokens(tokens)
+
+    @classmethod
+    def _from_tokens(cls, tokens):
+        index = cls()
+        for role, tok in iter_names(tokens):
+            if role == 'genset':
+                index.gensets.setdefault(tok.value, []).append(tok.lineno)
+            elif role == 'reference':
+                index.references.append((tok.value, tok.lineno))
+            elif role == 'package':
+                index.package = tok.value
+            elif role == 'import':
+                index.imports.append((tok.value, tok.lineno))
+            else:
+                index.types.setdefault(tok.value, []).append((role, tok.lineno))
+        return index
+
+def iter_names(tokens):
+    """(papel, token) de cada nome de classe/tipo nos tokens, na ordem do texto.
+
+    Papéis: 'class', 'datatype', 'enum' e 'genset' (declarações), 'package',
+    'import' ou 'reference' (uso de um nome declarado em outro lugar).
+    """
+    previous = None
+    previous_value = None
+    for tok in tokens:
+        token_type = tok.type
+        if token_type in _NAME_TOKENS:
+            if previous == 'KEYWORD':
+                role = _DECLARING_KEYWORDS.get(previous_value)
+            else:
+                role = _DECLARING_TOKENS.get(previous)
+            if role is None:
+                if previous == 'PACKAGE':
+                    role = 'package'
+                elif previous == 'IMPORT':
+                    role = 'import'
+                else:
+                    role = 'reference'
+            yield role, tok
+        previous = token_type
+        previous_value = tok.value
+
+def validate_names(index, imported_types=None, missing_imports=()):
+    """Retorna (erros, avisos) semânticos de um arquivo.
+
+    - imported_types: nomes declarados nos pacotes importados. None quando os
+      pacotes importados não estão disponíveis (análise de um arquivo isolado):
+      nesse caso um nome desconhecido pode vir de um import e vira aviso.
+    - missing_imports: pacotes importados que não foram encontrados no projeto.
+    """
+    with phases.phase("semantic.validate"):
+        return _validate_names(index, imported_types, missing_imports)
+
+def _validate_names(index, imported_types, missing_imports):
+    errors = []
+    warnings = []
+
+    for package, line in index.imports:
+        if package in missing_imports:
+            errors.append((line, f"pacote importado '{package}' não encontrado"))
+
+    for name, declarations in index.types.items():
+        first_line = declarations[0][1]
+        for kind, line in declarations[1:]:
+            errors.append((line, f"'{name}' já foi declarado na linha {first_line}"))
+    for name, lines in index.gensets.items():
+        for line in lines[1:]:
+            errors.append((line, f"genset '{name}' já foi declarado na linha {lines[0]}"))
+
+    external_imports = [p for p, _ in index.imports if p != index.package]
+    uncertain = (imported_types is None and external_imports) or missing_imports
+    visible = imported_types or ()
+    for name, line in index.references:
+        if name in index.types or name in visible:
+            continue
+        if uncertain:
+            warnings.append((line, f"'{name}' não foi declarado neste pacote (pode vir de um pacote importado não analisado)"))
+        else:
+            errors.append((line, f"'{name}' não foi declarado"))
+
+    errors.sort(key=_first)
+    warnings.sort(key=_first)
+    return ([f"Erro semântico na linha {line}: {msg}" for line, msg in errors],
+            [f"Aviso semântico na linha {line}: {msg}" for line, msg in warnings])
+
+def _first(item):
+    return item[0]
+
+def validate_tokens(tokens):
+    """Validação de um arquivo isolado (sem os pacotes importados)."""
+    return validate_names(NameIndex.from_tokens(tokens))
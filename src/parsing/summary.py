@@ -1,119 +1,60 @@
+from .model import Model, Attribute, ClassDecl, Datatype, Enum, Genset, InternalRelation, ExternalRelation
+
 # ====== Classe para Construção do Resumo Sintático =======
 class ModelBuilder:
     def __init__(self):
-        self.summary = {
-            "package": None,
-            "imports": [],
-            "classes": [],
-            "datatypes": [],
-            "enums": [],
-            "gensets": [],
-            "internal_relations": [],
-            "external_relations": [],
-            "ordered_declarations": []
-        }
+        self.model = Model()
         self._current_class = None
 
+    # Visão em dicionário do modelo, no formato usado pelos relatórios
+    @property
+    def summary(self):
+        return self.model.summary
+
     def get_summary(self):
-        return self.summary
-    
-    def _register_ordered(self, type, data):
-        """Registra uma declaração de pacote na ordem em que é encontrada."""
-        self.summary["ordered_declarations"].append({
-            "type": type,
-            "data": data
-        })
-    
+        return self.model.summary
+
     def register_import(self, name):
-        self.summary["imports"].append(name)
+        self.model.add_import(name)
 
     def register_package(self, name):
-        self.summary["package"] = name
+        self.model.set_package(name)
         
     def register_class_header(self, name, stereotype, superclasses):
-        class_data = {
-            "name": name,
-            "stereotype": stereotype,
-            "superclasses": superclasses,
-            "attributes": []
-        }
-        self.summary["classes"].append(class_data)
-        self._current_class = name
-        self._register_ordered(stereotype, class_data)
+        class_decl = ClassDecl(name, stereotype, superclasses)
+        self.model.add_class(class_decl)
+        self._current_class = class_decl
 
     def register_class_members(self, class_name, members):
-        if self.summary["classes"] and self.summary["classes"][-1]["name"] == class_name:
-            current_class_data = self.summary["classes"][-1]
-            if members:
-                attributes = [m[1] for m in members if m[0] == 'attribute']
-                current_class_data["attributes"].extend(attributes)
+        # A classe aberta pelo último cabeçalho (o corpo é reduzido logo depois dele)
+        class_decl = self._current_class
+        if class_decl is None or class_decl.name != class_name:
+            class_decl = self.model.class_named(class_name)
+        if class_decl is not None and members:
+            attributes = [Attribute.from_dict(m[1]) for m in members if m[0] == 'attribute']
+            self.model.add_attributes(class_decl, attributes)
 
     def register_attribute(self, name, type, cardinality, flags):
         # Esta função é chamada *antes* de register_class_members (para coleta temporária)
         pass
 
     def register_datatype(self, name, superclasses, raw_attributes):
-        attributes = [f[1] for f in raw_attributes if f and isinstance(f, tuple) and f[0] == 'attribute']
-        
-        datatype_data = {
-            "name": name, 
-            "superclasses": superclasses if superclasses else [],
-            "attributes": attributes
-        }
-        self.summary["datatypes"].append(datatype_data)
-        self.summary["ordered_declarations"].append({
-            "type": "DATATYPE",
-            "data": datatype_data
-        })
+        attributes = [Attribute.from_dict(f[1]) for f in raw_attributes if f and isinstance(f, tuple) and f[0] == 'attribute']
+        self.model.add_datatype(Datatype(name, superclasses if superclasses else [], attributes))
         
     def register_enum(self, name, elements):
-        enum_data = {
-            "name": name,
-            "elements": elements
-        }
-        self.summary["enums"].append(enum_data)
-        self._register_ordered("ENUM", enum_data)
+        self.model.add_enum(Enum(name, elements))
 
     def register_genset(self, name, constraints, general, specifics, categorizer, data=None):
         if data: # Formato longo
-            genset_data = {
-                "name": name,
-                "general": data["general"],
-                "specifics": data["specifics"],
-                "categorizer": data["categorizer"],
-                "constraints": constraints,
-            }
+            genset = Genset(name, data["general"], data["specifics"], data["categorizer"], constraints)
         else: # Formato inline
-            genset_data = {
-                "name": name,
-                "specifics": specifics,
-                "general": general,
-                "categorizer": categorizer,
-                "constraints": constraints,
-            }
-        self.summary["gensets"].append(genset_data)
-        self._register_ordered("GENSET", genset_data)
+            genset = Genset(name, general, specifics, categorizer, constraints)
+        self.model.add_genset(genset)
             
     def register_internal_relation(self, stereo, card_from, connector, name, card_to, target):
-        self.summary["internal_relations"].append({
-            "owner": self._current_class,
-            "stereotype": stereo,
-            "card_from": card_from,
-            "connector": connector,
-            "name": name,
-            "card_to": card_to,
-            "target": target,
-        })
+        owner = self._current_class.name if self._current_class is not None else None
+        self.model.add_internal_relation(InternalRelation(owner, stereo, card_from, connector, name, card_to, target))
         
     def register_external_relation(self, stereo, domain, card_from, connector, name, card_to, range_):
-        relation_data = {
-            "stereotype": stereo,
-            "domain": domain,
-            "card_from": card_from,
-            "connector": connector,
-            "name": name,
-            "card_to": card_to,
-            "range": range_
-        }
-        self.summary["external_relations"].append(relation_data)
-        self._register_ordered("EXTERNAL_RELATION", relation_data)
\ No newline at end of file
+        self.model.add_external_relation(ExternalRelation(stereo, domain, card_from, connector, name, card_to, range_))
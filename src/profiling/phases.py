@@ -0,0 +1,271 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# ====== Instrumentação por fase (tempo e alocações) ======
+# Os pontos de medição ficam no próprio código do analisador:
+#
+#     with phases.phase("parser.parse"):
+#         ...
+#
+# Sem um PhaseProfiler ativo, phase() devolve um contexto vazio compartilhado e
+# instrument() devolve o próprio objeto: o custo é uma consulta a uma global.
+# Com um profiler ativo (PhaseProfiler().start()), cada fase registra o tempo de
+# parede e, opcionalmente, a memória alocada (tracemalloc). Fases aninhadas
+# formam caminhos (ex.: incremental.update > parser.parse > ModelBuilder.register_enum);
+# chamadas repetidas do mesmo caminho são somadas.
+# tracemalloc, cProfile e json só são importados quando usados: este módulo é
+# carregado por todo o analisador e não deve pesar na inicialização.
+
+_NULL_PHASE = nullcontext()
+_active = None
+
+def active():
+    """O profiler ativo, ou None."""
+    return _active
+
+def phase(name):
+    profiler = _active
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+def instrument(obj, label):
+    """Com um profiler ativo, devolve um proxy que mede cada método chamado em obj
+    (ex.: os callbacks do ModelBuilder durante o parse); senão, o próprio obj."""
+    profiler = _active
+    if profiler is None:
+        return obj
+    return _TimedCalls(obj, label, profiler)
+
+def _tracemalloc():
+    import tracemalloc
+    return tracemalloc
+
+class PhaseStats:
+    __slots__ = ("calls", "seconds", "allocated", "peak")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0
+        self.peak = 0
+
+class _Frame:
+    __slots__ = ("path", "memory_start", "seen_peak")
+
+    def __init__(self, path):
+        self.path = path
+        self.memory_start = 0
+        self.seen_peak = 0
+
+class PhaseProfiler:
+    """Coleta tempo (e alocações, com memory=True) por fase; com cprofile=True
+    também roda o cProfile durante a sessão (só na thread que chamou start())."""
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.stats = {}  # caminho (tupla de nomes de fase) -> PhaseStats
+        self.wall_seconds = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profile = None
+        self._owns_tracemalloc = False
+        self._started_at = None
+
+    # ---- sessão ----
+    def start(self):
+        global _active
+        if self.memory and not _tracemalloc().is_tracing():
+            _tracemalloc().start()
+            self._owns_tracemalloc = True
+        if self.cprofile:
+            import cProfile
+            self._profile = self._profile or cProfile.Profile()
+            self._profile.enable()
+        self._started_at = time.perf_counter()
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+        if self._started_at is not None:
+            self.wall_seconds += time.perf_counter() - self._started_at
+            self._started_at = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self._owns_tracemalloc:
+            _tracemalloc().stop()
+            self._owns_tracemalloc = False
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def elapsed(self):
+        """Tempo de parede das sessões, incluindo a que está em andamento."""
+        if self._started_at is None:
+            return self.wall_seconds
+        return self.wall_seconds + time.perf_counter() - self._started_at
+
+    # ---- medição ----
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_path(self):
+        stack = self._stack()
+        return stack[-1].path if stack else ()
+
+    @contextmanager
+    def phase(self, name):
+        stack = self._stack()
+        frame = _Frame((stack[-1].path if stack else ()) + (name,))
+        tracemalloc = _tracemalloc() if self.memory else None
+        memory = tracemalloc is not None and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # O pico é global: guarda o da fase externa antes de zerá-lo para esta
+            if stack:
+                stack[-1].seen_peak = max(stack[-1].seen_peak, peak)
+            tracemalloc.reset_peak()
+            frame.memory_start = frame.seen_peak = current
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            allocated = peak = 0
+            if memory:
+                current, peak_now = tracemalloc.get_traced_memory()
+                seen = max(frame.seen_peak, peak_now)
+                allocated = current - frame.memory_start
+                peak = seen - frame.memory_start
+                if stack:
+                    stack[-1].seen_peak = max(stack[-1].seen_peak, seen)
+            self.add(frame.path, elapsed, allocated, peak)
+
+    def add(self, path, seconds, allocated=0, peak=0, calls=1):
+        with self._lock:
+            stats = self.stats.get(path)
+            if stats is None:
+                stats = self.stats[path] = PhaseStats()
+            stats.calls += calls
+            stats.seconds += seconds
+            stats.allocated += allocated
+            stats.peak = max(stats.peak, peak)
+
+    # ---- resultados ----
+    def rows(self):
+        """(caminho, PhaseStats, tempo próprio) em ordem de árvore (pais antes dos filhos)."""
+        with self._lock:
+            items = sorted(self.stats.items())
+        children_seconds = {}
+        for path, stats in items:
+            if len(path) > 1:
+                parent = path[:-1]
+                children_seconds[parent] = children_seconds.get(parent, 0.0) + stats.seconds
+        return [(path, stats, max(stats.seconds - children_seconds.get(path, 0.0), 0.0)) for path, stats in items]
+
+    def report_lines(self):
+        header = f"{'Fase':<48} {'Chamadas':>9} {'Total (ms)':>11} {'Próprio (ms)':>13}"
+        if self.memory:
+            header += f" {'Alocado (KiB)':>14} {'Pico (KiB)':>11}"
+        yield ""
+        yield "======================= PERFIL DE DESEMPENHO ======================="
+        yield "-" * len(header)
+        yield header
+        yield "-" * len(header)
+        for path, stats, self_seconds in self.rows():
+            name = "  " * (len(path) - 1) + path[-1]
+            line = f"{name:<48} {stats.calls:>9} {stats.seconds * 1000:>11.2f} {self_seconds * 1000:>13.2f}"
+            if self.memory:
+                line += f" {stats.allocated / 1024:>14.1f} {stats.peak / 1024:>11.1f}"
+            yield line
+        yield "-" * len(header)
+        yield f"Tempo total da sessão: {self.elapsed() * 1000:.2f} ms"
+
+    def to_dict(self):
+        return {
+            "wall_seconds": self.elapsed(),
+            "memory": self.memory,
+            "phases": [
+                {
+                    "path": list(path),
+                    "calls": stats.calls,
+                    "seconds": stats.seconds,
+                    "self_seconds": self_seconds,
+                    "allocated_bytes": stats.allocated,
+                    "peak_bytes": stats.peak,
+                }
+                for path, stats, self_seconds in self.rows()
+            ],
+        }
+
+    def folded_lines(self):
+        """Formato "pilhas colapsadas" (flamegraph.pl, inferno, speedscope):
+        uma linha por caminho com o tempo próprio em microssegundos."""
+        for path, _, self_seconds in self.rows():
+            micros = round(self_seconds * 1_000_000)
+            if micros > 0:
+                yield f"{';'.join(path)} {micros}"
+
+    def write(self, path, fmt="json"):
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "folded":
+                for line in self.folded_lines():
+                    f.write(line + "\n")
+            elif fmt == "json":
+                import json
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            else:
+                raise ValueError(f"Formato de perfil desconhecido: {fmt}")
+
+    def write_pstats(self, path):
+        """Grava as estatísticas do cProfile (abrir com pstats, snakeviz etc.)."""
+        if self._profile is None:
+            raise ValueError("cProfile não foi ativado neste perfil (use cprofile=True)")
+        self._profile.dump_stats(path)
+
+# ====== Proxy que mede chamadas de métodos ======
+class _TimedCalls:
+    """Mede cada método de um objeto como uma fase filha da fase corrente.
+    Mais leve que phase(): só tempo, sem alocações (os callbacks são muitos e curtos)."""
+
+    def __init__(self, target, label, profiler):
+        self._target = target
+        self._label = label
+        self._profiler = profiler
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        wrapper = self._wrapped.get(name)
+        if wrapper is not None:
+            return wrapper
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        profiler = self._profiler
+        label = f"{self._label}.{name}"
+
+        def wrapper(*args, **kwargs):
+            path = profiler.current_path() + (label,)
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                profiler.add(path, time.perf_counter() - start)
+
+        self._wrapped[name] = wrapper
+        return wrapper
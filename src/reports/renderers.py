@@ -0,0 +1,244 @@
+import html
+import json
+import re
+import unicodedata
+
+from ..lexical.lexer_reports import (
+    token_lines, symbol_table_lines, token_count_lines, token_counts,
+)
+from ..parsing.parse_reports import syntax_summary_lines, syntax_errors_lines
+
+# ====== Camada de renderização dos relatórios ======
+# Cada relatório de uma análise (AnalysisResult ou o resultado do
+# IncrementalAnalyzer) pode ser gerado em quatro formatos:
+#   - tree:  o texto atual, com a árvore em box-drawing e emojis
+#   - plain: o mesmo texto só com ASCII (para logs, terminais simples, diff):
+#            acentos são removidos e o que não tem equivalente vira "?"
+#   - json:  dados estruturados, com as mesmas chaves da saída em lote
+#   - html:  documento com tabelas e a árvore do resumo em <pre>
+# Tudo é produzido linha a linha (geradores): render_lines() entrega as linhas
+# sem "\n" e write_report() as escreve em qualquer stream de texto (arquivo,
+# socket via makefile(), stdout...), sem montar o relatório inteiro na memória.
+
+REPORTS = ("tokens", "symbol_table", "token_count", "summary", "syntax_errors")
+FORMATS = ("tree", "plain", "json", "html")
+
+REPORT_TITLES = {
+    "tokens": "Tokens Processados",
+    "symbol_table": "Tabela de Símbolos",
+    "token_count": "Contagem de Tokens",
+    "summary": "Resumo Sintático",
+    "syntax_errors": "Erros Sintáticos",
+}
+
+# ====== tree ======
+def tree_lines(name, result):
+    """Linhas de um relatório no formato atual do terminal."""
+    if name == "tokens":
+        return token_lines(result.processed_tokens, result.error_tokens)
+    if name == "symbol_table":
+        return symbol_table_lines(result.symbol_table)
+    if name == "token_count":
+        return token_count_lines(result.processed_tokens)
+    if name == "summary":
+        return syntax_summary_lines(result.summary)
+    if name == "syntax_errors":
+        return syntax_errors_lines(result.syntax_errors)
+    raise ValueError(f"Relatório desconhecido: {name}")
+
+# ====== plain ======
+_ASCII = str.maketrans({
+    "│": "|", "─": "-", "├": "+", "└": "+",
+    "┌": "+", "┬": "+", "┐": "+", "┼": "+", "┤": "+", "┴": "+", "┘": "+",
+})
+# Emojis de status viram marcadores; os decorativos somem (com o espaço seguinte)
+_MARKERS = {"✅": "[OK]", "❌": "[ERRO]", "⚠️": "[AVISO]"}
+_EMOJI = re.compile("(✅|❌|⚠️)|(?:🌳|📥|📦|🧱|📌|🔗|🔢|📊|➕|🌐|🔁) ?")
+
+def _plain_marker(match):
+    return _MARKERS[match.group(1)] if match.group(1) else ""
+
+def _ascii(text):
+    if text.isascii():
+        return text
+    # "é" -> "e" + acento combinante (descartado); cada caractere continua com
+    # largura 1, então as colunas das tabelas ficam alinhadas
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).encode("ascii", "replace").decode("ascii")
+
+def to_plain(line):
+    # Ramos da árvore antes das bordas de tabela, que usam os mesmos cantos
+    line = line.replace("├── ", "|-- ").replace("└── ", "`-- ")
+    return _ascii(_EMOJI.sub(_plain_marker, line).translate(_ASCII))
+
+def plain_lines(name, result):
+    for line in tree_lines(name, result):
+        yield to_plain(line)
+
+# ====== json ======
+def _json_members(name, result):
+    """Pares (chave, valor) de um relatório; valores em lista são escritos item a item."""
+    if name == "tokens":
+        return [
+            ("tokens", ({"Token": t.type, "Valor": t.value, "Linha": t.lineno, "Posição": t.lexpos}
+                        for t in result.processed_tokens)),
+            ("lexical_errors", iter(result.error_tokens)),
+        ]
+    if name == "symbol_table":
+        return [("symbol_table", (dict(entry) for entry in result.symbol_table))]
+    if name == "token_count":
+        # Mesma forma da saída em lote (AnalysisResult.to_dict): ordem de primeira ocorrência
+        return [("token_count", result.token_count())]
+    if name == "summary":
+        return [("summary", result.summary)]
+    if name == "syntax_errors":
+        return [("syntax_errors", iter(result.syntax_errors or ()))]
+    raise ValueError(f"Relatório desconhecido: {name}")
+
+def _with_commas(lines):
+    """Acrescenta a vírgula de separação a todas as linhas menos a última."""
+    previous = None
+    for line in lines:
+        if previous is not None:
+            yield previous + ","
+        previous = line
+    if previous is not None:
+        yield previous
+
+def _json_member_lines(key, value):
+    key = json.dumps(key, ensure_ascii=False)
+    if isinstance(value, dict):
+        # Objetos (ex.: o resumo) com uma chave por linha
+        yield f"{key}: {{"
+        yield from _with_commas(f"{json.dumps(k, ensure_ascii=False)}: {json.dumps(v, ensure_ascii=False)}"
+                                for k, v in value.items())
+        yield "}"
+    elif hasattr(value, "__next__"):
+        yield f"{key}: ["
+        yield from _with_commas(json.dumps(item, ensure_ascii=False) for item in value)
+        yield "]"
+    else:
+        yield f"{key}: {json.dumps(value, ensure_ascii=False)}"
+
+def _json_object_lines(names, result, file_path=None):
+    """Membros do objeto JSON de um arquivo (sem as chaves de abertura e fechamento)."""
+    members = [("file", file_path)] if file_path is not None else []
+    for name in names:
+        members.extend(_json_members(name, result))
+    # A vírgula entre membros vai na última linha de cada um, que só é conhecida
+    # quando a linha seguinte chega
+    pending = None
+    for key, value in members:
+        if pending is not None:
+            yield pending + ","
+            pending = None
+        for line in _json_member_lines(key, value):
+            if pending is not None:
+                yield pending
+            pending = line
+    if pending is not None:
+        yield pending
+
+# ====== html ======
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatório de análise TONTO</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+th, td { border: 1px solid #ccc; padding: 2px 8px; text-align: left; font-family: monospace; }
+pre { background: #f6f6f6; padding: 1em; }
+.erro { color: #b00020; }
+</style>
+</head>
+<body>"""
+_HTML_TAIL = "</body>\n</html>"
+
+def _html_table(headers, rows):
+    yield "<table>"
+    yield "<tr>" + "".join(f"<th>{html.escape(h)}</th>" for h in headers) + "</tr>"
+    for row in rows:
+        yield "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+    yield "</table>"
+
+def html_lines(name, result):
+    """Seção HTML de um relatório (o documento é montado por render_lines)."""
+    yield f'<section id="{name}">'
+    yield f"<h2>{html.escape(REPORT_TITLES[name])}</h2>"
+    if name == "tokens":
+        yield from _html_table(("Token", "Valor", "Linha", "Posição"),
+                               ((t.type, t.value, t.lineno, t.lexpos) for t in result.processed_tokens))
+        if result.error_tokens:
+            yield "<h3>Erros Léxicos</h3>"
+            yield from _html_table(("Token", "Valor", "Linha", "Posição"),
+                                   ((e["Token"], e["Valor"], e["Linha"], e["Posição"]) for e in result.error_tokens))
+    elif name == "symbol_table":
+        yield from _html_table(("Token", "Valor"), ((e["Token"], e["Valor"]) for e in result.symbol_table))
+    elif name == "token_count":
+        yield from _html_table(("Token", "Quantidade"), token_counts(result.processed_tokens))
+    elif name == "summary":
+        # A árvore já é a melhor forma de ler o resumo; em <pre> ela fica alinhada
+        yield "<pre>"
+        for line in syntax_summary_lines(result.summary):
+            yield html.escape(line)
+        yield "</pre>"
+    elif name == "syntax_errors":
+        if result.syntax_errors:
+            yield '<ul class="erro">'
+            for error in result.syntax_errors:
+                yield f"<li>{html.escape(error)}</li>"
+            yield "</ul>"
+        else:
+            yield "<p>Nenhum erro sintático encontrado.</p>"
+    else:
+        raise ValueError(f"Relatório desconhecido: {name}")
+    yield "</section>"
+
+# ====== Documento com um ou mais arquivos ======
+_TEXT_RENDERERS = {"tree": tree_lines, "plain": plain_lines}
+
+def render_lines(names, results, fmt="tree"):
+    """Linhas (sem "\\n") dos relatórios `names` para cada (arquivo, resultado) de `results`.
+
+    Com arquivo None o texto é igual ao do menu interativo; com um nome, o
+    arquivo ganha um cabeçalho. Em json a saída é um array com um objeto por
+    arquivo; em html, um documento com uma seção por relatório.
+    """
+    for name in names:
+        if name not in REPORTS:
+            raise ValueError(f"Relatório desconhecido: {name}")
+    if fmt in _TEXT_RENDERERS:
+        renderer = _TEXT_RENDERERS[fmt]
+        for file_path, result in results:
+            if file_path is not None:
+                yield ""
+                yield f"#################### {file_path} ####################"
+            for name in names:
+                yield from renderer(name, result)
+    elif fmt == "json":
+        yield "["
+        empty = True
+        for file_path, result in results:
+            yield "{" if empty else "}, {"
+            empty = False
+            yield from _json_object_lines(names, result, file_path)
+        yield "]" if empty else "}]"
+    elif fmt == "html":
+        yield from _HTML_HEAD.split("\n")
+        for file_path, result in results:
+            yield "<article>"
+            if file_path is not None:
+                yield f"<h1>{html.escape(file_path)}</h1>"
+            for name in names:
+                yield from html_lines(name, result)
+            yield "</article>"
+        yield from _HTML_TAIL.split("\n")
+    else:
+        raise ValueError(f"Formato desconhecido: {fmt}")
+
+def write_report(names, results, out, fmt="tree"):
+    """Escreve os relatórios em `out` (qualquer objeto com write), linha a linha."""
+    for line in render_lines(names, results, fmt):
+        out.write(line + "\n")
@@ -0,0 +1,94 @@
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+
+# ====== Cliente do daemon de análise ======
+# Só usa a biblioteca padrão (não importa PLY nem o analisador), então iniciar
+# o cliente é rápido: ideal para hooks de pre-commit e integrações de editor.
+
+def default_socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "tonto_analyzer.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join("/tmp", f"tonto_analyzer-{uid}.sock")
+
+class DaemonError(Exception):
+    """Erro JSON-RPC devolvido pelo daemon."""
+
+    def __init__(self, error):
+        super().__init__(error.get("message"))
+        self.code = error.get("code")
+        self.data = error.get("data")
+
+class DaemonClient:
+    """Conexão com o daemon por socket Unix; call() envia uma requisição e espera a resposta."""
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._rfile = self._sock.makefile("rb")
+        self._ids = itertools.count(1)
+
+    def call(self, method, params=None):
+        request_id = next(self._ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        self._sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        while True:
+            line = self._rfile.readline()
+            if not line:
+                raise ConnectionError("O daemon fechou a conexão")
+            response = json.loads(line)
+            if response.get("id") != request_id:
+                continue  # resposta de outra requisição (não acontece com uma chamada por vez)
+            if "error" in response:
+                raise DaemonError(response["error"])
+            return response["result"]
+
+    def close(self):
+        self._rfile.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server.client",
+        description="Envia requisições ao daemon de análise TONTO (python -m src.server.daemon).",
+    )
+    parser.add_argument("method", help="método: analyze, summary, errors, report, project, stats, invalidate, shutdown, ping")
+    parser.add_argument("paths", nargs="*", help="arquivos (ou a pasta, em 'project'); uma requisição por caminho")
+    parser.add_argument("--socket", help="socket do daemon (padrão: $XDG_RUNTIME_DIR/tonto_analyzer.sock)")
+    parser.add_argument("--params", default="{}", help="parâmetros extras em JSON (ex.: '{\"include_tokens\": true}')")
+    args = parser.parse_args(argv)
+
+    extra = json.loads(args.params)
+    failed = False
+    try:
+        with DaemonClient(args.socket) as client:
+            for params in ([dict(extra, path=os.path.abspath(p)) for p in args.paths] or [extra]):
+                try:
+                    result = client.call(args.method, params)
+                except DaemonError as e:
+                    failed = True
+                    print(json.dumps({"path": params.get("path"), "error": str(e)}, ensure_ascii=False))
+                    continue
+                if isinstance(result, dict) and result.get("ok") is False:
+                    failed = True
+                print(json.dumps(result, ensure_ascii=False))
+    except OSError as e:
+        print(f"Não foi possível conectar ao daemon: {e}", file=sys.stderr)
+        return 2
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
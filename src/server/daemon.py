@@ -0,0 +1,406 @@
+import argparse
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..cli.batch import positive_int
+from ..parsing.grammar import get_parser
+from ..parsing.incremental import IncrementalAnalyzer
+from ..parsing.linker import ProjectLinker
+from ..parsing.project import find_project_files, project_record
+from ..parsing.semantic import validate_tokens
+from ..reports.renderers import REPORTS, FORMATS, render_lines
+from .client import default_socket_path
+from .jsonrpc import (
+    RpcError, FILE_ERROR, INVALID_PARAMS, dispatch, error_response, read_line_message,
+    encode_line_message, require,
+)
+
+# ====== Daemon de análise ======
+# Um processo de longa duração que mantém aquecidos o lexer e as tabelas do
+# parser e guarda em memória a análise de cada arquivo (IncrementalAnalyzer:
+# ao mudar, só as declarações alteradas são reanalisadas) e o linker de cada
+# projeto. Atende JSON-RPC 2.0 (uma mensagem por linha) por socket Unix ou
+# stdin/stdout; as requisições rodam num pool de threads, com um lock por
+# arquivo, e as respostas podem sair fora de ordem (casam pelo "id").
+
+class _FileEntry:
+    """Estado em memória de um arquivo: a análise e o que foi derivado dela."""
+    __slots__ = ("lock", "analyzer", "stamp", "version", "semantic", "record", "derived_version")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.analyzer = IncrementalAnalyzer()
+        self.stamp = None       # (mtime_ns, tamanho) da versão em disco analisada
+        self.version = 0        # incrementa a cada novo resultado
+        self.semantic = None    # (erros, avisos) da validação do arquivo isolado
+        self.record = None      # registro para o ProjectLinker
+        self.derived_version = -1
+
+class AnalysisDaemon:
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._files = {}
+        self._files_lock = threading.Lock()
+        self._projects = {}  # pasta -> (versões dos arquivos, linker, validação por arquivo)
+        self._projects_lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = 0
+        self.stopped = threading.Event()
+        self.handlers = {
+            "ping": lambda params: "pong",
+            "analyze": self.analyze,
+            "summary": self.summary,
+            "errors": self.errors,
+            "report": self.report,
+            "project": self.project,
+            "invalidate": self.invalidate,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+
+    def warm_up(self):
+        """Constrói as tabelas do parser antes da primeira requisição."""
+        get_parser()
+        IncrementalAnalyzer().analyze("package Warmup\n")
+
+    def handle(self, message):
+        self.requests += 1
+        return dispatch(self.handlers, message)
+
+    # ---- estado por arquivo ----
+    def _entry(self, path):
+        with self._files_lock:
+            entry = self._files.get(path)
+            if entry is None:
+                entry = self._files[path] = _FileEntry()
+            return entry
+
+    def _file(self, params, build):
+        """Resposta build(caminho, entrada, resultado) sobre a versão atual do arquivo.
+
+        Com "text", analisa esse conteúdo (ex.: buffer não salvo do editor); senão
+        lê o disco, a menos que o arquivo não tenha mudado desde a última análise.
+        build roda com o lock do arquivo: a próxima atualização troca entry.semantic,
+        entry.record e o modo do analisador, então a resposta precisa ser montada aqui.
+        """
+        path = os.path.abspath(require(params, "path"))
+        text = params.get("text")
+        if text is not None and not isinstance(text, str):
+            raise RpcError(INVALID_PARAMS, "Parâmetro 'text' deve ser uma string")
+        entry = self._entry(path)
+        with entry.lock:
+            previous = entry.analyzer.result
+            if text is not None:
+                entry.stamp = None
+                result = entry.analyzer.update(text)
+            else:
+                try:
+                    st = os.stat(path)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if stamp != entry.stamp or previous is None:
+                        with open(path, "r", encoding="utf-8") as f:
+                            text = f.read()
+                        entry.stamp = stamp
+                        result = entry.analyzer.update(text)
+                    else:
+                        result = previous
+                except (OSError, UnicodeDecodeError) as e:
+                    raise RpcError(FILE_ERROR, f"Não foi possível ler {path}: {e}")
+            if result is not previous:
+                entry.version += 1
+            if entry.derived_version != entry.version:
+                entry.semantic = validate_tokens(result.processed_tokens)
+                entry.record = None
+                entry.derived_version = entry.version
+            return build(path, entry, result)
+
+    # ---- métodos ----
+    def analyze(self, params):
+        include_tokens = bool(params.get("include_tokens"))
+
+        def build(path, entry, result):
+            record = {"file": path, "mode": entry.analyzer.last_mode}
+            record.update(result.to_dict(include_tokens=include_tokens))
+            return self._with_semantic(record, entry, result)
+        return self._file(params, build)
+
+    def summary(self, params):
+        return self._file(params, lambda path, entry, result: {"file": path, "summary": result.summary})
+
+    def errors(self, params):
+        def build(path, entry, result):
+            record = {"file": path, "lexical_errors": list(result.error_tokens),
+                      "syntax_errors": list(result.syntax_errors)}
+            return self._with_semantic(record, entry, result)
+        return self._file(params, build)
+
+    def _with_semantic(self, record, entry, result):
+        errors, warnings = entry.semantic
+        record["semantic_errors"] = errors
+        record["semantic_warnings"] = warnings
+        record["ok"] = not result.error_tokens and not result.syntax_errors and not errors
+        return record
+
+    def report(self, params):
+        reports = params.get("reports", ["summary"])
+        fmt = params.get("format", "tree")
+        if not isinstance(reports, list) or any(name not in REPORTS for name in reports):
+            raise RpcError(INVALID_PARAMS, f"'reports' deve ser uma lista com nomes entre {list(REPORTS)}")
+        if fmt not in FORMATS:
+            raise RpcError(INVALID_PARAMS, f"'format' deve ser um de {list(FORMATS)}")
+        return self._file(params, lambda path, entry, result: {
+            "file": path, "format": fmt, "text": "\n".join(render_lines(reports, [(None, result)], fmt)) + "\n",
+        })
+
+    @staticmethod
+    def _project_record(path, entry, result):
+        if entry.record is None:
+            entry.record = project_record(path, result)
+        return path, entry.version, entry.record
+
+    def project(self, params):
+        """Imports e validação semântica entre os arquivos de uma pasta de projeto.
+        Só os arquivos alterados são reanalisados; o linker é refeito se algum mudou."""
+        project_dir = os.path.abspath(require(params, "path"))
+        if not os.path.isdir(project_dir):
+            raise RpcError(FILE_ERROR, f"Pasta não encontrada: {project_dir}")
+        records = []
+        versions = []
+        for file_path in find_project_files(project_dir):
+            try:
+                path, version, record = self._file({"path": file_path}, self._project_record)
+            except RpcError:
+                continue
+            records.append(record)
+            versions.append((path, version))
+        versions = tuple(versions)
+
+        with self._projects_lock:
+            cached = self._projects.get(project_dir)
+        if cached is not None and cached[0] == versions:
+            _, linker, validated = cached
+        else:
+            linker = ProjectLinker(records)
+            validated = linker.validate_files()
+            with self._projects_lock:
+                self._projects[project_dir] = (versions, linker, validated)
+
+        files = []
+        for record, (file_path, errors, warnings) in zip(records, validated):
+            files.append({
+                "file": file_path,
+                "package": record["summary"].get("package"),
+                "lexical_errors": record["lexical_errors"],
+                "syntax_errors": record["syntax_errors"],
+                "semantic_errors": errors,
+                "semantic_warnings": warnings,
+                "ok": not record["lexical_errors"] and not record["syntax_errors"] and not errors,
+            })
+        return {
+            "project": project_dir,
+            "load_order": linker.load_order(),
+            "unresolved_imports": [list(pair) for pair in linker.unresolved_imports],
+            "duplicate_packages": linker.duplicate_packages,
+            "cycles": linker.cycles(),
+            "files": files,
+            "ok": all(f["ok"] for f in files) and not linker.unresolved_imports,
+        }
+
+    def invalidate(self, params):
+        """Descarta o estado em memória de um arquivo/pasta ("path") ou de tudo."""
+        path = params.get("path")
+        prefix = os.path.abspath(path) if isinstance(path, str) else None
+        with self._files_lock:
+            removed = [p for p in self._files if prefix is None or p == prefix or p.startswith(prefix + os.sep)]
+            for p in removed:
+                del self._files[p]
+        with self._projects_lock:
+            for p in [p for p in self._projects if prefix is None or p == prefix or p.startswith(prefix + os.sep)]:
+                del self._projects[p]
+        return {"removed": len(removed)}
+
+    def stats(self, params):
+        with self._files_lock:
+            files = len(self._files)
+        with self._projects_lock:
+            projects = len(self._projects)
+        return {
+            "files": files,
+            "projects": projects,
+            "requests": self.requests,
+            "workers": self.max_workers,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+        }
+
+    def shutdown(self, params):
+        self.stopped.set()
+        return {}
+
+# ====== Transportes ======
+class _Connection:
+    """Envia as respostas de uma conexão; várias threads do pool escrevem nela."""
+
+    def __init__(self, write, flush=None):
+        self._write = write
+        self._flush = flush
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+
+    def submit(self, daemon, message):
+        if isinstance(message, RpcError):
+            self.send(error_response(None, message))
+            return
+        with self._lock:
+            self._pending += 1
+        daemon.pool.submit(self._run, daemon, message)
+
+    def _run(self, daemon, message):
+        try:
+            response = daemon.handle(message)
+            if response is not None:
+                self.send(response)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._idle.notify_all()
+
+    def send(self, response):
+        data = encode_line_message(response)
+        with self._lock:
+            try:
+                self._write(data)
+                if self._flush is not None:
+                    self._flush()
+            except OSError:
+                pass  # cliente desconectou
+
+    def wait_idle(self):
+        with self._lock:
+            while self._pending:
+                self._idle.wait()
+
+def serve_stdio(daemon, rfile=None, wfile=None):
+    """Lê requisições de stdin e responde em stdout até o fim da entrada ou shutdown."""
+    # Leitor próprio sobre o descritor: o sys.stdin.buffer não pode estar em uso
+    # (bloqueado na thread de leitura) quando o interpretador encerra
+    rfile = rfile or open(sys.stdin.fileno(), "rb", closefd=False)
+    wfile = wfile or sys.stdout.buffer
+    connection = _Connection(wfile.write, wfile.flush)
+
+    def read_requests():
+        while True:
+            message = read_line_message(rfile)
+            if message is None:
+                break
+            connection.submit(daemon, message)
+        connection.wait_idle()
+        daemon.stopped.set()
+
+    # A leitura bloqueia em stdin; numa thread à parte, shutdown não precisa esperar o fim da entrada
+    threading.Thread(target=read_requests, daemon=True).start()
+    daemon.stopped.wait()
+    connection.wait_idle()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon
+        connection = _Connection(self.wfile.write)
+        while not daemon.stopped.is_set():
+            message = read_line_message(self.rfile)
+            if message is None:
+                break
+            connection.submit(daemon, message)
+        connection.wait_idle()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def _remove_stale_socket(socket_path):
+    """Apaga o socket deixado por uma execução anterior que terminou sem limpá-lo.
+
+    Recusa (FileExistsError) se o caminho não for um socket ou se outro daemon
+    ainda estiver atendendo nele.
+    """
+    try:
+        st = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{socket_path} existe e não é um socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass  # ninguém escutando: socket órfão
+    else:
+        raise FileExistsError(f"Já existe um daemon ouvindo em {socket_path}")
+    finally:
+        probe.close()
+    os.remove(socket_path)
+
+def serve_unix(daemon, socket_path):
+    """Atende conexões no socket Unix até o método shutdown."""
+    _remove_stale_socket(socket_path)
+    old_umask = os.umask(0o177)  # só o próprio usuário acessa o socket
+    try:
+        server = _UnixServer(socket_path, _RequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon = daemon
+    own_inode = os.stat(socket_path).st_ino
+    print(f"Daemon de análise ouvindo em {socket_path}", file=sys.stderr)
+
+    def stop_on_shutdown():
+        daemon.stopped.wait()
+        server.shutdown()
+
+    threading.Thread(target=stop_on_shutdown, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            # Só apaga o próprio socket (o caminho pode ter sido reutilizado)
+            if os.stat(socket_path).st_ino == own_inode:
+                os.remove(socket_path)
+        except OSError:
+            pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server.daemon",
+        description="Daemon de análise TONTO: JSON-RPC 2.0 (uma mensagem por linha) por socket Unix ou stdio.",
+    )
+    parser.add_argument("--stdio", action="store_true", help="atende por stdin/stdout em vez do socket")
+    parser.add_argument("--socket", help="caminho do socket Unix (padrão: $XDG_RUNTIME_DIR/tonto_analyzer.sock)")
+    parser.add_argument("-j", "--jobs", type=positive_int, help="threads do pool de requisições (padrão: núcleos, até 8)")
+    args = parser.parse_args(argv)
+
+    daemon = AnalysisDaemon(args.jobs)
+    daemon.warm_up()
+    try:
+        if args.stdio:
+            serve_stdio(daemon)
+        else:
+            socket_path = args.socket or default_socket_path()
+            serve_unix(daemon, socket_path)
+    except FileExistsError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Espera as requisições em andamento (inclusive a resposta do shutdown)
+        daemon.pool.shutdown(wait=True, cancel_futures=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import json
+
+# ====== JSON-RPC 2.0: erros, despacho e transportes ======
+# Dois enquadramentos: uma mensagem JSON por linha (JSON Lines), simples de
+# usar com socat/nc em hooks e scripts, e cabeçalhos Content-Length (o do
+# Language Server Protocol). O despacho não conhece o transporte: recebe a
+# mensagem já decodificada e devolve a resposta (ou None para notificações).
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Erros do servidor (faixa reservada -32000 a -32099)
+FILE_ERROR = -32001
+
+class RpcError(Exception):
+    def __init__(self, code, message, data=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self):
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+def result_response(request_id, result):
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+def error_response(request_id, error):
+    return {"jsonrpc": "2.0", "id": request_id, "error": error.to_dict()}
+
+def decode_message(text):
+    """Decodifica uma mensagem; JSON inválido vira RpcError(PARSE_ERROR)."""
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise RpcError(PARSE_ERROR, f"JSON inválido: {e}")
+
+def dispatch(handlers, message):
+    """Executa a requisição com o handler do método (handlers[method](params)).
+
+    Retorna a resposta, ou None para notificações (mensagens sem "id").
+    """
+    if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+        return error_response(message.get("id") if isinstance(message, dict) else None,
+                              RpcError(INVALID_REQUEST, "Requisição JSON-RPC 2.0 inválida"))
+    request_id = message.get("id")
+    is_notification = "id" not in message
+    params = message.get("params")
+    if params is None:
+        params = {}  # "params" é opcional (alguns clientes enviam null)
+    handler = handlers.get(message["method"])
+    try:
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Método desconhecido: {message['method']}")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params deve ser um objeto")
+        result = handler(params)
+    except RpcError as e:
+        return None if is_notification else error_response(request_id, e)
+    except Exception as e:  # erro inesperado não derruba o servidor
+        return None if is_notification else error_response(request_id, RpcError(INTERNAL_ERROR, f"{type(e).__name__}: {e}"))
+    return None if is_notification else result_response(request_id, result)
+
+def require(params, name, kind=str):
+    """Parâmetro obrigatório com o tipo esperado (senão RpcError(INVALID_PARAMS))."""
+    value = params.get(name)
+    if not isinstance(value, kind):
+        raise RpcError(INVALID_PARAMS, f"Parâmetro '{name}' ausente ou inválido")
+    return value
+
+# ====== Transporte em linhas ======
+def read_line_message(rfile):
+    """Próxima linha não vazia (bytes ou str) decodificada; None no fim do stream.
+    JSON inválido é devolvido como RpcError para o chamador responder."""
+    while True:
+        line = rfile.readline()
+        if not line:
+            return None
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        if line.strip():
+            try:
+                return decode_message(line)
+            except RpcError as e:
+                return e
+
+def encode_line_message(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+# ====== Transporte com cabeçalhos (Language Server Protocol) ======
+def read_header_message(rfile):
+    """Próxima mensagem "Content-Length: N\\r\\n\\r\\n<N bytes>" de um stream binário;
+    None no fim do stream. JSON inválido é devolvido como RpcError."""
+    length = None
+    while True:
+        line = rfile.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            continue  # linhas em branco antes dos cabeçalhos
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                return RpcError(PARSE_ERROR, f"Content-Length inválido: {value.strip()}")
+    body = rfile.read(length)
+    if len(body) < length:
+        return None
+    try:
+        return decode_message(body.decode("utf-8", errors="replace"))
+    except RpcError as e:
+        return e
+
+def encode_header_message(message):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
@@ -0,0 +1,525 @@
+import argparse
+import os
+import queue
+import re
+import sys
+import threading
+from bisect import bisect_right
+from urllib.parse import quote, unquote, urlparse
+
+from ..lexical.lexer import TontoLexer
+from ..parsing.grammar import get_parser
+from ..parsing.incremental import IncrementalAnalyzer, split_declarations
+from ..parsing.project import find_project_files
+from ..parsing.semantic import iter_names, validate_tokens
+from .jsonrpc import (
+    RpcError, INVALID_PARAMS, INVALID_REQUEST, dispatch, error_response, encode_header_message, read_header_message, require,
+)
+
+# ====== Servidor LSP (Language Server Protocol) ======
+# Diagnósticos e navegação para editores, por stdin/stdout. Cada documento
+# aberto guarda o texto e um IncrementalAnalyzer: as edições incrementais
+# (didChange com intervalos) são aplicadas ao texto e só as declarações
+# afetadas são re-parseadas. As mensagens são lidas numa thread e tratadas em
+# lote: uma rajada de edições gera uma única análise e uma publicação de
+# diagnósticos. Um índice em memória das declarações de todos os arquivos
+# .tonto do workspace atende go-to-definition e workspace/symbol.
+
+# SymbolKind do LSP
+_SYMBOL_KINDS = {
+    'package': 4, 'class': 5, 'enum': 10, 'datatype': 23, 'genset': 19,
+    'relation': 7, 'attribute': 8, 'literal': 22,
+}
+_SEVERITY_ERROR = 1
+_SEVERITY_WARNING = 2
+_SYNC_INCREMENTAL = 2
+
+_DECLARATION_ROLES = frozenset(('class', 'datatype', 'enum', 'genset'))
+_RELATION_ARROWS = frozenset(('ASSOCIATION', 'AGGREGATION', 'COMPOSITION', 'AGGREGATION_REV', 'COMPOSITION_REV'))
+
+_LINE_RE = re.compile(r"na linha (\d+)")
+_SYNTAX_TOKEN_RE = re.compile(r"\(token: '(.*)'\)$")
+_QUOTED_RE = re.compile(r"'([^']+)'")
+
+# ====== URIs e posições ======
+def uri_to_path(uri):
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    return os.path.abspath(unquote(parsed.path))
+
+def path_to_uri(path):
+    return "file://" + quote(os.path.abspath(path))
+
+class LineIndex:
+    """Converte deslocamentos no texto em posições LSP (linha, caractere) e vice-versa.
+
+    O "caractere" é contado na codificação negociada com o cliente: unidades
+    UTF-16 (padrão do protocolo), bytes UTF-8 ou code points (utf-32).
+    """
+
+    def __init__(self, text, encoding="utf-16"):
+        self.text = text
+        self.encoding = encoding
+        self.starts = [0]
+        self.starts.extend(m.end() for m in re.finditer("\n", text))
+
+    def _line_text(self, line):
+        end = self.starts[line + 1] - 1 if line + 1 < len(self.starts) else len(self.text)
+        return self.text[self.starts[line]:end]
+
+    def position(self, offset):
+        line = bisect_right(self.starts, offset) - 1
+        column = offset - self.starts[line]
+        if self.encoding != "utf-32":
+            prefix = self.text[self.starts[line]:offset]
+            if not prefix.isascii():
+                column = _units(prefix, self.encoding)
+        return {"line": line, "character": column}
+
+    def offset(self, position):
+        line = position["line"]
+        if line >= len(self.starts):
+            return len(self.text)
+        line = max(line, 0)
+        line_text = self._line_text(line)
+        units = max(position["character"], 0)
+        if self.encoding == "utf-32" or line_text.isascii():
+            column = min(units, len(line_text))
+        else:
+            column = len(line_text)
+            count = 0
+            for i, ch in enumerate(line_text):
+                if count >= units:
+                    column = i
+                    break
+                count += _units(ch, self.encoding)
+        return self.starts[line] + column
+
+    def range(self, start, end):
+        return {"start": self.position(start), "end": self.position(end)}
+
+def _units(text, encoding):
+    if encoding == "utf-8":
+        return len(text.encode("utf-8"))
+    return len(text.encode("utf-16-le")) // 2
+
+def _token_end(tok):
+    return tok.lexpos + len(tok.value)
+
+# ====== Símbolos de um documento ======
+def document_symbols(tokens):
+    """Declarações de um documento em árvore: dicionários com name, kind, start/end
+    (deslocamentos da declaração), name_start/name_end e children (atributos,
+    literais e relações internas nomeadas)."""
+    header, segments = split_declarations(tokens)
+    symbols = []
+    for role, tok in iter_names(header):
+        if role == 'package':
+            symbols.append(_symbol(tok.value, 'package', tok, header[0], header[-1]))
+    for segment in segments:
+        declared = [(role, tok) for role, tok in iter_names(segment) if role in _DECLARATION_ROLES]
+        if declared:
+            role, tok = declared[0]
+            symbol = _symbol(tok.value, role, tok, segment[0], segment[-1])
+            symbol["children"] = _members(segment, role)
+            symbols.append(symbol)
+            # Declarações que o parser aceita dentro do mesmo trecho (ex.: "type X")
+            for role, tok in declared[1:]:
+                symbols.append(_symbol(tok.value, role, tok, tok, tok))
+        else:
+            name = next((tok for tok in segment if tok.type == 'RELATION_NAME'), None)
+            if name is not None:
+                symbols.append(_symbol(name.value, 'relation', name, segment[0], segment[-1]))
+    return symbols
+
+def _symbol(name, kind, name_tok, first, last):
+    return {"name": name, "kind": kind, "start": first.lexpos, "end": _token_end(last),
+            "name_start": name_tok.lexpos, "name_end": _token_end(name_tok), "children": []}
+
+def _members(segment, role):
+    children = []
+    depth = 0
+    previous = None
+    for tok in segment:
+        if tok.type == 'LBRACE':
+            depth += 1
+        elif tok.type == 'RBRACE':
+            depth -= 1
+        elif depth == 1:
+            if tok.type == 'ATTRIBUTE':
+                children.append(_symbol(tok.value, 'attribute', tok, tok, tok))
+            elif tok.type == 'RELATION_NAME':
+                if role == 'enum':
+                    children.append(_symbol(tok.value, 'literal', tok, tok, tok))
+                elif previous in _RELATION_ARROWS:
+                    children.append(_symbol(tok.value, 'relation', tok, tok, tok))
+        previous = tok.type
+    return children
+
+# ====== Documentos abertos ======
+class _Document:
+    __slots__ = ("uri", "path", "text", "version", "analyzer", "result", "analyzed_text",
+                 "lines", "symbols", "published")
+
+    def __init__(self, uri, text, version):
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.text = text
+        self.version = version
+        self.analyzer = IncrementalAnalyzer()
+        self.result = None
+        self.analyzed_text = None
+        self.lines = None
+        self.symbols = None
+        self.published = None  # versão cujos diagnósticos já foram enviados
+
+    def line_index(self, encoding):
+        if self.lines is None or self.lines.text is not self.text or self.lines.encoding != encoding:
+            self.lines = LineIndex(self.text, encoding)
+        return self.lines
+
+    def apply_changes(self, changes, encoding):
+        for change in changes:
+            if "range" not in change:
+                self.text = change["text"]
+                continue
+            lines = self.line_index(encoding)
+            start = lines.offset(change["range"]["start"])
+            end = lines.offset(change["range"]["end"])
+            self.text = self.text[:start] + change["text"] + self.text[end:]
+
+    def analyze(self):
+        """Resultado da versão atual do texto (reanalisa só o que mudou)."""
+        if self.analyzed_text is not self.text:
+            if self.result is None:
+                self.result = self.analyzer.analyze(self.text)
+            else:
+                self.result = self.analyzer.update(self.text)
+            self.analyzed_text = self.text
+            self.symbols = None
+        return self.result
+
+    def document_symbols(self):
+        result = self.analyze()
+        if self.symbols is None:
+            self.symbols = document_symbols(result.processed_tokens)
+        return self.symbols
+
+# ====== Servidor ======
+class LanguageServer:
+    def __init__(self, write):
+        self._write = write
+        self._write_lock = threading.Lock()
+        self.encoding = "utf-16"
+        self.documents = {}     # uri -> _Document
+        self.roots = []
+        self._workspace = None  # uri -> (LineIndex, símbolos) dos arquivos fechados
+        self.shutdown_requested = False
+        self.exited = False
+        self.handlers = {
+            "initialize": self.initialize,
+            "initialized": lambda params: None,
+            "shutdown": self.shutdown,
+            "exit": self.exit,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didSave": lambda params: None,
+            "textDocument/didClose": self.did_close,
+            "textDocument/documentSymbol": self.document_symbol,
+            "textDocument/definition": self.definition,
+            "workspace/symbol": self.workspace_symbol,
+            "workspace/didChangeWatchedFiles": self.did_change_watched_files,
+            "workspace/didChangeWorkspaceFolders": self.did_change_workspace_folders,
+        }
+
+    def send(self, message):
+        with self._write_lock:
+            self._write(message)
+
+    def notify(self, method, params):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # ---- ciclo de vida ----
+    def initialize(self, params):
+        offered = params.get("capabilities", {}).get("general", {}).get("positionEncodings") or []
+        # Code points dispensam a conversão para UTF-16 nas linhas não ASCII
+        for encoding in ("utf-32", "utf-8", "utf-16"):
+            if encoding in offered:
+                self.encoding = encoding
+                break
+        for folder in params.get("workspaceFolders") or []:
+            self._add_root(folder.get("uri"))
+        if not self.roots:
+            self._add_root(params.get("rootUri"))
+            if not self.roots and params.get("rootPath"):
+                self.roots.append(os.path.abspath(params["rootPath"]))
+        get_parser()  # tabelas prontas antes do primeiro didOpen
+        return {
+            "capabilities": {
+                "positionEncoding": self.encoding,
+                "textDocumentSync": {"openClose": True, "change": _SYNC_INCREMENTAL, "save": {"includeText": False}},
+                "documentSymbolProvider": True,
+                "definitionProvider": True,
+                "workspaceSymbolProvider": True,
+            },
+            "serverInfo": {"name": "tonto-analyzer"},
+        }
+
+    def _add_root(self, uri):
+        path = uri_to_path(uri) if uri else None
+        if path and os.path.isdir(path) and path not in self.roots:
+            self.roots.append(path)
+            self._workspace = None
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    def exit(self, params):
+        self.exited = True
+
+    # ---- sincronização de documentos ----
+    def did_open(self, params):
+        item = require(params, "textDocument", dict)
+        self.documents[item["uri"]] = _Document(item["uri"], item["text"], item.get("version"))
+
+    def did_change(self, params):
+        document = self._document(params)
+        document.apply_changes(params.get("contentChanges", []), self.encoding)
+        document.version = params["textDocument"].get("version")
+
+    def did_close(self, params):
+        document = self.documents.pop(require(params, "textDocument", dict)["uri"], None)
+        if document is not None:
+            self.notify("textDocument/publishDiagnostics", {"uri": document.uri, "diagnostics": []})
+            if self._workspace is not None and document.path:
+                self._index_file(document.path)
+
+    def _document(self, params):
+        uri = require(params, "textDocument", dict).get("uri")
+        document = self.documents.get(uri)
+        if document is None:
+            raise RpcError(INVALID_PARAMS, f"Documento não está aberto: {uri}")
+        return document
+
+    # ---- diagnósticos ----
+    def publish_pending_diagnostics(self):
+        for document in list(self.documents.values()):
+            if document.published != (document.version, document.text):
+                self.publish_diagnostics(document)
+
+    def publish_diagnostics(self, document):
+        result = document.analyze()
+        lines = document.line_index(self.encoding)
+        diagnostics = []
+        for error in result.error_tokens:
+            start = error['Posição']
+            diagnostics.append(_diagnostic(lines.range(start, start + len(error['Valor'])),
+                                           f"Erro léxico: lexema inválido '{error['Valor']}'", _SEVERITY_ERROR))
+        for message, start, end in _locate_messages(result.syntax_errors, result.processed_tokens, document.text, _SYNTAX_TOKEN_RE):
+            diagnostics.append(_diagnostic(lines.range(start, end), message, _SEVERITY_ERROR))
+        errors, warnings = validate_tokens(result.processed_tokens)
+        for messages, severity in ((errors, _SEVERITY_ERROR), (warnings, _SEVERITY_WARNING)):
+            for message, start, end in _locate_messages(messages, result.processed_tokens, document.text, _QUOTED_RE):
+                diagnostics.append(_diagnostic(lines.range(start, end), message, severity))
+        params = {"uri": document.uri, "diagnostics": diagnostics}
+        if document.version is not None:
+            params["version"] = document.version
+        self.notify("textDocument/publishDiagnostics", params)
+        document.published = (document.version, document.text)
+
+    # ---- navegação ----
+    def document_symbol(self, params):
+        document = self._document(params)
+        lines = document.line_index(self.encoding)
+        return [_lsp_symbol(symbol, lines) for symbol in document.document_symbols()]
+
+    def definition(self, params):
+        document = self._document(params)
+        result = document.analyze()
+        offset = document.line_index(self.encoding).offset(require(params, "position", dict))
+        tokens = result.processed_tokens
+        index = bisect_right([tok.lexpos for tok in tokens], offset) - 1
+        if index < 0:
+            return None
+        tok = tokens[index]
+        # O cursor pode estar logo após o nome (fim da palavra)
+        if offset > _token_end(tok) or tok.type not in ('CLASS_NAME', 'NEW_DATATYPE'):
+            return None
+        local = [s for s in document.document_symbols() if s["name"] == tok.value and s["kind"] in _DECLARATION_ROLES]
+        if local:
+            lines = document.line_index(self.encoding)
+            return [_location(document.uri, lines, s) for s in local]
+        return [_location(uri, lines, s) for uri, lines, s in self._declarations() if s["name"] == tok.value] or None
+
+    def workspace_symbol(self, params):
+        query = (params.get("query") or "").lower()
+        return [
+            {"name": s["name"], "kind": _SYMBOL_KINDS[s["kind"]], "location": _location(uri, lines, s)}
+            for uri, lines, s in self._declarations()
+            if query in s["name"].lower()
+        ]
+
+    def _declarations(self):
+        """(uri, LineIndex, símbolo) das declarações de nível superior do workspace
+        e dos documentos abertos (o texto do editor tem precedência sobre o disco)."""
+        if self._workspace is None:
+            self._workspace = {}
+            for root in self.roots:
+                for path in find_project_files(root):
+                    self._index_file(path)
+        for uri, (lines, symbols) in self._workspace.items():
+            if uri in self.documents:
+                continue
+            for symbol in symbols:
+                if symbol["kind"] in _DECLARATION_ROLES:
+                    yield uri, lines, symbol
+        for uri, document in list(self.documents.items()):
+            lines = document.line_index(self.encoding)
+            for symbol in document.document_symbols():
+                if symbol["kind"] in _DECLARATION_ROLES:
+                    yield uri, lines, symbol
+
+    def _index_file(self, path):
+        # Arquivos fechados só precisam dos tokens: basta o lexer
+        uri = path_to_uri(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            self._workspace.pop(uri, None)
+            return
+        tokens, _, _ = TontoLexer().tokenize(text)
+        self._workspace[uri] = (LineIndex(text, self.encoding), document_symbols(tokens))
+
+    def did_change_watched_files(self, params):
+        if self._workspace is None:
+            return
+        for change in params.get("changes", []):
+            path = uri_to_path(change.get("uri", ""))
+            if path and path.lower().endswith(".tonto"):
+                self._index_file(path)
+
+    def did_change_workspace_folders(self, params):
+        event = params.get("event", {})
+        for folder in event.get("removed", []):
+            path = uri_to_path(folder.get("uri", ""))
+            if path in self.roots:
+                self.roots.remove(path)
+                self._workspace = None
+        for folder in event.get("added", []):
+            self._add_root(folder.get("uri"))
+
+    # ---- laço principal ----
+    def handle(self, message):
+        if isinstance(message, RpcError):
+            self.send(error_response(None, message))
+            return
+        if self.shutdown_requested and isinstance(message, dict) and message.get("method") != "exit" and "id" in message:
+            self.send(error_response(message["id"], RpcError(INVALID_REQUEST, "Servidor em shutdown")))
+            return
+        response = dispatch(self.handlers, message)
+        if response is not None:
+            self.send(response)
+
+    def serve(self, messages):
+        """Trata as mensagens da fila; publica diagnósticos quando ela esvazia."""
+        while not self.exited:
+            message = messages.get()
+            if message is None:
+                break
+            self.handle(message)
+            # Rajada de edições: trata tudo o que já chegou antes de reanalisar
+            while not self.exited:
+                try:
+                    message = messages.get_nowait()
+                except queue.Empty:
+                    break
+                if message is None:
+                    return
+                self.handle(message)
+            if not self.exited and not self.shutdown_requested:
+                self.publish_pending_diagnostics()
+
+def _diagnostic(range_, message, severity):
+    return {"range": range_, "severity": severity, "source": "tonto", "message": message}
+
+def _location(uri, lines, symbol):
+    return {"uri": uri, "range": lines.range(symbol["name_start"], symbol["name_end"])}
+
+def _lsp_symbol(symbol, lines):
+    return {
+        "name": symbol["name"],
+        "kind": _SYMBOL_KINDS[symbol["kind"]],
+        "range": lines.range(symbol["start"], symbol["end"]),
+        "selectionRange": lines.range(symbol["name_start"], symbol["name_end"]),
+        "children": [_lsp_symbol(child, lines) for child in symbol["children"]],
+    }
+
+def _locate_messages(messages, tokens, text, value_re):
+    """(mensagem, início, fim) de cada erro "... na linha N ...": o intervalo é o do
+    token da linha N com o valor citado na mensagem (ou a linha inteira)."""
+    if not messages:
+        return
+    by_line = {}
+    for tok in tokens:
+        by_line.setdefault(tok.lineno, []).append(tok)
+    used = set()
+    for message in messages:
+        line_match = _LINE_RE.search(message)
+        if line_match is None:
+            # ex.: "Erro de sintaxe próximo ao fim do arquivo."
+            end = len(text.rstrip())
+            start = tokens[-1].lexpos if tokens else 0
+            yield message, min(start, end), end
+            continue
+        line_tokens = by_line.get(int(line_match.group(1)), [])
+        value_match = value_re.search(message)
+        candidates = [tok for tok in line_tokens if value_match and tok.value == value_match.group(1)]
+        # Vários erros no mesmo valor e linha: cada um aponta para a ocorrência seguinte
+        tok = next((t for t in candidates if id(t) not in used), candidates[-1] if candidates else None)
+        if tok is not None:
+            used.add(id(tok))
+            yield message, tok.lexpos, _token_end(tok)
+        elif line_tokens:
+            yield message, line_tokens[0].lexpos, _token_end(line_tokens[-1])
+        else:
+            yield message, 0, 0
+
+# ====== Transporte stdio ======
+def serve_stdio(rfile=None, wfile=None):
+    # Leitor próprio sobre o descritor: a thread de leitura fica bloqueada nele
+    # até o fim, e o sys.stdin.buffer não pode estar em uso quando o interpretador encerra
+    rfile = rfile or open(sys.stdin.fileno(), "rb", closefd=False)
+    wfile = wfile or sys.stdout.buffer
+
+    def write(message):
+        wfile.write(encode_header_message(message))
+        wfile.flush()
+
+    server = LanguageServer(write)
+    messages = queue.Queue()
+
+    def read_messages():
+        while True:
+            message = read_header_message(rfile)
+            messages.put(message)
+            if message is None:
+                break
+
+    threading.Thread(target=read_messages, daemon=True).start()
+    server.serve(messages)
+    return 0 if server.shutdown_requested else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server.lsp",
+        description="Servidor LSP da linguagem TONTO (diagnósticos, símbolos e go-to-definition) por stdin/stdout.",
+    )
+    parser.add_argument("--stdio", action="store_true", help="usa stdin/stdout (padrão; aceito por compatibilidade com clientes LSP)")
+    parser.parse_args(argv)
+    return serve_stdio()
+
+if __name__ == "__main__":
+    sys.exit(main())
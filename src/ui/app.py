@@ -0,0 +1,352 @@
+import os
+import threading
+from functools import partial
+
+from textual.app import App, ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.widgets import Header, Footer, DirectoryTree, TabbedContent, TabPane, Static
+from textual import on
+from textual.worker import get_current_worker
+
+# Imports reusing the existing analysis pipeline and report renderers
+from ..lexical.lexer_reports import (
+    TOKEN_HEADER, SYMBOL_HEADER, format_token_row, format_error_row, format_symbol_row,
+)
+from ..parsing.incremental import IncrementalAnalyzer
+from ..profiling import phases
+from ..profiling.phases import PhaseProfiler
+from ..reports.renderers import tree_lines
+from .report_view import ReportView
+
+
+class _FileSession:
+    """Analysis state of the selected file, shared by all of its jobs."""
+
+    def __init__(self) -> None:
+        self.analyzer = IncrementalAnalyzer()
+        # Serializes analyzer updates (a cancelled job may still be running)
+        self.lock = threading.Lock()
+        # Data keys changed by an update but not yet shown: a job discarded after
+        # updating the analyzer leaves them here for the next job to render.
+        # Single set operations are atomic under the GIL.
+        self.pending = set()
+
+
+# Report tabs: (pane id, view id, title, data key reported by IncrementalAnalyzer.changed;
+# "profile" is the phase profiler table, not analysis data)
+_REPORT_TABS = (
+    ("pane_tokens", "tab_tokens", "Tokens", "tokens"),
+    ("pane_symtab", "tab_symtab", "Tabela de Símbolos", "symbol_table"),
+    ("pane_tokcount", "tab_tokcount", "Contagem de Tokens", "token_count"),
+    ("pane_summary", "tab_summary", "Resumo Sintático", "summary"),
+    ("pane_syserrs", "tab_syserrs", "Erros Sintáticos", "syntax_errors"),
+    ("pane_profile", "tab_profile", "Desempenho", "profile"),
+)
+_KEY_BY_PANE = {pane_id: key for pane_id, _, _, key in _REPORT_TABS}
+_VIEW_BY_KEY = {key: view_id for _, view_id, _, key in _REPORT_TABS}
+# Reports rendered as text lines (small, or tree-shaped); tokens and symbols are paged tables
+_TEXT_REPORTS = {"token_count", "summary", "syntax_errors"}
+
+
+def _render_text_report(key: str, result) -> list[str]:
+    if key != "token_count" and getattr(result, key) is None:
+        return ["Nenhuma análise realizada."]
+    with phases.phase(f"report.{key}"):
+        return list(tree_lines(key, result))
+
+
+def _token_rows(processed_tokens, error_tokens):
+    """Row callback for the tokens table: tokens, then the lexical errors section."""
+    total = len(processed_tokens)
+    error_section = ["", "ERROS LÉXICOS", "-" * len(TOKEN_HEADER)] if error_tokens else []
+
+    def row(index: int) -> str:
+        if index < total:
+            return format_token_row(processed_tokens[index])
+        index -= total
+        if index < len(error_section):
+            return error_section[index]
+        return format_error_row(error_tokens[index - len(error_section)])
+
+    return total + len(error_section) + len(error_tokens), row
+
+
+def _symbol_row(symbol_table):
+    def row(index: int) -> str:
+        entry = symbol_table[index]
+        return format_symbol_row(entry if isinstance(entry, dict) else entry.as_dict())
+
+    return row
+
+
+class AnalyzerTUI(App):
+    CSS = """
+    Screen {
+        layout: horizontal;
+    }
+    # Left pane (file explorer)
+    # Right pane (tabs)
+    # Provide a sensible minimum width to explorer
+    # and let tabs take the remaining space
+    # using fractions
+    .left {
+        width: 1fr;
+        min-width: 1fr;
+        border: round $accent;
+    }
+    .right {
+        width: 3fr;
+        border: round $accent;
+    }
+    .hint {
+        color: $text-muted;
+    }
+    #status {
+        height: 1;
+        color: $text-muted;
+    }
+    #explorer {
+        width: 1fr;
+        min-width: 1fr;
+        border: round red;
+        padding: 1;
+    }
+    """
+
+    BINDINGS = [
+        ("q", "quit", "Sair"),
+        ("r", "recarregar", "Recarregar arquivo"),
+        ("w", "alternar_observacao", "Observar alterações"),
+        ("p", "alternar_perfil", "Perfil de desempenho"),
+    ]
+
+    # Interval (seconds) between file checks in watch mode
+    WATCH_INTERVAL = 0.5
+    # Files written when profiling is turned off (relative to the working directory)
+    PROFILE_BASENAME = "tonto_profile"
+
+    def __init__(self, start_dir: str | None = None) -> None:
+        super().__init__()
+        self.start_dir = start_dir or self._default_root()
+        self.current_file: str | None = None
+        # Cache of last analysis data
+        self._lex_data = None  # (processed_tokens, symbol_table, error_tokens)
+        self._summary = None
+        self._syntax_errors = None
+        # Incremental analysis state of the current file and watch mode
+        self._session: _FileSession | None = None
+        self._watch_timer = None
+        self._file_stamp = None
+        # Id of the latest analysis job; results of older jobs are discarded
+        self._job = 0
+        # Latest applied result and the report tabs not yet rendered for it
+        self._result = None
+        self._result_version = 0
+        self._dirty: set[str] = set()
+        # Phase profiler: the running one, or the last one stopped (still shown in its tab)
+        self._profiler: PhaseProfiler | None = None
+        self._profiling = False
+
+    def _default_root(self) -> str:
+        # Project root = three levels up from this file
+        return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=True)
+        with Horizontal():
+            with Vertical(classes="left"):
+                yield Static("Explorador de Arquivos (selecione um .tonto)", classes="hint")
+                yield DirectoryTree(self.start_dir, id="tree")
+            with Vertical(classes="right"):
+                yield Static("Nenhum arquivo analisado.", id="status")
+                with TabbedContent(id="tabs"):
+                    for pane_id, view_id, title, _ in _REPORT_TABS:
+                        with TabPane(title, id=pane_id):
+                            yield ReportView(id=view_id)
+        yield Footer()
+
+    def action_recarregar(self) -> None:
+        if self.current_file:
+            self._start_analysis(self.current_file)
+
+    def action_alternar_observacao(self) -> None:
+        if self._watch_timer is not None:
+            self._watch_timer.stop()
+            self._watch_timer = None
+            self.notify("Observação de alterações desativada.", severity="information")
+            return
+        self._file_stamp = self._stat_current_file()
+        self._watch_timer = self.set_interval(self.WATCH_INTERVAL, self._check_file_changed)
+        self.notify("Observando alterações: o arquivo será reanalisado ao ser salvo.", severity="information")
+
+    def action_alternar_perfil(self) -> None:
+        if not self._profiling:
+            self._profiler = PhaseProfiler().start()
+            self._profiling = True
+            self.notify("Perfil de desempenho ativado: as próximas análises serão medidas.", severity="information")
+        else:
+            self._profiler.stop()
+            self._profiling = False
+            base = os.path.abspath(self.PROFILE_BASENAME)
+            try:
+                self._profiler.write(base + ".json")
+                self._profiler.write(base + ".folded", "folded")
+            except OSError as e:
+                self.notify(f"Erro ao gravar o perfil: {e}", severity="error")
+            else:
+                self.notify(f"Perfil gravado em {base}.json e {base}.folded", severity="information")
+        self._render_active_tab()
+
+    def _profile_lines(self) -> list[str]:
+        if self._profiler is None:
+            return ["Perfil desativado. Pressione p para medir o tempo de cada fase das próximas análises."]
+        lines = list(self._profiler.report_lines())
+        if self._profiling:
+            lines.append("Medindo... pressione p para parar e gravar o perfil (JSON e flame graph).")
+        return lines
+
+    def _stat_current_file(self):
+        if not self.current_file:
+            return None
+        try:
+            st = os.stat(self.current_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _check_file_changed(self) -> None:
+        stamp = self._stat_current_file()
+        if stamp is not None and stamp != self._file_stamp:
+            self._file_stamp = stamp
+            self._start_analysis(self.current_file)
+
+    @on(DirectoryTree.FileSelected)
+    def handle_file_selected(self, event: DirectoryTree.FileSelected) -> None:
+        pstr = str(event.path)
+        if not pstr.lower().endswith(".tonto"):
+            self.notify("Só é possível analisar arquivos com extensão .tonto", severity="warning")
+            return
+        self.current_file = pstr
+        # New session per file: a stale job still running on the previous file keeps its own state
+        self._session = _FileSession()
+        self._result = None
+        self._dirty = {key for _, _, _, key in _REPORT_TABS}
+        for view in self.query(ReportView):
+            view.scroll_home(animate=False)
+        self._file_stamp = self._stat_current_file()
+        self._start_analysis(pstr)
+
+    # ---- background analysis ----
+    def _start_analysis(self, file_path: str) -> None:
+        """Run the analysis in a worker thread. Starting a new job cancels the
+        previous one (exclusive group); its results are never applied."""
+        if self._session is None:
+            self._session = _FileSession()
+        self._job += 1
+        self._set_status(f"Analisando {os.path.basename(file_path)}...")
+        self.run_worker(
+            partial(self._analysis_job, self._job, file_path, self._session),
+            name=f"analysis-{self._job}",
+            group="analysis",
+            exclusive=True,
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _analysis_job(self, job: int, file_path: str, session: _FileSession) -> None:
+        worker = get_current_worker()
+
+        def stale() -> bool:
+            return worker.is_cancelled or job != self._job
+
+        try:
+            with phases.phase("read"), open(file_path, "r", encoding="utf-8") as f:
+                data = f.read()
+        except OSError as e:
+            if not stale():
+                self.call_from_thread(self.notify, f"Erro ao abrir arquivo: {e}", severity="error")
+                self.call_from_thread(self._set_status, "Falha ao abrir o arquivo.")
+            return
+        if stale():
+            return
+
+        # Lexical + syntactic analysis in a single lexer pass; on reloads only the
+        # changed declarations are re-lexed and re-parsed
+        with session.lock:
+            result = session.analyzer.update(data)
+            session.pending |= session.analyzer.changed
+            changed = set(session.pending)
+        if stale():
+            return
+        self.call_from_thread(self._apply_results, job, file_path, session, result, changed)
+
+    def _apply_results(self, job: int, file_path: str, session: _FileSession, result, changed: set) -> None:
+        # Only results of the latest job for the selected file reach the tabs
+        if job != self._job or file_path != self.current_file:
+            return
+        session.pending -= changed
+        self._result = result
+        self._result_version += 1
+        self._lex_data = result.lex_data
+        self._summary = result.summary
+        self._syntax_errors = result.syntax_errors
+        # Tabs are rendered lazily: only the visible one now, the others when activated
+        self._dirty |= changed
+        self._render_active_tab()
+
+        errors = result.syntax_errors
+        if errors:
+            self._set_status(f"{os.path.basename(file_path)}: {len(errors)} erro(s) sintático(s).")
+            self.notify(f"Análise concluída com {len(errors)} erro(s) sintático(s).", severity="warning")
+        else:
+            self._set_status(f"{os.path.basename(file_path)}: análise concluída.")
+            self.notify("Análise sintática concluída com sucesso!", severity="information")
+
+    # ---- lazy report tabs ----
+    @on(TabbedContent.TabActivated)
+    def handle_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        self._render_active_tab()
+
+    def _render_active_tab(self) -> None:
+        key = _KEY_BY_PANE.get(self.query_one("#tabs", TabbedContent).active)
+        if key == "profile":
+            # Cheap to rebuild and changes with every job, so never cached as dirty/clean
+            self.query_one(f"#{_VIEW_BY_KEY[key]}", ReportView).set_lines(self._profile_lines())
+            return
+        if key is None or key not in self._dirty or self._result is None:
+            return
+        self._dirty.discard(key)
+        result = self._result
+        view = self.query_one(f"#{_VIEW_BY_KEY[key]}", ReportView)
+        if key == "tokens":
+            processed_tokens, _, error_tokens = result.lex_data
+            view.set_rows((TOKEN_HEADER, "-" * len(TOKEN_HEADER)), *_token_rows(processed_tokens, error_tokens))
+        elif key == "symbol_table":
+            symbol_table = result.symbol_table
+            view.set_rows((SYMBOL_HEADER, "-" * 55), len(symbol_table), _symbol_row(symbol_table))
+        else:
+            # Text reports (e.g. the summary tree of a big model) are rendered off the event loop
+            self.run_worker(
+                partial(self._text_report_job, key, result, self._result_version),
+                name=f"render-{key}",
+                group=f"render-{key}",
+                exclusive=True,
+                thread=True,
+                exit_on_error=False,
+            )
+
+    def _text_report_job(self, key: str, result, version: int) -> None:
+        lines = _render_text_report(key, result)
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._apply_text_report, key, lines, version)
+
+    def _apply_text_report(self, key: str, lines: list[str], version: int) -> None:
+        # A newer result makes the text stale only if this report's data changed
+        if version != self._result_version and key in self._dirty:
+            return
+        self.query_one(f"#{_VIEW_BY_KEY[key]}", ReportView).set_lines(lines)
+
+    def _set_status(self, text: str, job: int | None = None) -> None:
+        if job is not None and job != self._job:
+            return
+        self.query_one("#status", Static).update(text)
@@ -0,0 +1,98 @@
+from typing import Callable, Sequence
+
+from rich.highlighter import ReprHighlighter
+from rich.segment import Segment
+from rich.text import Text
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+class ReportView(ScrollView, can_focus=True):
+    """Virtualized, read-only report view.
+
+    Rows come from a callback over the underlying data (e.g. the token list)
+    and are formatted only when they scroll into view, so a report with 100k
+    rows costs no more to show than one with 100. Header lines stay fixed at
+    the top while the rows scroll.
+    """
+
+    DEFAULT_CSS = """
+    ReportView {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self._header: Sequence[str] = ()
+        self._row_count = 0
+        self._row: Callable[[int], str] = lambda index: ""
+        self._width = 0
+        self._highlighter = ReprHighlighter()
+        self._cache: dict[int, Strip] = {}
+
+    def set_rows(self, header: Sequence[str], row_count: int, row: Callable[[int], str]) -> None:
+        """Show `row_count` rows, each formatted on demand by `row(index)`."""
+        self._header = list(header)
+        self._row_count = row_count
+        self._row = row
+        self._cache.clear()
+        # The width grows as wider rows are rendered (no pass over all rows)
+        self._width = max((len(line) for line in self._header), default=0)
+        # The scroll position is kept (e.g. when a watched file is reanalyzed)
+        self.virtual_size = Size(self._width, len(self._header) + row_count)
+        self._update_subtitle()
+        self.refresh()
+
+    def set_lines(self, lines: Sequence[str]) -> None:
+        """Show already formatted lines (e.g. from a report renderer)."""
+        self.set_rows((), len(lines), lines.__getitem__)
+
+    def set_text(self, text: str) -> None:
+        """Show already formatted text (one row per line)."""
+        self.set_lines(text.splitlines())
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        self._update_subtitle()
+
+    def on_resize(self) -> None:
+        self._update_subtitle()
+
+    def _update_subtitle(self) -> None:
+        if not self._header or not self._row_count:
+            self.border_subtitle = ""
+            return
+        first = int(self.scroll_y) + 1
+        visible = max(self.size.height - len(self._header), 1)
+        last = min(first + visible - 1, self._row_count)
+        self.border_subtitle = f"linhas {first}-{last} de {self._row_count}"
+
+    def _row_strip(self, index: int) -> Strip:
+        strip = self._cache.get(index)
+        if strip is None:
+            line = self._row(index)
+            if len(line) > self._width:
+                self._width = len(line)
+                self.virtual_size = Size(self._width, self.virtual_size.height)
+            text = Text(line)
+            self._highlighter.highlight(text)
+            strip = Strip(list(text.render(self.app.console)))
+            if len(self._cache) > 4096:
+                self._cache.clear()
+            self._cache[index] = strip
+        return strip
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        header_height = len(self._header)
+        if y < header_height:
+            strip = Strip([Segment(self._header[y])])
+        else:
+            index = scroll_y + y - header_height
+            if index >= self._row_count:
+                return Strip.blank(width, self.rich_style)
+            strip = self._row_strip(index)
+        return strip.crop_extend(scroll_x, scroll_x + width, None).apply_style(self.rich_style)
@@ -0,0 +1 @@
+# Package marker for tests (puts the project root on sys.path under pytest)
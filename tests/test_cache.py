@@ -0,0 +1,104 @@
+import os
+import pickle
+import threading
+
+from src.parsing.cache import AnalysisCache, EVICT_LOW_WATER
+
+def _record(n, size=200):
+    return {"file": f"m{n}.tonto", "padding": "x" * size}
+
+def _disk_bytes(cache):
+    return sum(size for _, size, _ in cache._entries())
+
+def _touch(cache, data, when):
+    """Fixa o mtime (último acesso) de uma entrada: a ordem LRU não depende do relógio."""
+    path = cache._path(cache.key(data))
+    os.utime(path, (when, when))
+
+def test_get_miss_then_hit(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    assert cache.get("package A") is None
+
+    cache.put("package A", _record(1))
+
+    assert cache.get("package A") == _record(1)
+    assert cache.get("package B") is None
+
+def test_put_overwrite_counts_only_the_difference(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("package A", _record(1, size=100))
+    cache.put("package B", _record(2, size=100))
+    cache.put("package A", _record(1, size=1000))
+
+    assert cache._total_bytes == _disk_bytes(cache)
+    assert cache.get("package A") == _record(1, size=1000)
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_bytes=10 ** 9)
+    for n in range(10):
+        cache.put(f"package P{n}", _record(n))
+        _touch(cache, f"package P{n}", 1000 + n)
+    entry_size = _disk_bytes(cache) // 10
+
+    # P0 é o mais antigo, mas uma leitura o torna o mais recente
+    assert cache.get("package P0") is not None
+    cache.max_bytes = entry_size * 10
+    cache.put("package P10", _record(10))
+
+    remaining = _disk_bytes(cache)
+    assert remaining <= cache.max_bytes * EVICT_LOW_WATER
+    assert cache._total_bytes == remaining
+    assert cache.get("package P0") is not None
+    assert cache.get("package P10") is not None
+    assert cache.get("package P1") is None
+    assert cache.get("package P9") is not None
+
+def test_no_eviction_under_the_limit(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_bytes=10 ** 6)
+    for n in range(5):
+        cache.put(f"package P{n}", _record(n))
+    assert all(cache.get(f"package P{n}") == _record(n) for n in range(5))
+
+def test_concurrent_put_keeps_size_accounting(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("package Seed", _record(0))
+    cache.max_bytes = _disk_bytes(cache) * 20
+    errors = []
+
+    def worker(thread):
+        try:
+            for n in range(30):
+                # Metade das chaves é compartilhada: threads sobrescrevem a mesma entrada
+                key = n if n % 2 else thread * 100 + n
+                cache.put(f"package P{key}", _record(key))
+        except Exception as exc:  # pragma: no cover - só aparece se o teste falhar
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert cache._total_bytes == _disk_bytes(cache)
+    assert cache._total_bytes <= cache.max_bytes
+    leftovers = [f for _, _, files in os.walk(tmp_path) for f in files if f.endswith(".tmp")]
+    assert leftovers == []
+
+def test_pickled_cache_shares_the_directory(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("package A", _record(1))
+
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert copy.get("package A") == _record(1)
+
+def test_clear(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    cache.put("package A", _record(1))
+    cache.put("package B", _record(2))
+
+    assert cache.clear() == 2
+    assert cache.get("package A") is None
+    assert cache._total_bytes == 0
@@ -0,0 +1,78 @@
+import glob
+import os
+import random
+
+import pytest
+
+from benchmarks.generator import generate_model
+from src.lexical.lexer import TontoLexer
+
+# Equivalência dos motores léxicos: o 'fast' (regex única + dicionário, o padrão)
+# precisa produzir exatamente o que o 'ply' produz — tipos, valores, linhas,
+# posições, tabela de símbolos, contagens e erros léxicos.
+
+_EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '**', '*.tonto'),
+                             recursive=True))
+_FRAGMENTS = list("abcXYZ_019 \t\n\r:.-<>o@[]{}(),*é#") + [
+    "kind", "functional-complexes", "intrinsic-modes", "of", "type:", "DataType", "relation",
+    "--<o>", "<>--", "[1..*]", "[ 2 ]", "Foo1", "\r\n", "phaseMixin", "categorizer",
+]
+_ERROR_INPUTS = [
+    "",
+    "#",
+    "kind Pessoa #@!",
+    "package P\nkind 1Pessoa\n",
+    "class Pessoa { nome: string }",
+    "kind Pessoa\n\trelator Casamento\r\n  é ç ~ `",
+    "genset G where A, B specializes",
+    "@relation [1..*] --<o> [0..1] Foo1",
+    "kindkind subkind_ Sub_Kind Pessoa_1 pessoa",
+]
+
+def lex_snapshot(text, engine):
+    lexer = TontoLexer(engine=engine)
+    tokens, symbol_table, errors = lexer.tokenize(text)
+    return (
+        [(t.type, t.value, t.lineno, t.lexpos) for t in tokens],
+        list(symbol_table),
+        errors,
+        lexer.token_count,
+    )
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def _mutate(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 10)):
+        k = rng.randrange(len(chars) + 1)
+        chars[k:k + rng.randint(0, 3)] = [rng.choice(_FRAGMENTS)]
+    return "".join(chars)
+
+def assert_same_tokens(text):
+    assert lex_snapshot(text, 'fast') == lex_snapshot(text, 'ply'), repr(text[:500])
+
+@pytest.mark.parametrize("path", _EXAMPLES, ids=lambda p: os.path.relpath(p, os.path.dirname(_EXAMPLES[0])))
+def test_examples(path):
+    assert_same_tokens(_read(path))
+
+def test_synthetic_model():
+    assert_same_tokens(generate_model(200))
+
+@pytest.mark.parametrize("text", _ERROR_INPUTS)
+def test_error_inputs(text):
+    assert_same_tokens(text)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_mutations(seed):
+    rng = random.Random(seed)
+    texts = [_read(p) for p in _EXAMPLES]
+    for _ in range(100):
+        assert_same_tokens(_mutate(rng.choice(texts), rng))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_fragments(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        assert_same_tokens("".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 60))))
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.parsing.hierarchy import SpecializationHierarchy
+
+def _summary(*classes):
+    """Resumo mínimo: (nome, superclasses) por classe, todas 'kind'/'subkind'."""
+    return {"classes": [{"name": name, "stereotype": "subkind" if supers else "kind", "superclasses": list(supers)}
+                        for name, supers in classes]}
+
+BASE = _summary(("A", ()), ("B", ("A",)))
+WITH_C = _summary(("A", ()), ("B", ("A",)), ("C", ("B",)))
+
+def _closures(hierarchy, names):
+    return {n: (hierarchy.ancestors(n), hierarchy.descendants(n)) for n in names}
+
+@pytest.mark.parametrize("query", ["ancestors", "descendants", "both", "none"])
+@pytest.mark.parametrize("before, after", [(BASE, WITH_C), (WITH_C, BASE)])
+def test_sync_after_one_sided_query(query, before, after):
+    hierarchy = SpecializationHierarchy.from_summary(before)
+    if query in ("ancestors", "both"):
+        hierarchy.ancestors("B")
+    if query in ("descendants", "both"):
+        hierarchy.descendants("A")
+
+    hierarchy.sync(after)
+
+    names = ("A", "B", "C")
+    assert _closures(hierarchy, names) == _closures(SpecializationHierarchy.from_summary(after), names)
+
+def test_sync_adds_edge_below_queried_class():
+    hierarchy = SpecializationHierarchy.from_summary(BASE)
+    hierarchy.descendants("A")
+    hierarchy.sync(WITH_C)
+    assert hierarchy.descendants("A") == {"B", "C"}
+    assert hierarchy.ancestors("C") == {"A", "B"}
+    assert hierarchy.is_a("C", "A")
+
+CYCLE = _summary(("A", ("B",)), ("B", ("A",)), ("C", ("B",)))
+
+@pytest.mark.parametrize("query", ["ancestors", "descendants", "both"])
+def test_sync_closing_a_cycle(query):
+    hierarchy = SpecializationHierarchy.from_summary(WITH_C)
+    if query in ("ancestors", "both"):
+        hierarchy.ancestors("C")
+    if query in ("descendants", "both"):
+        hierarchy.descendants("B")
+
+    hierarchy.sync(CYCLE)
+
+    names = ("A", "B", "C")
+    assert _closures(hierarchy, names) == _closures(SpecializationHierarchy.from_summary(CYCLE), names)
+    assert hierarchy.ancestors("A") == {"A", "B"}
+
+def _random_summary(rng, names):
+    return _summary(*((name, tuple(rng.sample(names, rng.randint(0, 2)))) for name in names))
+
+def test_sync_matches_rebuild_on_random_graphs():
+    # Grafos pequenos e densos: boa parte tem ciclos
+    rng = random.Random(16)
+    names = ["A", "B", "C", "D", "E"]
+    for _ in range(500):
+        hierarchy = SpecializationHierarchy.from_summary(_random_summary(rng, names))
+        for name in rng.sample(names, 2):
+            hierarchy.ancestors(name)
+        for name in rng.sample(names, rng.randint(0, 2)):
+            hierarchy.descendants(name)
+
+        after = _random_summary(rng, names)
+        hierarchy.sync(after)
+
+        assert _closures(hierarchy, names) == _closures(SpecializationHierarchy.from_summary(after), names)
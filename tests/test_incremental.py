@@ -0,0 +1,143 @@
+import glob
+import os
+import random
+
+import pytest
+
+from src.lexical.lexer import analyze_text
+from src.parsing.incremental import IncrementalAnalyzer, split_declarations
+from src.parsing.pipeline import analyze_source
+
+_EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '**', '*.tonto'),
+                             recursive=True))
+
+MODEL = """package Loja
+
+kind Pessoa {
+    nome: string [1]
+}
+kind Produto
+role Cliente specializes Pessoa
+@material relation Cliente [1..*] -- compra -- [0..*] Produto
+relator Venda {
+    @mediation
+    [1] -- cliente -- [1] Cliente
+}
+disjoint complete genset Papeis where Cliente specializes Pessoa
+"""
+
+def _snapshot(result):
+    return (
+        [(t.type, t.value, t.lineno, t.lexpos) for t in result.processed_tokens],
+        list(result.symbol_table),
+        result.error_tokens,
+        result.summary,
+        result.syntax_errors,
+        result.token_count(),
+    )
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def test_stereotyped_relation_is_one_declaration():
+    tokens, _, _ = analyze_text("package P\nkind A\n@material relation A [1] -- r -- [1] A\n")
+    _, segments = split_declarations(tokens)
+    assert [[t.type for t in seg][:3] for seg in segments] == [
+        ["CLASS_STEREOTYPE", "CLASS_NAME"],
+        ["AT", "RELATION_STEREOTYPE", "RELATION"],
+    ]
+
+def test_edit_with_stereotyped_relation_is_incremental():
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(MODEL)
+    edited = MODEL.replace("kind Produto", "kind Produto {\n    preco: number [1]\n}")
+    result = analyzer.update(edited)
+    assert analyzer.last_mode == "incremental"
+    assert _snapshot(result) == _snapshot(analyze_source(edited))
+
+def test_update_keeps_previous_result_positions():
+    analyzer = IncrementalAnalyzer()
+    previous = analyzer.analyze(MODEL)
+    before = _snapshot(previous)
+    analyzer.update(MODEL.replace("kind Produto", "kind Produto\nkind Loja"))
+    assert analyzer.last_mode == "incremental"
+    assert _snapshot(previous) == before
+
+def _edits(text, rng):
+    """Versões sucessivas do texto: linhas duplicadas, removidas e palavras trocadas."""
+    for _ in range(30):
+        lines = text.split("\n")
+        k = rng.randrange(len(lines))
+        choice = rng.random()
+        if choice < 0.4:
+            lines.insert(k, lines[rng.randrange(len(lines))])
+        elif choice < 0.7 and len(lines) > 1:
+            del lines[k]
+        else:
+            words = lines[k].split(" ")
+            words[rng.randrange(len(words))] = rng.choice(["kind", "Foo", "{", "}", "", "[1]", "--", "@material"])
+            lines[k] = " ".join(words)
+        text = "\n".join(lines)
+        yield text
+
+@pytest.mark.parametrize("path", _EXAMPLES + [None],
+                         ids=lambda p: "model" if p is None else os.path.basename(p))
+def test_update_matches_full_analysis(path):
+    text = MODEL if path is None else _read(path)
+    rng = random.Random(path)
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(text)
+    for version in _edits(text, rng):
+        result = analyzer.update(version)
+        assert _snapshot(result) == _snapshot(analyze_source(version)), analyzer.last_mode
+
+def _valid_edits(text, rng):
+    """Versões sucessivas que continuam sem erros: nomes trocados, espaços e
+    declarações inteiras removidas ou duplicadas (exercitam o caminho incremental)."""
+    for n in range(30):
+        tokens, _, _ = analyze_text(text)
+        _, segments = split_declarations(tokens)
+        starts = [seg[0].lexpos for seg in segments] + [len(text)]
+        choice = rng.random()
+        if choice < 0.3:
+            names = [t for t in tokens if t.type == "CLASS_NAME" and t.lexpos >= starts[0]]
+            if not names:
+                continue
+            tok = rng.choice(names)
+            text = text[:tok.lexpos] + "Novo" + "abcdefghij"[n % 10] + text[tok.lexpos + len(tok.value):]
+        elif choice < 0.5:
+            tok = rng.choice(tokens[len(tokens) - sum(map(len, segments)):])
+            text = text[:tok.lexpos] + rng.choice(["\n", "  ", "\n\n\t"]) + text[tok.lexpos:]
+        elif choice < 0.7 and len(segments) > 1:
+            k = rng.randrange(len(segments))
+            text = text[:starts[k]] + text[starts[k + 1]:]
+        else:
+            k = rng.randrange(len(segments))
+            copy = text[starts[k]:starts[k + 1]].rstrip() + "\n"
+            at = rng.choice(starts[1:-1] or [len(text)])
+            text = text[:at] + ("" if text[at - 1] == "\n" else "\n") + copy + text[at:]
+        yield text
+
+@pytest.mark.parametrize("path", _EXAMPLES + [None],
+                         ids=lambda p: "model" if p is None else os.path.basename(p))
+def test_valid_edits_are_incremental_and_match_full_analysis(path):
+    text = MODEL if path is None else _read(path)
+    original = analyze_source(text)
+    if original.error_tokens or original.syntax_errors:
+        pytest.skip("o exemplo já tem erros: toda atualização é completa")
+    rng = random.Random(path)
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(text)
+    for version in _valid_edits(text, rng):
+        result = analyzer.update(version)
+        assert analyzer.last_mode in ("incremental", "unchanged")
+        assert _snapshot(result) == _snapshot(analyze_source(version))
+
+def test_changed_reports_only_what_changed():
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(MODEL)
+    # Só espaço em branco antes de uma declaração: posições mudam, resumo não
+    analyzer.update(MODEL.replace("kind Produto", "kind  Produto"))
+    assert analyzer.last_mode == "incremental"
+    assert analyzer.changed == {"tokens"}
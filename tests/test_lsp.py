@@ -0,0 +1,61 @@
+from src.server.lsp import LanguageServer
+
+URI = "file:///tmp/loja.tonto"
+TEXT = """package Loja
+
+kind Pessoa
+kind Produto
+role Cliente specializes Pessoa
+@material relation Cliente [1..*] -- compra -- [0..*] Produto
+"""
+
+def _server():
+    sent = []
+    server = LanguageServer(sent.append)
+    server.handle({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}})
+    return server, sent
+
+def _diagnostics(sent):
+    return [m["params"] for m in sent if m.get("method") == "textDocument/publishDiagnostics"]
+
+def _open(server, text, version=1):
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didOpen",
+                   "params": {"textDocument": {"uri": URI, "text": text, "version": version}}})
+    server.publish_pending_diagnostics()
+
+def _change(server, version, start, end, text):
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didChange", "params": {
+        "textDocument": {"uri": URI, "version": version},
+        "contentChanges": [{"range": {"start": {"line": start[0], "character": start[1]},
+                                      "end": {"line": end[0], "character": end[1]}}, "text": text}],
+    }})
+    server.publish_pending_diagnostics()
+
+def test_did_change_is_incremental_with_stereotyped_relation():
+    server, sent = _server()
+    _open(server, TEXT)
+    document = server.documents[URI]
+    assert document.analyzer.last_mode == "full"
+    assert _diagnostics(sent)[-1]["diagnostics"] == []
+
+    # Nova declaração depois de "kind Produto" (linha 3) referenciando um nome indefinido
+    _change(server, 2, (4, 0), (4, 0), "role Vendedor specializes Funcionario\n")
+    assert document.analyzer.last_mode == "incremental"
+
+    published = _diagnostics(sent)[-1]
+    assert published["version"] == 2
+    fresh_server, fresh_sent = _server()
+    _open(fresh_server, document.text, version=2)
+    assert published == _diagnostics(fresh_sent)[-1]
+    assert any("Funcionario" in d["message"] and d["range"]["start"]["line"] == 4 for d in published["diagnostics"])
+
+def test_did_change_after_edit_keeps_positions():
+    server, sent = _server()
+    _open(server, TEXT)
+    # Linha extra no início de uma declaração do meio desloca as seguintes
+    _change(server, 2, (3, 0), (3, 0), "kind Loja\n")
+    _change(server, 3, (7, 0), (7, 0), "role Gerente specializes Chefe\n")
+    document = server.documents[URI]
+    assert document.analyzer.last_mode == "incremental"
+    published = _diagnostics(sent)[-1]["diagnostics"]
+    assert [d["range"]["start"]["line"] for d in published if "Chefe" in d["message"]] == [7]
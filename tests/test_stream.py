@@ -0,0 +1,62 @@
+import io
+import random
+
+import pytest
+
+from benchmarks.generator import generate_model
+from src.lexical.lexer import TontoLexer
+from src.lexical.stream import stream_tokens, DEFAULT_CHUNK_SIZE
+from src.lexical.symbol_table import SymbolTable
+
+from .test_fast_lexer import _EXAMPLES, _ERROR_INPUTS, _mutate, _read
+
+# O modo streaming lê o arquivo em blocos, mas precisa produzir o mesmo que
+# tokenize() com o texto inteiro, seja qual for o tamanho do bloco.
+
+CHUNK_SIZES = (1, 3, 7, 64, 4096, DEFAULT_CHUNK_SIZE)
+
+_CARDINALITY_INPUTS = [
+    "@mediation relation A [ 1 ..\n * ] -- [1] B\n",
+    "relation A [\n1\n..\n*\n] -- B\n[0..1]\n",
+    "kind A\n[ 1 .. 2\nkind B\n",
+]
+
+def tokenize_snapshot(text, engine='fast'):
+    lexer = TontoLexer(engine=engine)
+    tokens, symbol_table, errors = lexer.tokenize(text)
+    records = [(t.type, t.value, t.lineno, t.lexpos) for t in tokens]
+    records += [('ERRO', e['Valor'], e['Linha'], e['Posição']) for e in errors]
+    records.sort(key=lambda r: r[3])
+    counts = {token: n for token, n in lexer.token_count.items() if n}
+    return records, list(symbol_table), counts
+
+def stream_snapshot(text, chunk_size, engine='fast'):
+    symbol_table = SymbolTable()
+    counts = {}
+    records = [(r.type, r.value, r.lineno, r.lexpos)
+               for r in stream_tokens(io.StringIO(text), chunk_size, symbol_table, counts, engine)]
+    return records, list(symbol_table), counts
+
+def assert_same_as_tokenize(text, engine='fast'):
+    expected = tokenize_snapshot(text, engine)
+    for chunk_size in CHUNK_SIZES:
+        assert stream_snapshot(text, chunk_size, engine) == expected, (chunk_size, repr(text[:500]))
+
+@pytest.mark.parametrize("path", _EXAMPLES)
+def test_examples(path):
+    assert_same_as_tokenize(_read(path))
+
+def test_synthetic_model():
+    assert_same_as_tokenize(generate_model(50))
+
+@pytest.mark.parametrize("text", _ERROR_INPUTS + _CARDINALITY_INPUTS)
+@pytest.mark.parametrize("engine", ["fast", "ply"])
+def test_error_and_cardinality_inputs(text, engine):
+    assert_same_as_tokenize(text, engine)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mutations(seed):
+    rng = random.Random(seed)
+    texts = [_read(p) for p in _EXAMPLES]
+    for _ in range(50):
+        assert_same_as_tokenize(_mutate(rng.choice(texts), rng))